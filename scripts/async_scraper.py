@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+X-Plane SDK Documentation Async Scraping Engine
+
+Alternative to the ThreadPoolExecutor path in scrape_docs.py. All fetches
+are driven from a single asyncio event loop, with a semaphore bounding the
+number of requests in flight, while the CPU-bound HTML extraction
+(scrape_docs.parse_page) runs off-loop in a process pool.
+
+Purpose:
+- Pipeline hundreds of requests without one blocked thread per request
+- Share the per-host rate limiter and result format with the threaded engine
+- Reuse the existing extract_main_content/extract_metadata/extract_code_examples logic
+
+Usage:
+    python scrape_docs.py --engine async [--max-in-flight N]
+
+Dependencies:
+    - aiohttp: Async HTTP client (optional, only needed for this engine)
+"""
+
+import asyncio
+import logging
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Dict, List, Mapping, Optional
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from corpus_io import ScrapedContentWriter
+from rate_limiter import HostRateLimiter
+from scrape_docs import (BURST_SIZE, CONNECTION_STATS, HEADERS, HTML_PARSER, MAX_RETRIES, REQUESTS_PER_SECOND,
+                         TIMEOUT, conditional_request_headers, create_rate_limiter, extract_http_validators,
+                         new_scrape_result, parse_page, reuse_previous_result, usable_previous_result)
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+MAX_IN_FLIGHT = 20  # Upper bound on concurrent requests
+PARSE_WORKERS = os.cpu_count() or 2  # Processes used for HTML extraction
+
+
+def _create_trace_config() -> 'aiohttp.TraceConfig':
+    """Report requests and new connections to the shared CONNECTION_STATS."""
+
+    async def on_request_start(session, context, params):
+        CONNECTION_STATS.record_request()
+
+    async def on_connection_create_end(session, context, params):
+        CONNECTION_STATS.record_connection()
+
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_request_start.append(on_request_start)
+    trace_config.on_connection_create_end.append(on_connection_create_end)
+    return trace_config
+
+
+async def fetch_and_parse(session: 'aiohttp.ClientSession', url: str, semaphore: asyncio.Semaphore,
+                          rate_limiter: Optional[HostRateLimiter], parse_executor: Optional[Executor],
+                          validators: Optional[Dict[str, str]] = None,
+                          previous_results: Optional[Mapping[str, Dict]] = None,
+                          parser: str = HTML_PARSER) -> Dict:
+    """
+    Fetch one URL on the event loop and extract it in the parse executor.
+
+    Mirrors scrape_docs.scrape_single_url: same retry policy, error
+    messages and result fields.
+
+    Args:
+        session: Shared aiohttp session
+        url: URL to scrape
+        semaphore: Bounds the number of requests in flight
+        rate_limiter: Shared per-host limiter acquired before every request attempt
+        parse_executor: Executor for parse_page (None uses the loop default)
+        validators: Stored ETag/Last-Modified validators for the URL
+        previous_results: Previous run's reusable results by URL
+        parser: BeautifulSoup tree builder used by parse_page
+
+    Returns:
+        Dict in the scrape_single_url result format
+    """
+    result = new_scrape_result(url)
+    loop = asyncio.get_running_loop()
+    has_previous = bool(previous_results) and url in previous_results
+    request_headers = conditional_request_headers(validators) if has_previous else {}
+
+    for attempt in range(MAX_RETRIES):
+        try:
+            logger.debug(f"Scraping {url} (attempt {attempt + 1}/{MAX_RETRIES})")
+
+            if rate_limiter:
+                await rate_limiter.acquire_async(url)
+            request_start = None
+
+            async with semaphore:
+                # Measure the server's latency, not the time spent waiting for a slot
+                request_start = loop.time()
+                async with session.get(url, headers=request_headers) as response:
+                    result['status_code'] = response.status
+                    if rate_limiter:
+                        rate_limiter.record_response(url, response.status, loop.time() - request_start,
+                                                     response.headers.get('Retry-After'))
+                    result['http_validators'] = extract_http_validators(response.headers)
+                    html = await response.text()
+
+            previous = usable_previous_result(previous_results, url) if result['status_code'] == 304 else None
+            if previous:
+                result = reuse_previous_result(previous, result['status_code'], result['http_validators'])
+                logger.debug(f"Not modified, reusing previous extraction: {url}")
+                break
+
+            result['raw_html'] = html
+
+            if result['status_code'] == 200:
+                # Extraction is CPU-bound; keep it off the event loop
+                result.update(await loop.run_in_executor(parse_executor, parse_page, html, url, parser))
+                result['success'] = True
+                logger.debug(f"Successfully scraped {url}")
+                break
+
+            elif result['status_code'] == 404:
+                result['error'] = f"Page not found (404): {url}"
+                logger.warning(result['error'])
+                break  # Don't retry 404s
+
+            elif result['status_code'] == 403:
+                result['error'] = f"Access forbidden (403): {url}"
+                logger.warning(result['error'])
+                break  # Don't retry 403s
+
+            else:
+                result['error'] = f"HTTP {result['status_code']}: {url}"
+                logger.warning(result['error'])
+
+        except asyncio.TimeoutError:
+            result['error'] = f"Timeout after {TIMEOUT}s: {url}"
+            logger.warning(result['error'])
+            if rate_limiter and request_start is not None:
+                rate_limiter.record_response(url, None, loop.time() - request_start)
+
+        except aiohttp.ClientConnectionError:
+            result['error'] = f"Connection error: {url}"
+            logger.warning(result['error'])
+            if rate_limiter and request_start is not None:
+                rate_limiter.record_response(url, None, loop.time() - request_start)
+
+        except aiohttp.ClientError as e:
+            result['error'] = f"Request error: {e}"
+            logger.warning(result['error'])
+            # As in scrape_single_url: invalid URLs are ValueErrors that never reached the host
+            if rate_limiter and request_start is not None and not isinstance(e, ValueError):
+                rate_limiter.record_response(url, None, loop.time() - request_start)
+
+        except Exception as e:
+            result['error'] = f"Unexpected error: {e}"
+            logger.error(result['error'])
+
+        # Exponential backoff for retries
+        if attempt < MAX_RETRIES - 1:
+            delay = (2 ** attempt) * 1.0  # 1s, 2s, 4s
+            logger.debug(f"Retrying {url} in {delay}s...")
+            await asyncio.sleep(delay)
+
+    return result
+
+
+async def _scrape_all(url_list: List[str], max_in_flight: int, parse_executor: Optional[Executor],
+                      validators: Dict[str, Dict[str, str]],
+                      previous_results: Optional[Mapping[str, Dict]],
+                      rate_limiter: Optional[HostRateLimiter],
+                      writer: Optional[ScrapedContentWriter],
+                      parser: str) -> Dict[str, Dict]:
+    """Event-loop body of scrape_all_urls_async."""
+    results = {}
+    completed_count = 0
+    failed_count = 0
+
+    semaphore = asyncio.Semaphore(max_in_flight)
+    connector = aiohttp.TCPConnector(limit=max_in_flight)
+    timeout = aiohttp.ClientTimeout(total=TIMEOUT)
+
+    async def scrape_one(url: str) -> Dict:
+        try:
+            return await fetch_and_parse(session, url, semaphore, rate_limiter, parse_executor,
+                                         validators.get(url), previous_results, parser)
+        except Exception as e:
+            result = new_scrape_result(url)
+            result['error'] = f"Exception during processing: {e}"
+            return result
+
+    async with aiohttp.ClientSession(headers=HEADERS, connector=connector, timeout=timeout,
+                                     trace_configs=[_create_trace_config()]) as session:
+        for next_result in asyncio.as_completed([scrape_one(url) for url in url_list]):
+            result = await next_result
+            url = result['url']
+            results[url] = writer.write(result) if writer else result
+
+            if result['success']:
+                completed_count += 1
+                logger.info(f"✓ [{completed_count + failed_count}/{len(url_list)}] {url}")
+            else:
+                failed_count += 1
+                logger.warning(f"✗ [{completed_count + failed_count}/{len(url_list)}] {url} - {result.get('error', 'Unknown error')}")
+
+            # Progress update every 50 URLs
+            if (completed_count + failed_count) % 50 == 0:
+                logger.info(f"Progress: {completed_count + failed_count}/{len(url_list)} URLs processed")
+
+    return results
+
+
+def scrape_all_urls_async(url_list: List[str], max_in_flight: int = MAX_IN_FLIGHT,
+                          parse_workers: int = PARSE_WORKERS,
+                          validators: Optional[Dict[str, Dict[str, str]]] = None,
+                          previous_results: Optional[Mapping[str, Dict]] = None,
+                          requests_per_second: float = REQUESTS_PER_SECOND,
+                          burst: int = BURST_SIZE,
+                          writer: Optional[ScrapedContentWriter] = None,
+                          parser: str = HTML_PARSER) -> Dict[str, Dict]:
+    """
+    Scrape URLs from a single event loop with bounded concurrency.
+
+    Args:
+        url_list: List of URLs to scrape
+        max_in_flight: Maximum number of concurrent requests
+        parse_workers: Processes for HTML extraction (0 parses on a loop thread)
+        validators: Stored HTTP validators by URL, for conditional requests
+        previous_results: Previous run's results by URL, reused on 304
+        requests_per_second: Sustained rate per host (0 disables rate limiting)
+        burst: Requests a host may receive back-to-back
+        writer: Streams full results to disk (see corpus_io)
+        parser: BeautifulSoup tree builder ('html.parser' or 'lxml')
+
+    Returns:
+        Dict mapping URLs to their scraped content, or to result summaries
+        when a writer is given
+
+    Raises:
+        ImportError: If aiohttp is not installed
+    """
+    if aiohttp is None:
+        raise ImportError("The async engine requires aiohttp. Please install: pip install aiohttp")
+
+    logger.info(f"Starting async scrape of {len(url_list)} URLs "
+                f"({max_in_flight} in flight, {parse_workers} parse workers)")
+    rate_limiter = create_rate_limiter(requests_per_second, burst)
+
+    CONNECTION_STATS.reset()
+
+    if parse_workers > 0:
+        with ProcessPoolExecutor(max_workers=parse_workers) as parse_executor:
+            results = asyncio.run(_scrape_all(url_list, max_in_flight, parse_executor,
+                                              validators or {}, previous_results, rate_limiter, writer, parser))
+    else:
+        results = asyncio.run(_scrape_all(url_list, max_in_flight, None,
+                                          validators or {}, previous_results, rate_limiter, writer, parser))
+
+    successful = len([r for r in results.values() if r.get('success', False)])
+    stats = CONNECTION_STATS.snapshot()
+    logger.info(f"Scraping completed: {successful} successful, {len(results) - successful} failed")
+    logger.info(f"Connections opened: {stats['connections_opened']} for {stats['requests_made']} requests")
+    return results
@@ -0,0 +1,629 @@
+#!/usr/bin/env python3
+"""
+X-Plane SDK Documentation Pipeline Benchmarks
+
+Reproducible benchmarks for the documentation pipeline. Everything runs
+against the saved corpus in raw_data/, so results do not depend on the
+network or on the live developer.x-plane.com site.
+
+Purpose:
+- Compare the threaded and async scraping engines against a local stand-in server
+- Track the cost of the hot paths as they are optimized
+
+Usage:
+    python benchmarks.py scrape [--pages N] [--latency MS] [--workers N] [--max-in-flight N]
+    python benchmarks.py parse [--pages N] [--repeat N]
+    python benchmarks.py code [--pages N] [--repeat N]
+    python benchmarks.py hash [--pages N] [--repeat N]
+    python benchmarks.py process [--pages N]
+    python benchmarks.py xref [--extra-symbols N] [--repeat N]
+    python benchmarks.py corpus [--category NAME] [--repeat N]
+    python benchmarks.py replay ARCHIVE [--workers N] [--parser {html.parser,lxml}]
+
+Dependencies:
+    - aiohttp: Only for the async engine in the scrape benchmark (optional)
+    - lxml: Adds an lxml row to the parse benchmark (optional)
+    - xxhash: Adds an xxh3_128 row to the hash benchmark (optional)
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import resource
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import unquote, urlparse
+
+from processed_corpus import PROCESSED_CORPUS_DIR, ProcessedCorpus
+
+PROJECT_ROOT = Path(__file__).parent.parent
+RAW_DATA_DIR = PROJECT_ROOT / "raw_data"
+
+# The saved corpus only keeps each page's main article, so benchmark pages
+# are rebuilt with the surrounding chrome the scraper has to strip.
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="en-US">
+<head>
+<meta charset="UTF-8">
+<title>{title}</title>
+<meta name="description" content="X-Plane SDK reference: {title}">
+<script>window.dataLayer = window.dataLayer || [];</script>
+<style>.site-header {{ display: block; }}</style>
+</head>
+<body>
+<header class="site-header"><nav class="menu-main-menu-container"><ul><li><a href="/">Home</a></li><li><a href="/sdk/">SDK</a></li></ul></nav></header>
+<div class="api-breadcrumbs"><a href="/sdk/">SDK</a> &raquo; {title}</div>
+<main id="main">
+{article}
+</main>
+<aside class="sidebar"><div class="search"><form><input type="text" name="s"></form></div></aside>
+<footer class="site-footer"><p>&copy; Laminar Research</p><!-- footer --></footer>
+</body>
+</html>
+"""
+
+
+def load_saved_pages(limit: Optional[int] = None) -> List[Tuple[str, str]]:
+    """
+    Load benchmark pages from the saved corpus.
+
+    Args:
+        limit: Maximum number of pages to load (None for all)
+
+    Returns:
+        List of (url, html) tuples
+    """
+    pages = []
+    for url, record in ProcessedCorpus(PROCESSED_CORPUS_DIR).items():
+        html = PAGE_TEMPLATE.format(title=record.get('title') or url, article=record.get('cleaned_html', ''))
+        pages.append((url, html))
+        if limit is not None and len(pages) >= limit:
+            break
+
+    return pages
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    """Keep-alive handler serving StandInServer pages by URL path."""
+
+    protocol_version = 'HTTP/1.1'
+    pages: Dict[str, bytes] = {}
+    latency = 0.0
+
+    def do_GET(self):
+        if self.latency:
+            time.sleep(self.latency)
+        body = self.pages.get(unquote(urlparse(self.path).path))
+        if body is None:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=UTF-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _serve_pages(pages: Dict[str, bytes], latency: float, port_queue: multiprocessing.Queue) -> None:
+    """Child-process body of StandInServer."""
+    _StandInHandler.pages = pages
+    _StandInHandler.latency = latency
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _StandInHandler)
+    server.daemon_threads = True
+    port_queue.put(server.server_address[1])
+    server.serve_forever()
+
+
+class StandInServer:
+    """
+    Local keep-alive HTTP server that serves saved pages by URL path.
+
+    Runs in a child process so its threads and CPU time do not show up in
+    the engine being measured. An artificial per-request latency stands in
+    for the network round trip to the real site.
+    """
+
+    def __init__(self, pages: List[Tuple[str, str]], latency: float = 0.0):
+        self.pages = {unquote(urlparse(url).path): html.encode('utf-8') for url, html in pages}
+        self.latency = latency
+        self.port = None
+        self._process = None
+
+    def __enter__(self) -> 'StandInServer':
+        port_queue = multiprocessing.Queue()
+        self._process = multiprocessing.Process(target=_serve_pages, args=(self.pages, self.latency, port_queue),
+                                                daemon=True)
+        self._process.start()
+        self.port = port_queue.get(timeout=30)
+        return self
+
+    def __exit__(self, *exc_info):
+        self._process.terminate()
+        self._process.join()
+
+    def url_for(self, url: str) -> str:
+        """Rewrite a corpus URL so it points at this server."""
+        return f"http://127.0.0.1:{self.port}{urlparse(url).path}"
+
+
+class PeakThreadMonitor:
+    """Sample the interpreter's thread count in the background."""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.peak = threading.active_count()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, threading.active_count())
+
+    def __enter__(self) -> 'PeakThreadMonitor':
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+
+
+def _time_scrape(name: str, scrape: Callable[[List[str]], Dict[str, Dict]], urls: List[str]) -> Dict[str, float]:
+    """Run one scraping engine over the stand-in server and collect its metrics."""
+    from scrape_docs import CONNECTION_STATS
+
+    with PeakThreadMonitor() as monitor:
+        start = time.perf_counter()
+        results = scrape(urls)
+        elapsed = time.perf_counter() - start
+
+    stats = CONNECTION_STATS.snapshot()
+    successful = len([r for r in results.values() if r.get('success', False)])
+    return {
+        'engine': name,
+        'pages': successful,
+        'seconds': elapsed,
+        'pages_per_second': successful / elapsed if elapsed else 0.0,
+        'peak_threads': monitor.peak,
+        'connections': stats['connections_opened'],
+        'requests': stats['requests_made'],
+    }
+
+
+def benchmark_scrape(args: argparse.Namespace) -> List[Dict[str, float]]:
+    """Benchmark the thread and async engines against the stand-in server."""
+    from scrape_docs import scrape_all_urls
+
+    # Per-page progress lines would dominate the output
+    for name in ('scrape_docs', 'async_scraper'):
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+    pages = load_saved_pages(args.pages)
+    rows = []
+
+    with StandInServer(pages, latency=args.latency / 1000.0) as server:
+        urls = [server.url_for(url) for url, _ in pages]
+
+        rows.append(_time_scrape(
+            f"thread ({args.workers} workers)",
+            lambda url_list: scrape_all_urls(url_list, max_workers=args.workers, requests_per_second=args.rps),
+            urls))
+
+        try:
+            from async_scraper import aiohttp, scrape_all_urls_async
+        except ImportError:
+            aiohttp = None
+        if aiohttp is None:
+            print("aiohttp not installed - skipping async engine")
+        else:
+            rows.append(_time_scrape(
+                f"async ({args.max_in_flight} in flight)",
+                lambda url_list: scrape_all_urls_async(url_list, max_in_flight=args.max_in_flight,
+                                                       requests_per_second=args.rps),
+                urls))
+
+    print(f"\nScrape benchmark: {len(pages)} pages, {args.latency:.0f}ms simulated latency, "
+          f"rate limit {f'{args.rps} req/s' if args.rps > 0 else 'off'}")
+    print(f"{'engine':<24} {'seconds':>8} {'pages/s':>8} {'threads':>8} {'conns':>6} {'reqs':>6}")
+    for row in rows:
+        print(f"{row['engine']:<24} {row['seconds']:>8.2f} {row['pages_per_second']:>8.1f} "
+              f"{row['peak_threads']:>8} {row['connections']:>6} {row['requests']:>6}")
+    print(f"Peak RSS: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MB")
+
+    return rows
+
+
+def benchmark_replay(args: argparse.Namespace) -> List[Dict[str, float]]:
+    """Scrape a recorded HTTP archive offline to time the scraper without network variance."""
+    from http_archive import HttpArchive, replay_adapter_factory
+    from scrape_docs import scrape_all_urls
+
+    for name in ('scrape_docs', 'http_archive'):
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+    archive = HttpArchive(args.archive)
+    urls = archive.urls()
+    row = _time_scrape(
+        f"replay ({args.workers} workers)",
+        lambda url_list: scrape_all_urls(url_list, max_workers=args.workers, requests_per_second=0,
+                                         parser=args.parser, adapter_factory=replay_adapter_factory(archive)),
+        urls)
+
+    print(f"\nReplay benchmark: {len(urls)} archived pages from {args.archive}, {args.parser} parser")
+    print(f"{'engine':<24} {'seconds':>8} {'pages/s':>8} {'threads':>8}")
+    print(f"{row['engine']:<24} {row['seconds']:>8.2f} {row['pages_per_second']:>8.1f} {row['peak_threads']:>8}")
+
+    return [row]
+
+
+def _time_per_page(extract: Callable[[str, str], Dict], pages: List[Tuple[str, str]],
+                   repeat: int) -> Tuple[float, List[Dict]]:
+    """Return the best-of-`repeat` seconds per page and the outputs of the last pass."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        outputs = [extract(html, url) for url, html in pages]
+        best = min(best, time.perf_counter() - start)
+    return best / len(pages), outputs
+
+
+def benchmark_parse(args: argparse.Namespace) -> List[Dict[str, float]]:
+    """Per-page parse+extract time: per-selector extractors vs the single-pass extract_page."""
+    from bs4 import BeautifulSoup
+    from change_detector import HASH_ALGORITHM, calculate_content_fingerprint
+    from scrape_docs import (LXML_AVAILABLE, extract_code_examples, extract_main_content, extract_metadata,
+                             parse_page)
+
+    def legacy(html: str, url: str) -> Dict:
+        soup = BeautifulSoup(html, 'html.parser')
+        content = extract_main_content(soup)
+        return {
+            'content': content,
+            'metadata': extract_metadata(soup, url),
+            'code_examples': extract_code_examples(soup),
+            'content_fingerprint': calculate_content_fingerprint(content, HASH_ALGORITHM),
+            'fingerprint_algorithm': HASH_ALGORITHM
+        }
+
+    variants = [
+        ('per-selector (html.parser)', legacy),
+        ('single pass (html.parser)', lambda html, url: parse_page(html, url, 'html.parser')),
+    ]
+    if LXML_AVAILABLE:
+        variants.append(('single pass (lxml)', lambda html, url: parse_page(html, url, 'lxml')))
+    else:
+        print("lxml not installed - skipping lxml parser")
+
+    pages = load_saved_pages(args.pages)
+    rows = []
+    baseline_outputs = None
+    for name, extract in variants:
+        seconds_per_page, outputs = _time_per_page(extract, pages, args.repeat)
+        if baseline_outputs is None:
+            baseline_outputs = outputs
+        rows.append({
+            'variant': name,
+            'ms_per_page': seconds_per_page * 1000,
+            'pages_per_second': 1 / seconds_per_page,
+            # lxml builds a slightly different tree, so only html.parser rows must match exactly
+            'mismatches': sum(1 for old, new in zip(baseline_outputs, outputs) if old != new),
+        })
+
+    print(f"\nParse benchmark: {len(pages)} pages, best of {args.repeat}")
+    print(f"{'variant':<28} {'ms/page':>8} {'pages/s':>8} {'diffs':>6}")
+    for row in rows:
+        print(f"{row['variant']:<28} {row['ms_per_page']:>8.2f} {row['pages_per_second']:>8.1f} "
+              f"{row['mismatches']:>6}")
+
+    return rows
+
+
+def benchmark_code(args: argparse.Namespace) -> List[Dict[str, float]]:
+    """Per-page code example extraction time: one soup.select per selector vs one traversal."""
+    from bs4 import BeautifulSoup
+    from scrape_docs import extract_code_examples
+    from test_code_extraction import reference_extract_code_examples
+
+    # Trees are parsed up front so only extraction is timed; neither extractor modifies them
+    pages = [(url, BeautifulSoup(html, 'html.parser')) for url, html in load_saved_pages(args.pages)]
+    variants = [
+        ('per-selector', reference_extract_code_examples),
+        ('single traversal', extract_code_examples),
+    ]
+
+    rows = []
+    baseline_outputs = None
+    for name, extract in variants:
+        seconds_per_page, outputs = _time_per_page(lambda soup, url: extract(soup), pages, args.repeat)
+        if baseline_outputs is None:
+            baseline_outputs = outputs
+        rows.append({
+            'variant': name,
+            'ms_per_page': seconds_per_page * 1000,
+            'pages_per_second': 1 / seconds_per_page,
+            'mismatches': sum(1 for old, new in zip(baseline_outputs, outputs) if old != new),
+        })
+
+    print(f"\nCode extraction benchmark: {len(pages)} pages, best of {args.repeat}")
+    print(f"{'variant':<28} {'ms/page':>8} {'pages/s':>8} {'diffs':>6}")
+    for row in rows:
+        print(f"{row['variant']:<28} {row['ms_per_page']:>8.2f} {row['pages_per_second']:>8.1f} "
+              f"{row['mismatches']:>6}")
+
+    return rows
+
+
+def benchmark_hash(args: argparse.Namespace) -> List[Dict[str, float]]:
+    """Hashing throughput of every available algorithm over the corpus HTML."""
+    from change_detector import HASH_ALGORITHM, HASH_ALGORITHMS, calculate_content_hash
+
+    bodies = [html.encode('utf-8') for _, html in load_saved_pages(args.pages)]
+    total_bytes = sum(len(body) for body in bodies)
+
+    rows = []
+    for algorithm in HASH_ALGORITHMS:
+        best = float('inf')
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            for body in bodies:
+                calculate_content_hash(body, algorithm)
+            best = min(best, time.perf_counter() - start)
+        rows.append({
+            'algorithm': algorithm + (' (default)' if algorithm == HASH_ALGORITHM else ''),
+            'ms_per_corpus': best * 1000,
+            'mb_per_second': total_bytes / best / 1e6,
+        })
+
+    print(f"\nHash benchmark: {len(bodies)} pages, {total_bytes / 1e6:.1f} MB, best of {args.repeat}")
+    print(f"{'algorithm':<22} {'ms':>8} {'MB/s':>8}")
+    for row in rows:
+        print(f"{row['algorithm']:<22} {row['ms_per_corpus']:>8.2f} {row['mb_per_second']:>8.0f}")
+
+    return rows
+
+
+def benchmark_process(args: argparse.Namespace) -> List[Dict[str, float]]:
+    """Per-stage content processing time: string round trips vs one cleaned tree per page."""
+    import process_content
+    from process_content import (PROCESSING_STAGES, _timed, categorize_content, clean_html_content,
+                                 convert_to_markdown, extract_api_signatures, extract_code_examples)
+
+    def round_trip(url: str, html: str, timings: Dict[str, float]) -> Dict:
+        # The original pipeline: every step re-parses the cleaned HTML string
+        cleaned_html = _timed(timings, 'clean', clean_html_content, html)
+        return {
+            'cleaned_html': cleaned_html,
+            'markdown': _timed(timings, 'markdown', convert_to_markdown, cleaned_html),
+            'api_signatures': _timed(timings, 'api_signatures', extract_api_signatures, cleaned_html),
+            'code_examples': _timed(timings, 'code_examples', extract_code_examples, cleaned_html),
+            'category': _timed(timings, 'categorize', categorize_content, url, cleaned_html),
+        }
+
+    def single_parse(url: str, html: str, timings: Dict[str, float]) -> Dict:
+        record = process_content.process_page(url, {'content': html}, timings)
+        return {field: record[field] for field in ('cleaned_html', 'markdown', 'api_signatures',
+                                                   'code_examples', 'category')}
+
+    logging.getLogger('process_content').setLevel(logging.WARNING)
+    pages = load_saved_pages(args.pages)
+    rows = []
+    baseline_outputs = None
+    for name, process in (('string round trips', round_trip), ('single parse', single_parse)):
+        timings: Dict[str, float] = {}
+        outputs = [process(url, html, timings) for url, html in pages]
+        if baseline_outputs is None:
+            baseline_outputs = outputs
+        row = {'variant': name}
+        row.update({stage: timings.get(stage, 0.0) / len(pages) * 1000 for stage in PROCESSING_STAGES})
+        row['ms_per_page'] = sum(timings.values()) / len(pages) * 1000
+        row['mismatches'] = sum(1 for old, new in zip(baseline_outputs, outputs) if old != new)
+        rows.append(row)
+
+    print(f"\nProcess benchmark: {len(pages)} pages, ms/page per stage")
+    print(f"{'stage':<16}" + ''.join(f"{row['variant']:>20}" for row in rows))
+    for stage in PROCESSING_STAGES + ('ms_per_page', 'mismatches'):
+        print(f"{stage:<16}" + ''.join(f"{row[stage]:>20.2f}" for row in rows))
+
+    return rows
+
+
+def substring_cross_references(content_dict: Dict[str, Dict], modules: List[str]) -> Dict[str, List[str]]:
+    """The original generate_cross_references: one substring test per page and symbol."""
+    all_functions = {sig['name'] for info in content_dict.values()
+                     for sig in info.get('api_signatures', []) if 'name' in sig}
+    cross_refs = {}
+    for url, info in content_dict.items():
+        content_text = info.get('markdown', '')
+        refs = [name for name in all_functions
+                if name in content_text and name not in info.get('own_functions', [])]
+        refs += [module for module in modules if module in content_text and module not in url]
+        cross_refs[url] = sorted(set(refs))
+    return cross_refs
+
+
+def benchmark_xref(args: argparse.Namespace) -> List[Dict[str, float]]:
+    """Cross-reference generation time: per-symbol substring tests vs one automaton pass per page."""
+    from process_content import XPLM_MODULES, generate_cross_references
+
+    content_dict = ProcessedCorpus(PROCESSED_CORPUS_DIR).pages
+
+    # Synthetic symbols that never occur stand in for a larger SDK
+    if args.extra_symbols:
+        names = [f'XPLMSynthetic{i}' for i in range(args.extra_symbols)]
+        padding = {'url': 'synthetic', 'markdown': '', 'own_functions': names,
+                   'api_signatures': [{'name': name} for name in names]}
+        content_dict = dict(content_dict, synthetic=padding)
+
+    variants = [
+        ('substring tests', lambda: substring_cross_references(content_dict, XPLM_MODULES)),
+        ('symbol automaton', lambda: generate_cross_references(content_dict)),
+    ]
+    rows = []
+    outputs = []
+    for name, generate in variants:
+        best = float('inf')
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            output = generate()
+            best = min(best, time.perf_counter() - start)
+        outputs.append(output)
+        rows.append({'variant': name, 'seconds': best,
+                     'references': sum(len(refs) for refs in output.values())})
+
+    symbols = len({sig['name'] for info in content_dict.values()
+                   for sig in info.get('api_signatures', []) if 'name' in sig})
+    print(f"\nCross-reference benchmark: {len(content_dict)} pages, {symbols} symbols, best of {args.repeat}")
+    print(f"{'variant':<20} {'seconds':>8} {'refs':>6}")
+    for row in rows:
+        print(f"{row['variant']:<20} {row['seconds']:>8.3f} {row['references']:>6}")
+    # The automaton only matches whole words, so it drops substring hits such as XPLMMap in XPLMMapLayerID
+    dropped = sum(len(set(outputs[0][url]) - set(outputs[1][url])) for url in content_dict)
+    added = sum(len(set(outputs[1][url]) - set(outputs[0][url])) for url in content_dict)
+    print(f"partial-word references dropped: {dropped}, references added: {added}")
+
+    return rows
+
+
+def benchmark_corpus(args: argparse.Namespace) -> List[Dict[str, float]]:
+    """Processed corpus access time: legacy single document, manifest plus lazy payloads, columnar file."""
+    import tempfile
+
+    from columnar_corpus import ColumnarCorpus, export_columnar_corpus
+    from processed_corpus import LEGACY_PROCESSED_CONTENT_NAME, save_processed_corpus
+
+    # Every legacy-layout open would log that it reads the legacy file
+    logging.getLogger('processed_corpus').setLevel(logging.WARNING)
+    corpus = ProcessedCorpus(PROCESSED_CORPUS_DIR)
+    processed_data = {'metadata': corpus.metadata,
+                      'processed_content': {url: dict(page) for url, page in corpus.items()}}
+
+    def page_count(root: Path) -> int:
+        return len(ProcessedCorpus(root))
+
+    def one_category(root: Path) -> int:
+        return sum(len(page['markdown']) for _, page in ProcessedCorpus(root).by_category(args.category))
+
+    def all_pages(root: Path) -> int:
+        return sum(len(page['markdown']) for _, page in ProcessedCorpus(root).items())
+
+    def columnar_page_count(path: Path) -> int:
+        with ColumnarCorpus(path) as corpus:
+            return len(corpus)
+
+    def columnar_one_category(path: Path) -> int:
+        with ColumnarCorpus(path) as corpus:
+            markdown = corpus.pages['markdown']
+            return sum(len(markdown[index]) for index, category in enumerate(corpus.pages['category'])
+                       if category == args.category)
+
+    def columnar_all_pages(path: Path) -> int:
+        with ColumnarCorpus(path) as corpus:
+            return sum(len(markdown) for markdown in corpus.pages['markdown'])
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        # The legacy file is read when the corpus directory next to it has no manifest
+        legacy_root = Path(tmp) / 'legacy' / PROCESSED_CORPUS_DIR.name
+        legacy_root.parent.mkdir()
+        with open(legacy_root.parent / LEGACY_PROCESSED_CONTENT_NAME, 'w', encoding='utf-8') as f:
+            json.dump(processed_data, f, indent=2, sort_keys=True, ensure_ascii=False)
+        split_root = save_processed_corpus(processed_data, Path(tmp) / 'split' / PROCESSED_CORPUS_DIR.name).parent
+        columnar_path = export_columnar_corpus(ProcessedCorpus(split_root), Path(tmp) / 'corpus.xcol')
+
+        tasks = (
+            ('page count', page_count, columnar_page_count),
+            (args.category, one_category, columnar_one_category),
+            ('all pages', all_pages, columnar_all_pages),
+        )
+        for task, measure, measure_columnar in tasks:
+            layouts = (('single document', measure, legacy_root), ('manifest + payloads', measure, split_root),
+                       ('columnar (mmap)', measure_columnar, columnar_path))
+            for layout, run, path in layouts:
+                best = float('inf')
+                for _ in range(args.repeat):
+                    start = time.perf_counter()
+                    run(path)
+                    best = min(best, time.perf_counter() - start)
+                rows.append({'task': task, 'layout': layout, 'ms': best * 1000})
+
+        manifest_bytes = (split_root / 'manifest.json').stat().st_size
+        legacy_bytes = (legacy_root.parent / LEGACY_PROCESSED_CONTENT_NAME).stat().st_size
+        columnar_bytes = columnar_path.stat().st_size
+
+    print(f"\nProcessed corpus benchmark: {len(corpus)} pages, best of {args.repeat}")
+    print(f"single document {legacy_bytes / 1e6:.2f} MB, manifest {manifest_bytes / 1e6:.2f} MB, "
+          f"columnar {columnar_bytes / 1e6:.2f} MB")
+    print(f"{'task':<16} {'layout':<20} {'ms':>9}")
+    for row in rows:
+        print(f"{row['task']:<16} {row['layout']:<20} {row['ms']:>9.2f}")
+
+    return rows
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Main entry point for the benchmark runner."""
+    parser = argparse.ArgumentParser(description='X-Plane SDK documentation pipeline benchmarks')
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+
+    scrape_parser = subparsers.add_parser('scrape', help='Thread vs async scraping engine')
+    scrape_parser.add_argument('--pages', type=int, default=200, help='Number of saved pages to serve')
+    scrape_parser.add_argument('--latency', type=float, default=50.0, help='Simulated server latency (ms)')
+    scrape_parser.add_argument('--workers', type=int, default=5, help='Thread engine worker count')
+    scrape_parser.add_argument('--max-in-flight', type=int, default=50, help='Async engine concurrency')
+    # Politeness limits are a property of the real site, not of the engines
+    scrape_parser.add_argument('--rps', type=float, default=0.0,
+                               help='Per-host rate limit applied to both engines (0 disables)')
+    scrape_parser.set_defaults(func=benchmark_scrape)
+
+    parse_parser = subparsers.add_parser('parse', help='Per-page parse and extraction time')
+    parse_parser.add_argument('--pages', type=int, default=None, help='Number of saved pages (default: all)')
+    parse_parser.add_argument('--repeat', type=int, default=3, help='Timed passes; the best is reported')
+    parse_parser.set_defaults(func=benchmark_parse)
+
+    code_parser = subparsers.add_parser('code', help='Code example extraction time')
+    code_parser.add_argument('--pages', type=int, default=None, help='Number of saved pages (default: all)')
+    code_parser.add_argument('--repeat', type=int, default=3, help='Timed passes; the best is reported')
+    code_parser.set_defaults(func=benchmark_code)
+
+    hash_parser = subparsers.add_parser('hash', help='Hashing throughput per algorithm')
+    hash_parser.add_argument('--pages', type=int, default=None, help='Number of saved pages (default: all)')
+    hash_parser.add_argument('--repeat', type=int, default=5, help='Timed passes; the best is reported')
+    hash_parser.set_defaults(func=benchmark_hash)
+
+    process_parser = subparsers.add_parser('process', help='Per-stage content processing time')
+    process_parser.add_argument('--pages', type=int, default=None, help='Number of saved pages (default: all)')
+    process_parser.set_defaults(func=benchmark_process)
+
+    xref_parser = subparsers.add_parser('xref', help='Cross-reference generation time')
+    xref_parser.add_argument('--extra-symbols', type=int, default=0,
+                             help='Synthetic symbols added to simulate a larger SDK')
+    xref_parser.add_argument('--repeat', type=int, default=3, help='Timed passes; the best is reported')
+    xref_parser.set_defaults(func=benchmark_xref)
+
+    corpus_parser = subparsers.add_parser('corpus', help='Processed corpus loading time per layout')
+    corpus_parser.add_argument('--category', default='XPLM_Camera', help='Category loaded in the one-category task')
+    corpus_parser.add_argument('--repeat', type=int, default=5, help='Timed passes; the best is reported')
+    corpus_parser.set_defaults(func=benchmark_corpus)
+
+    replay_parser = subparsers.add_parser('replay', help='Thread engine against a recorded HTTP archive')
+    replay_parser.add_argument('archive', type=Path, help='Archive directory written by scrape_docs.py --record')
+    replay_parser.add_argument('--workers', type=int, default=5, help='Thread engine worker count')
+    replay_parser.add_argument('--parser', choices=('html.parser', 'lxml'), default='html.parser',
+                               help='BeautifulSoup tree builder')
+    replay_parser.set_defaults(func=benchmark_replay)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
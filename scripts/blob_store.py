@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+X-Plane SDK Documentation Blob Store
+
+Content-addressed, compressed storage for page bodies (raw HTML and
+extracted content). Each blob is stored once under raw_data/blobs/, named
+by its SHA-256 hash (change_detector.CONTENT_HASH_ALGORITHM), so
+identical pages are deduplicated automatically and records only need to
+carry the hash.
+
+Purpose:
+- Keep large page bodies out of the scraped JSONL records
+- Deduplicate identical content across pages and runs
+- Let downstream stages load (or stream) only the blobs they need
+
+Usage:
+    store = BlobStore()
+    content_hash = store.put(html)
+    html = store.get_text(content_hash)
+
+Layout:
+    raw_data/blobs/<first 2 hex chars>/<sha256>.zst   (zstandard installed)
+    raw_data/blobs/<first 2 hex chars>/<sha256>.gz    (gzip fallback)
+
+Dependencies:
+    - zstandard: Faster, smaller compression (optional, gzip is used otherwise)
+"""
+
+import gzip
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import BinaryIO, Optional, Union
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+from change_detector import CONTENT_HASH_ALGORITHM, calculate_content_hash
+
+logger = logging.getLogger(__name__)
+
+# File paths
+PROJECT_ROOT = Path(__file__).parent.parent
+BLOBS_DIR = PROJECT_ROOT / "raw_data" / "blobs"
+
+# Codec file extensions; blobs are read by whichever extension exists
+CODEC_EXTENSIONS = {'zstd': '.zst', 'gzip': '.gz'}
+DEFAULT_CODEC = 'zstd' if zstandard is not None else 'gzip'
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 10
+
+
+class BlobStore:
+    """
+    Directory of compressed blobs keyed by the SHA-256 of their content.
+
+    Writes go to a temporary file that is renamed into place, so a blob
+    either exists completely or not at all. Safe to share between threads
+    and processes.
+    """
+
+    def __init__(self, root: Path = BLOBS_DIR, codec: str = DEFAULT_CODEC):
+        if codec not in CODEC_EXTENSIONS:
+            raise ValueError(f"Unknown codec: {codec}")
+        if codec == 'zstd' and zstandard is None:
+            raise ImportError("The zstd codec requires zstandard. Please install: pip install zstandard")
+        self.root = Path(root)
+        self.codec = codec
+
+    def _path(self, content_hash: str, codec: str) -> Path:
+        return self.root / content_hash[:2] / (content_hash + CODEC_EXTENSIONS[codec])
+
+    def path_for(self, content_hash: str) -> Optional[Path]:
+        """
+        Locate a stored blob.
+
+        Args:
+            content_hash: SHA-256 hex digest of the blob content
+
+        Returns:
+            Path of the compressed blob, or None if it is not stored
+        """
+        # Blobs written with another codec (e.g. before zstandard was installed) stay readable
+        codecs = [self.codec] + [codec for codec in CODEC_EXTENSIONS if codec != self.codec]
+        for codec in codecs:
+            path = self._path(content_hash, codec)
+            if path.exists():
+                return path
+        return None
+
+    def __contains__(self, content_hash: str) -> bool:
+        return self.path_for(content_hash) is not None
+
+    def put(self, content: Union[str, bytes]) -> str:
+        """
+        Store content unless an identical blob already exists.
+
+        Args:
+            content: Text (stored as UTF-8) or bytes
+
+        Returns:
+            str: SHA-256 hex digest identifying the blob
+        """
+        data = content.encode('utf-8') if isinstance(content, str) else content
+        content_hash = calculate_content_hash(data, CONTENT_HASH_ALGORITHM)
+        if content_hash in self:
+            return content_hash
+
+        if self.codec == 'zstd':
+            compressed = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+        else:
+            compressed = gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+
+        path = self._path(content_hash, self.codec)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix='.' + content_hash[:8])
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(compressed)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        return content_hash
+
+    def open(self, content_hash: str) -> BinaryIO:
+        """
+        Open a blob as a stream that decompresses as it is read.
+
+        Args:
+            content_hash: SHA-256 hex digest of the blob content
+
+        Returns:
+            Binary file object positioned at the start of the content
+
+        Raises:
+            KeyError: If the blob is not stored
+        """
+        path = self.path_for(content_hash)
+        if path is None:
+            raise KeyError(content_hash)
+        if path.suffix == CODEC_EXTENSIONS['gzip']:
+            return gzip.open(path, 'rb')
+        if zstandard is None:
+            raise ImportError(f"{path.name} is zstd-compressed. Please install: pip install zstandard")
+        return zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), closefd=True)
+
+    def get(self, content_hash: str) -> bytes:
+        """Return the decompressed bytes of a blob (KeyError if missing)."""
+        with self.open(content_hash) as f:
+            return f.read()
+
+    def get_text(self, content_hash: str) -> str:
+        """Return a blob decoded as UTF-8 text (KeyError if missing)."""
+        return self.get(content_hash).decode('utf-8')
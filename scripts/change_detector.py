@@ -4,43 +4,121 @@ X-Plane SDK Documentation Change Detector
 
 This module implements the change detection system for X-Plane SDK documentation.
 It compares current documentation with previous versions using content hashing
-to identify which URLs need reprocessing.
+to identify which URLs need reprocessing. Hashes, fingerprints and HTTP
+validators live in the SQLite state store (raw_data/state.db).
 
 Functions:
-    calculate_content_hash(content): Generate SHA256 hash of content
-    load_existing_hashes(): Load previous content hashes from JSON file
-    save_content_hashes(hash_dict): Save updated hashes to JSON file
-    detect_changes(url_list): Compare current vs stored hashes for given URLs
+    calculate_content_hash(content, algorithm): Hash content with a pluggable algorithm (see HASH_ALGORITHMS)
+    calculate_content_fingerprint(html, algorithm): Hash of the normalized text and structure of extracted content
+    get_state_store(): Open the shared state store, migrating legacy JSON state once
+    load_existing_hashes(): Load previous content hashes from the state store
+    save_content_hashes(hash_dict): Upsert updated hashes into the state store
+    detect_changes(url_list): Fetch URLs and report new, changed and removed pages
     get_changed_urls(url_list): Return list of URLs that need reprocessing
+    load_http_validators(): Load per-URL ETag/Last-Modified validators
+    save_http_validators(validators): Upsert per-URL validators
+    load_content_fingerprints(): Load per-URL normalized content fingerprints
+    save_content_fingerprints(fingerprints): Upsert per-URL fingerprints
+    build_merkle_tree(): Hash tree URL -> category -> corpus root over the current state
+    load_merkle_snapshot(name)/save_merkle_snapshot(name, tree): Tree a stage last built from
+
+Usage:
+    python change_detector.py [--list]                   # fetch and compare every URL
+    python change_detector.py --summary [--since STAGE]  # offline: which categories changed
+
+Dependencies:
+    - xxhash: Adds the xxh3_128 hash algorithm (optional)
 """
 
 import hashlib
 import json
 import logging
-from datetime import datetime, timezone
+import re
+import sqlite3
+import threading
 from pathlib import Path
-from typing import Dict, List, Union
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from bs4 import BeautifulSoup, CData, NavigableString, Tag
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+from state_store import StateStore
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Path to the content hashes file
+# Hash constructors by algorithm id; the id is stored with every fingerprint and tree snapshot
+HASH_ALGORITHMS: Dict[str, Callable] = {
+    'sha256': hashlib.sha256,
+    'blake2b': lambda: hashlib.blake2b(digest_size=32),
+}
+if xxhash is not None:
+    HASH_ALGORITHMS['xxh3_128'] = xxhash.xxh3_128
+
+# Algorithm for fingerprints and tree nodes. SHA-256 outruns BLAKE2b on CPUs
+# with SHA extensions (see benchmarks.py hash), so it stays the default
+# unless xxhash is installed.
+HASH_ALGORITHM = 'xxh3_128' if xxhash is not None else 'sha256'
+
+# Raw content hashes double as blob store addresses, so they stay SHA-256
+CONTENT_HASH_ALGORITHM = 'sha256'
+
+# Path to the state store holding hashes, fingerprints and validators (see state_store.py)
+STATE_DB_FILE = Path(__file__).parent.parent / "raw_data" / "state.db"
+
+# Legacy JSON state files, imported into the state store on first use
 HASHES_FILE = Path(__file__).parent.parent / "raw_data" / "content_hashes.json"
+VALIDATORS_FILE = Path(__file__).parent.parent / "raw_data" / "http_validators.json"
+FINGERPRINTS_FILE = Path(__file__).parent.parent / "raw_data" / "content_fingerprints.json"
+
+# URL -> category mapping written by process_content.py
+CATEGORIZED_URLS_FILE = Path(__file__).parent.parent / "raw_data" / "categorized_urls.json"
+
+# Open state stores by database path
+_state_stores: Dict[Path, StateStore] = {}
+_state_store_lock = threading.Lock()
+
+# Attributes that change what a page says; all others (class, style, nonces, data-*) are ignored
+FINGERPRINT_ATTRIBUTES = ('href', 'src')
 
+# Elements whose content is never documentation
+FINGERPRINT_SKIPPED_TAGS = frozenset({'script', 'style', 'noscript', 'template'})
 
-def calculate_content_hash(content: Union[str, bytes]) -> str:
+# Query parameters added by analytics and ad tracking
+TRACKING_PARAMETER_PATTERN = re.compile(r'^(utm_\w+|fbclid|gclid|msclkid|mc_[ce]id|_ga|_gl|ref)$')
+
+# Generated date-times such as "2024-06-01T12:30:05Z" or "2024-06-01 12:30"
+TIMESTAMP_PATTERN = re.compile(r'\b\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?(?:Z|[+-]\d{2}:?\d{2})?')
+
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+
+def calculate_content_hash(content: Union[str, bytes], algorithm: str = CONTENT_HASH_ALGORITHM) -> str:
     """
-    Generate SHA256 hash of content.
+    Generate a hash of content with one of HASH_ALGORITHMS.
+    
+    The default is the fixed CONTENT_HASH_ALGORITHM, so a hash does not
+    change when xxhash is installed or removed. Fingerprints and tree nodes
+    pass HASH_ALGORITHM explicitly.
     
     Args:
         content: Content to hash (string or bytes)
+        algorithm: Key of HASH_ALGORITHMS (defaults to CONTENT_HASH_ALGORITHM)
         
     Returns:
         str: Hexadecimal hash string
         
+    Raises:
+        ValueError: If the algorithm is unknown or its package is not installed
+        
     Example:
-        >>> calculate_content_hash("Hello World")
+        >>> calculate_content_hash("Hello World", 'sha256')
         'a591a6d40bf420404a011733cfb7b190d62c65bf0bcda32b57b277d9ad9f146e'
     """
     if isinstance(content, str):
@@ -48,111 +126,349 @@ def calculate_content_hash(content: Union[str, bytes]) -> str:
     elif not isinstance(content, bytes):
         raise TypeError("Content must be string or bytes")
     
-    hash_obj = hashlib.sha256()
+    hash_factory = HASH_ALGORITHMS.get(algorithm)
+    if hash_factory is None:
+        raise ValueError(f"Unknown or unavailable hash algorithm: {algorithm}")
+    
+    hash_obj = hash_factory()
     hash_obj.update(content)
     return hash_obj.hexdigest()
 
 
-def load_existing_hashes() -> Dict[str, str]:
+def _canonical_url(url: str) -> str:
+    """Drop the fragment and tracking query parameters from a link target."""
+    parts = urlsplit(url.strip())
+    query = [(name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+             if not TRACKING_PARAMETER_PATTERN.match(name)]
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(query), ''))
+
+
+def canonicalize_content(html: str) -> str:
     """
-    Load previous content hashes from content_hashes.json.
+    Reduce extracted content HTML to its canonical text and structure.
+    
+    The result keeps what a reader sees: the element skeleton, the visible
+    text with whitespace collapsed, and link/image targets. Attributes
+    other than FINGERPRINT_ATTRIBUTES, comments, scripts, tracking query
+    parameters and generated timestamps are dropped, so page
+    regenerations that do not change the documentation canonicalize the
+    same.
     
+    Args:
+        html: Extracted main content (HTML)
+        
     Returns:
-        dict: Dictionary of URL -> hash mappings, empty dict if file not found
+        str: One token per line: '<tag attr=value>', '</tag>' or a text run
+    """
+    tokens = []
+    stack = [iter(BeautifulSoup(html, 'html.parser').contents)]
+    open_names = []
+    
+    while stack:
+        node = next(stack[-1], None)
+        if node is None:
+            stack.pop()
+            if open_names:
+                tokens.append(f"</{open_names.pop()}>")
+            continue
         
-    Raises:
-        Warning: Logs warning if JSON is corrupted but continues with empty dict
+        if isinstance(node, Tag):
+            if node.name in FINGERPRINT_SKIPPED_TAGS:
+                continue
+            attributes = ''.join(f" {name}={_canonical_url(node[name])}"
+                                 for name in FINGERPRINT_ATTRIBUTES if node.get(name))
+            tokens.append(f"<{node.name}{attributes}>")
+            open_names.append(node.name)
+            stack.append(iter(node.contents))
+        elif type(node) in (NavigableString, CData):
+            text = WHITESPACE_PATTERN.sub(' ', TIMESTAMP_PATTERN.sub('<timestamp>', node)).strip()
+            if text:
+                tokens.append(text)
+    
+    return '\n'.join(tokens)
+
+
+def calculate_content_fingerprint(html: str, algorithm: Optional[str] = None) -> str:
+    """
+    Generate a fingerprint of content that ignores cosmetic changes.
+    
+    Unlike calculate_content_hash, two versions of a page only get
+    different fingerprints when their text, element structure or link
+    targets differ (see canonicalize_content).
+    
+    Args:
+        html: Extracted main content (HTML)
+        algorithm: Key of HASH_ALGORITHMS (defaults to HASH_ALGORITHM)
+        
+    Returns:
+        str: Hexadecimal hash string
+        
+    Example:
+        >>> calculate_content_fingerprint('<p class="a">Hello   World</p>') == \\
+        ...     calculate_content_fingerprint('<p class="b" data-nonce="x">Hello World</p>')
+        True
+    """
+    return calculate_content_hash(canonicalize_content(html), algorithm or HASH_ALGORITHM)
+
+
+def get_state_store() -> StateStore:
+    """
+    Return the shared state store for STATE_DB_FILE, opening it on first use.
+    
+    The first time the database is opened, the legacy JSON state files
+    (HASHES_FILE, VALIDATORS_FILE, FINGERPRINTS_FILE) are imported into it.
+    
+    Returns:
+        StateStore: Store shared by all callers in this process
+    """
+    with _state_store_lock:
+        store = _state_stores.get(STATE_DB_FILE)
+        if store is None:
+            store = StateStore(STATE_DB_FILE)
+            if store.migrate_from_json(HASHES_FILE, VALIDATORS_FILE, FINGERPRINTS_FILE):
+                logger.info(f"Migrated JSON change detection state into {STATE_DB_FILE}")
+            _state_stores[STATE_DB_FILE] = store
+        return store
+
+
+def load_existing_hashes() -> Dict[str, str]:
+    """
+    Load previous content hashes from the state store.
+    
+    Returns:
+        dict: Dictionary of URL -> hash mappings, empty dict if the store cannot be read
     """
     try:
-        if not HASHES_FILE.exists():
-            logger.info("Content hashes file not found. Starting with empty hash dictionary.")
-            return {}
-            
-        with open(HASHES_FILE, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            
-        # Extract just the URL hashes, excluding metadata
-        if isinstance(data, dict):
-            # Remove special keys like 'last_update'
-            hashes = {k: v for k, v in data.items() if k != 'last_update'}
-            logger.info(f"Loaded {len(hashes)} existing content hashes.")
-            return hashes
-        else:
-            logger.warning("Invalid hash file format. Starting with empty dictionary.")
-            return {}
-            
-    except json.JSONDecodeError as e:
-        logger.warning(f"Corrupted JSON in hash file: {e}. Starting with empty dictionary.")
-        return {}
-    except Exception as e:
-        logger.error(f"Error loading hash file: {e}. Starting with empty dictionary.")
+        hashes = get_state_store().hashes()
+        logger.info(f"Loaded {len(hashes)} existing content hashes.")
+        return hashes
+    except sqlite3.Error as e:
+        logger.error(f"Error loading content hashes: {e}. Starting with empty dictionary.")
         return {}
 
 
 def save_content_hashes(hash_dict: Dict[str, str]) -> None:
     """
-    Save updated hashes to content_hashes.json.
+    Save updated hashes to the state store.
+    
+    Only the given URLs are written; hashes of other URLs are left as they are.
     
     Args:
         hash_dict: Dictionary of URL -> hash mappings
-        
-    The saved format includes a timestamp:
-    {
-        "https://example.com/page1": "hash1",
-        "https://example.com/page2": "hash2",
-        "last_update": "2024-01-15T10:30:00Z"
-    }
     """
     try:
-        # Ensure the directory exists
-        HASHES_FILE.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Create the data structure with timestamp
-        data = dict(hash_dict)
-        data['last_update'] = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
-        
-        # Save with proper JSON formatting
-        with open(HASHES_FILE, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, sort_keys=True)
-            
-        logger.info(f"Saved {len(hash_dict)} content hashes to {HASHES_FILE}")
-        
-    except Exception as e:
-        logger.error(f"Error saving hash file: {e}")
+        written = get_state_store().update_hashes(hash_dict)
+        logger.info(f"Saved {written} content hashes to {STATE_DB_FILE}")
+    except sqlite3.Error as e:
+        logger.error(f"Error saving content hashes: {e}")
         raise
 
 
-def detect_changes(url_list: List[str]) -> Dict[str, str]:
+def load_http_validators() -> Dict[str, Dict[str, str]]:
     """
-    Compare current vs stored hashes for given URLs.
+    Load per-URL HTTP validators from the state store.
+    
+    Returns:
+        dict: Dictionary of URL -> {'etag': ..., 'last_modified': ...},
+              empty dict if the store cannot be read
+    """
+    try:
+        validators = get_state_store().validators()
+        logger.info(f"Loaded HTTP validators for {len(validators)} URLs.")
+        return validators
+    except sqlite3.Error as e:
+        logger.error(f"Error loading HTTP validators: {e}. Starting with empty dictionary.")
+        return {}
+
+
+def save_http_validators(validators: Dict[str, Dict[str, str]]) -> None:
+    """
+    Save per-URL HTTP validators to the state store.
     
     Args:
-        url_list: List of URLs to check for changes
-        
+        validators: Dictionary of URL -> {'etag': ..., 'last_modified': ...}; an empty dict clears a URL's validators
+    """
+    try:
+        written = get_state_store().update_validators(validators)
+        logger.info(f"Saved HTTP validators for {written} URLs to {STATE_DB_FILE}")
+    except sqlite3.Error as e:
+        logger.error(f"Error saving HTTP validators: {e}")
+        raise
+
+
+def load_content_fingerprints() -> Dict[str, str]:
+    """
+    Load per-URL content fingerprints from the state store.
+    
+    Only fingerprints computed with HASH_ALGORITHM are returned, so they
+    can be compared with freshly computed ones.
+    
     Returns:
-        dict: Dictionary with changed URLs and their new hashes
+        dict: Dictionary of URL -> fingerprint, empty dict if the store cannot be read
+    """
+    try:
+        fingerprints = get_state_store().fingerprints(HASH_ALGORITHM)
+        logger.info(f"Loaded {len(fingerprints)} content fingerprints.")
+        return fingerprints
+    except sqlite3.Error as e:
+        logger.error(f"Error loading content fingerprints: {e}. Starting with empty dictionary.")
+        return {}
+
+
+def save_content_fingerprints(fingerprints: Dict[str, str], algorithm: Optional[str] = None) -> None:
+    """
+    Save per-URL content fingerprints to the state store.
+    
+    Args:
+        fingerprints: Dictionary of URL -> fingerprint
+        algorithm: Algorithm the fingerprints were computed with (defaults to HASH_ALGORITHM)
+    """
+    try:
+        written = get_state_store().update_fingerprints(fingerprints, algorithm or HASH_ALGORITHM)
+        logger.info(f"Saved {written} content fingerprints to {STATE_DB_FILE}")
+    except sqlite3.Error as e:
+        logger.error(f"Error saving content fingerprints: {e}")
+        raise
+
+
+class ChangeSet:
+    """
+    Outcome of comparing the live site against the stored content hashes.
+    
+    Attributes:
+        new: URL -> current hash, for URLs without a stored hash
+        changed: URL -> current hash, for URLs whose content hash differs
+        removed: URLs with a stored hash that are gone (404/410 or no longer listed)
+        unchanged: URLs whose content is identical or that answered 304
+        failed: URL -> error message, for URLs that could not be checked
+        fingerprints: URL -> current content fingerprint (HASH_ALGORITHM), for every page that was fetched
+        validators: URL -> ETag/Last-Modified validators returned by the server
+    """
+    
+    def __init__(self):
+        self.new: Dict[str, str] = {}
+        self.changed: Dict[str, str] = {}
+        self.removed: Set[str] = set()
+        self.unchanged: Set[str] = set()
+        self.failed: Dict[str, str] = {}
+        self.fingerprints: Dict[str, str] = {}
+        self.validators: Dict[str, Dict[str, str]] = {}
+    
+    @property
+    def hashes(self) -> Dict[str, str]:
+        """New hashes of every new or changed URL."""
+        return {**self.new, **self.changed}
+    
+    def summary(self) -> Dict[str, int]:
+        """Count of URLs in each category."""
+        return {
+            'new': len(self.new),
+            'changed': len(self.changed),
+            'removed': len(self.removed),
+            'unchanged': len(self.unchanged),
+            'failed': len(self.failed)
+        }
+
+
+class _HashCollector:
+    """
+    Stand-in for scrape_docs' result writer that keeps only result summaries.
+    
+    Change detection needs each page's content hash, not its body, so pages
+    are reduced to a summary as soon as they are fetched and extracted.
+    """
+    
+    def write(self, result: Dict) -> Dict:
+        from corpus_io import summarize_result
+        return summarize_result(result)
+
+
+def detect_changes(url_list: List[str], max_workers: Optional[int] = None,
+                   requests_per_second: Optional[float] = None) -> ChangeSet:
+    """
+    Fetch the given URLs and compare their content against the stored hashes.
+    
+    Pages are fetched concurrently by the scraper's worker pool (same
+    sessions, rate limiter and retry policy). URLs with stored HTTP
+    validators are requested conditionally, and a 304 keeps the stored
+    hash without downloading the page. Otherwise the page's main content
+    is extracted and hashed exactly as scrape_docs does before saving it.
+    
+    A page only counts as changed when its normalized fingerprint (see
+    calculate_content_fingerprint) differs from the stored one, so markup,
+    whitespace or tracking-attribute churn does not trigger a rebuild.
+    Pages without a stored fingerprint fall back to the raw content hash.
+    
+    Args:
+        url_list: Complete list of current URLs; stored URLs missing from it are reported as removed
+        max_workers: Worker threads (defaults to scrape_docs.MAX_WORKERS)
+        requests_per_second: Per-host rate limit (defaults to scrape_docs.REQUESTS_PER_SECOND)
         
-    Note:
-        This function assumes you have a way to fetch current content for URLs.
-        For now, it returns URLs not in existing hash file as "changed".
+    Returns:
+        ChangeSet with new, changed, removed, unchanged and failed URLs
     """
+    # Imported here: scrape_docs imports this module
+    from scrape_docs import MAX_WORKERS, REQUESTS_PER_SECOND, scrape_all_urls
+    
     existing_hashes = load_existing_hashes()
-    changed_urls = {}
+    existing_fingerprints = load_content_fingerprints()
+    validators = load_http_validators()
+    changes = ChangeSet()
+    
+    # A 304 means the stored hash is still current; it stands in for the previous extraction
+    previous_results = {url: {'success': True, 'content_hash': content_hash,
+                              'content_fingerprint': existing_fingerprints.get(url),
+                              'fingerprint_algorithm': HASH_ALGORITHM}
+                        for url, content_hash in existing_hashes.items()}
+    
+    results = scrape_all_urls(
+        url_list,
+        max_workers=max_workers or MAX_WORKERS,
+        validators=validators,
+        previous_results=previous_results,
+        requests_per_second=REQUESTS_PER_SECOND if requests_per_second is None else requests_per_second,
+        writer=_HashCollector()
+    )
     
     for url in url_list:
+        result = results.get(url, {'success': False, 'error': 'Not checked'})
+        if result.get('http_validators'):
+            changes.validators[url] = result['http_validators']
+        
+        if not result.get('success', False):
+            if result.get('status_code') in (404, 410) and url in existing_hashes:
+                changes.removed.add(url)
+            else:
+                changes.failed[url] = result.get('error') or 'Unknown error'
+            continue
+        
+        content_hash = result.get('content_hash')
+        # Fingerprints are only comparable when computed with the same algorithm
+        fingerprint = (result.get('content_fingerprint')
+                       if result.get('fingerprint_algorithm') == HASH_ALGORITHM else None)
+        if fingerprint:
+            changes.fingerprints[url] = fingerprint
+        
         if url not in existing_hashes:
-            # URL not in existing hashes - treat as changed
-            # In a real implementation, you would fetch the content and hash it
-            logger.info(f"URL not in existing hashes (new or first run): {url}")
-            changed_urls[url] = "new_url_placeholder_hash"
-        # Note: To detect actual content changes, you would:
-        # 1. Fetch current content for the URL
-        # 2. Calculate its hash using calculate_content_hash()
-        # 3. Compare with existing_hashes[url]
-        # 4. If different, add to changed_urls
-    
-    logger.info(f"Detected {len(changed_urls)} changed URLs out of {len(url_list)} total URLs.")
-    return changed_urls
+            logger.debug(f"New URL: {url}")
+            changes.new[url] = content_hash
+        elif content_hash == existing_hashes[url]:
+            changes.unchanged.add(url)
+        elif fingerprint and fingerprint == existing_fingerprints.get(url):
+            logger.debug(f"Only cosmetic changes, content unchanged: {url}")
+            changes.unchanged.add(url)
+        else:
+            logger.debug(f"Content changed: {url}")
+            changes.changed[url] = content_hash
+    
+    listed = set(url_list)
+    changes.removed.update(url for url in existing_hashes if url not in listed)
+    
+    counts = changes.summary()
+    logger.info(f"Detected {counts['new']} new, {counts['changed']} changed, {counts['removed']} removed, "
+                f"{counts['unchanged']} unchanged and {counts['failed']} unchecked URLs "
+                f"out of {len(url_list)} total URLs.")
+    return changes
 
 
 def get_changed_urls(url_list: List[str]) -> List[str]:
@@ -163,64 +479,229 @@ def get_changed_urls(url_list: List[str]) -> List[str]:
         url_list: List of URLs to check
         
     Returns:
-        list: List of URLs that have changed or are new
+        list: URLs that are new, have changed or could not be checked, in url_list order
     """
-    changed_dict = detect_changes(url_list)
-    changed_urls = list(changed_dict.keys())
+    changes = detect_changes(url_list)
+    changed_urls = [url for url in url_list
+                    if url in changes.new or url in changes.changed or url in changes.failed]
     
     logger.info(f"Found {len(changed_urls)} URLs that need reprocessing.")
     return changed_urls
 
 
-def initialize_content_hashes() -> None:
+def _node_hash(children: Dict[str, str], algorithm: str) -> str:
+    """Hash a tree node from its children's names and hashes, independent of their order."""
+    return calculate_content_hash('\n'.join(f"{name}\t{children[name]}" for name in sorted(children)), algorithm)
+
+
+class MerkleTree:
     """
-    Initialize content_hashes.json with empty structure and current timestamp.
+    Hash tree over the corpus: URL leaves, one node per category, one root.
+    
+    A leaf is the URL's content fingerprint (raw content hash if it has
+    none, '' if it was never scraped). Each category hashes its URLs and
+    their leaves, and the root hashes the categories, so comparing two
+    trees' roots or category hashes answers "did anything change?" for
+    the whole corpus or a category in O(1). diff() only descends into
+    categories whose hashes differ.
     """
-    initial_data = {
-        "last_update": datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
-    }
     
-    try:
-        HASHES_FILE.parent.mkdir(parents=True, exist_ok=True)
-        with open(HASHES_FILE, 'w', encoding='utf-8') as f:
-            json.dump(initial_data, f, indent=2)
-        logger.info(f"Initialized content hashes file at {HASHES_FILE}")
-    except Exception as e:
-        logger.error(f"Error initializing hash file: {e}")
-        raise
+    def __init__(self, leaves: Dict[str, Dict[str, str]], algorithm: Optional[str] = None):
+        """
+        Args:
+            leaves: category -> {URL: leaf hash}
+            algorithm: Key of HASH_ALGORITHMS for the inner nodes (defaults to HASH_ALGORITHM)
+        """
+        self.algorithm = algorithm or HASH_ALGORITHM
+        self.leaves = {category: dict(urls) for category, urls in leaves.items()}
+        self.category_hashes = {category: _node_hash(urls, self.algorithm) for category, urls in self.leaves.items()}
+        self.root = _node_hash(self.category_hashes, self.algorithm)
+    
+    def category_changed(self, other: Optional['MerkleTree'], category: str) -> bool:
+        """Return True if a category's subtree differs from (or is missing in) another tree."""
+        if other is None:
+            return True
+        return self.category_hashes.get(category) != other.category_hashes.get(category)
+    
+    def diff(self, other: Optional['MerkleTree']) -> Dict[str, Dict[str, List[str]]]:
+        """
+        Compare against an older tree.
+        
+        Args:
+            other: Older tree (None compares against an empty tree)
+            
+        Returns:
+            dict: category -> {'added': URLs, 'removed': URLs, 'changed': URLs}
+                  for every category whose subtree differs
+        """
+        other = other or MerkleTree({}, self.algorithm)
+        if self.root == other.root:
+            return {}
+        
+        differences = {}
+        for category in sorted(set(self.category_hashes) | set(other.category_hashes)):
+            if not self.category_changed(other, category):
+                continue
+            current = self.leaves.get(category, {})
+            previous = other.leaves.get(category, {})
+            differences[category] = {
+                'added': sorted(url for url in current if url not in previous),
+                'removed': sorted(url for url in previous if url not in current),
+                'changed': sorted(url for url in current if url in previous and current[url] != previous[url])
+            }
+        return differences
+    
+    def nodes(self) -> Iterator[Tuple[str, str, str]]:
+        """Yield (parent, node, hash) for every node; the root is ('', '') and categories hang off ''."""
+        yield '', '', self.root
+        for category, category_hash in self.category_hashes.items():
+            yield '', category, category_hash
+            for url, leaf in self.leaves[category].items():
+                yield category, url, leaf
+    
+    @classmethod
+    def from_nodes(cls, nodes: Iterable[Tuple[str, str, str]], algorithm: Optional[str] = None) -> 'MerkleTree':
+        """Rebuild a tree from the tuples produced by nodes()."""
+        leaves: Dict[str, Dict[str, str]] = {}
+        for parent, node, node_hash in nodes:
+            if parent == '':
+                if node:
+                    leaves.setdefault(node, {})
+            else:
+                leaves.setdefault(parent, {})[node] = node_hash
+        return cls(leaves, algorithm)
 
 
-if __name__ == "__main__":
-    # Example usage and testing
-    print("X-Plane SDK Documentation Change Detector")
-    print("=" * 50)
+def load_url_categories(path: Path = None) -> Dict[str, List[str]]:
+    """
+    Load the category -> URLs mapping written by process_content.categorize_urls_by_module.
     
-    # Initialize if needed
-    if not HASHES_FILE.exists():
-        print("Initializing content hashes file...")
-        initialize_content_hashes()
+    Args:
+        path: categorized_urls.json (defaults to CATEGORIZED_URLS_FILE)
+        
+    Returns:
+        dict: Category -> URL list, empty dict if the file does not exist
+    """
+    path = Path(path or CATEGORIZED_URLS_FILE)
+    if not path.exists():
+        logger.warning(f"Categorized URLs file not found: {path}")
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f).get('categories', {})
+
+
+def build_merkle_tree(categories: Optional[Dict[str, List[str]]] = None) -> MerkleTree:
+    """
+    Build the corpus tree from the categorized URLs and the state store.
     
-    # Example URL list
-    example_urls = [
-        "https://developer.x-plane.com/sdk/XPLMCamera/",
-        "https://developer.x-plane.com/sdk/XPLMDataAccess/",
-        "https://developer.x-plane.com/sdk/XPLMDisplay/"
-    ]
+    Args:
+        categories: Category -> URL list (defaults to load_url_categories())
+        
+    Returns:
+        MerkleTree over the current content fingerprints
+    """
+    if categories is None:
+        categories = load_url_categories()
+    store = get_state_store()
+    fingerprints = store.fingerprints(HASH_ALGORITHM)
+    hashes = store.hashes()
+    return MerkleTree({
+        category: {url: fingerprints.get(url) or hashes.get(url) or '' for url in urls}
+        for category, urls in categories.items()
+    })
+
+
+def load_merkle_snapshot(name: str) -> Optional[MerkleTree]:
+    """
+    Load the tree a pipeline stage last built from.
     
-    print(f"\nTesting with example URLs: {len(example_urls)} URLs")
+    Args:
+        name: Snapshot name (e.g. 'process_content', 'organize_docs')
+        
+    Returns:
+        MerkleTree, or None if the stage has not saved a snapshot yet or
+        saved it with another hash algorithm
+    """
+    store = get_state_store()
+    nodes = store.load_snapshot(name)
+    if not nodes:
+        return None
+    algorithm = store.snapshot_algorithm(name)
+    if algorithm != HASH_ALGORITHM:
+        logger.info(f"Snapshot '{name}' was hashed with {algorithm}, not {HASH_ALGORITHM}; ignoring it")
+        return None
+    return MerkleTree.from_nodes(nodes, algorithm)
+
+
+def save_merkle_snapshot(name: str, tree: MerkleTree) -> None:
+    """
+    Record the tree a pipeline stage has just built from.
     
-    # Test hash calculation
-    test_content = "This is test content for hashing"
-    test_hash = calculate_content_hash(test_content)
-    print(f"Test hash: {test_hash}")
+    Args:
+        name: Snapshot name (e.g. 'process_content', 'organize_docs')
+        tree: Tree to store
+    """
+    get_state_store().save_snapshot(name, tree.nodes(), tree.algorithm)
+    logger.info(f"Saved corpus tree snapshot '{name}' (root {tree.root[:12]})")
+
+
+def print_tree_summary(since: str) -> None:
+    """Print which category subtrees of the current tree differ from a stage's last snapshot."""
+    current = build_merkle_tree()
+    previous = load_merkle_snapshot(since)
     
-    # Test change detection
-    changed_urls = get_changed_urls(example_urls)
-    print(f"Changed URLs: {changed_urls}")
+    if previous is None:
+        print(f"No '{since}' snapshot yet; every category counts as changed.")
+    print(f"Corpus root: {current.root[:12]} (last {since}: {previous.root[:12] if previous else '-'})")
     
-    # Test saving hashes
-    test_hashes = {url: f"hash_{i}" for i, url in enumerate(example_urls)}
-    save_content_hashes(test_hashes)
-    print("Saved test hashes successfully")
+    differences = current.diff(previous)
+    for category in sorted(set(current.category_hashes) | set(differences)):
+        if category in differences:
+            counts = {kind: len(urls) for kind, urls in differences[category].items()}
+            print(f"  {category:<20} changed    {counts['changed']} changed, "
+                  f"{counts['added']} added, {counts['removed']} removed")
+        else:
+            print(f"  {category:<20} unchanged")
+    print(f"{len(differences)} of {len(set(current.category_hashes) | set(differences))} categories differ")
+
+
+def initialize_content_hashes() -> None:
+    """
+    Create the state store (and import any legacy JSON state into it).
+    """
+    store = get_state_store()
+    logger.info(f"Initialized state store at {store.path} ({len(store)} URLs)")
+
+
+if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Detect changed X-Plane SDK documentation pages')
+    parser.add_argument('--workers', type=int, default=None, help='Concurrent fetch threads')
+    parser.add_argument('--rps', type=float, default=None, help='Requests per second per host (0 disables)')
+    parser.add_argument('--list', action='store_true', help='Print every new, changed and removed URL')
+    parser.add_argument('--summary', action='store_true',
+                        help='Without fetching, show which categories differ from the last build')
+    parser.add_argument('--since', default='organize_docs',
+                        help='Stage snapshot --summary compares against (default: organize_docs)')
+    args = parser.parse_args()
     
-    print("\nChange detector module implementation complete!")
\ No newline at end of file
+    print("X-Plane SDK Documentation Change Detector")
+    print("=" * 50)
+    
+    if args.summary:
+        print_tree_summary(args.since)
+    else:
+        from scrape_docs import load_categorized_urls
+        
+        urls = load_categorized_urls()
+        print(f"\nChecking {len(urls)} URLs against {STATE_DB_FILE}")
+        changes = detect_changes(urls, max_workers=args.workers, requests_per_second=args.rps)
+        
+        for category, count in changes.summary().items():
+            print(f"  {category}: {count}")
+        
+        if args.list:
+            for label, urls in (('new', changes.new), ('changed', changes.changed), ('removed', changes.removed)):
+                for url in sorted(urls):
+                    print(f"{label:>8}  {url}")
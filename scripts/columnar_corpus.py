@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""
+X-Plane SDK Documentation Columnar Corpus
+
+Compact binary export of the processed corpus for tools that scan many
+pages at once (search, validation, stats). The file holds two tables,
+pages and api_signatures, stored column by column. Readers memory-map
+the file and decode only the cells they touch, so opening it costs one
+small header parse however large the corpus is.
+
+Layout (all integers little-endian):
+    magic      8 bytes   b'XPSDKCOL'
+    length     uint64    size of the JSON header
+    header     JSON      tables, row counts and the byte range of every column buffer
+    buffers    ...       8-byte aligned column buffers
+
+Columns:
+    str    offsets (uint64, rows + 1) into a UTF-8 data buffer, plus a
+           validity buffer (one byte per row) when some rows have no value
+    json   like str; each cell holds a JSON document, decoded on access
+    uint32 one uint32 per row
+
+Tables:
+    pages           url, title, category, module, markdown
+    api_signatures  page (row in pages), name, type, signature, description,
+                    source, deprecated (json), parameters (json), values (json);
+                    rows are grouped by page in page order
+
+Purpose:
+- Load the whole SDK corpus without deserializing every page
+- Slice a column (e.g. every page's markdown) without touching the others
+- Read a page's API signatures without parsing any other page
+
+Usage:
+    python columnar_corpus.py export    # write raw_data/processed/corpus.xcol
+
+    with ColumnarCorpus() as corpus:
+        titles = corpus.pages['title'][:10]
+        for row in corpus.signatures_for(corpus.page_index(url)):
+            print(corpus.api_signatures.row(row))
+"""
+
+import argparse
+import json
+import logging
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from processed_corpus import PROCESSED_CORPUS_DIR, ProcessedCorpus
+
+logger = logging.getLogger(__name__)
+
+# File paths
+COLUMNAR_CORPUS_FILE = PROCESSED_CORPUS_DIR / "corpus.xcol"
+
+MAGIC = b'XPSDKCOL'
+FORMAT_VERSION = 1
+ALIGNMENT = 8
+
+PAGE_COLUMNS = (('url', 'str'), ('title', 'str'), ('category', 'str'), ('module', 'str'), ('markdown', 'str'))
+SIGNATURE_COLUMNS = (('page', 'uint32'), ('name', 'str'), ('type', 'str'), ('signature', 'str'),
+                     ('description', 'str'), ('source', 'str'), ('deprecated', 'json'),
+                     ('parameters', 'json'), ('values', 'json'))
+
+
+class _BufferWriter:
+    """Collect aligned column buffers and remember where each one starts."""
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+        self.size = 0
+
+    def add(self, data: bytes) -> Tuple[int, int]:
+        """Append a buffer; returns (offset relative to the buffer area, length)."""
+        offset = self.size
+        self.chunks.append(data)
+        padding = -len(data) % ALIGNMENT
+        if padding:
+            self.chunks.append(b'\0' * padding)
+        self.size += len(data) + padding
+        return offset, len(data)
+
+
+def _encode_column(kind: str, values: List[Any], buffers: _BufferWriter) -> Dict[str, Any]:
+    """Write one column's buffers and return its header entry (offsets relative to the buffer area)."""
+    if kind == 'uint32':
+        return {'kind': kind, 'data': buffers.add(array('I', values).tobytes())}
+
+    offsets = array('Q', [0])
+    data = bytearray()
+    valid = bytearray()
+    for value in values:
+        if value is not None:
+            data += (json.dumps(value, ensure_ascii=False) if kind == 'json' else value).encode('utf-8')
+        offsets.append(len(data))
+        valid.append(value is not None)
+    column = {'kind': kind, 'offsets': buffers.add(offsets.tobytes()), 'data': buffers.add(bytes(data))}
+    if not all(valid):
+        column['validity'] = buffers.add(bytes(valid))
+    return column
+
+
+def _encode_table(columns: Iterable[Tuple[str, str]], rows: List[Dict[str, Any]],
+                  buffers: _BufferWriter) -> Dict[str, Any]:
+    table = {'rows': len(rows), 'columns': {}}
+    for name, kind in columns:
+        table['columns'][name] = _encode_column(kind, [row.get(name) for row in rows], buffers)
+    return table
+
+
+def export_columnar_corpus(corpus: Optional[ProcessedCorpus] = None,
+                           path: Path = COLUMNAR_CORPUS_FILE) -> Path:
+    """
+    Write the processed corpus as a columnar file.
+
+    Every page payload is read once. The file is written next to its final
+    location and renamed into place, so readers never see a partial file.
+
+    Args:
+        corpus: Processed corpus to export (default: the one in PROCESSED_CORPUS_DIR)
+        path: Output file
+
+    Returns:
+        Path: The file that was written
+    """
+    if corpus is None:
+        corpus = ProcessedCorpus()
+    pages = []
+    signatures = []
+    for index, (url, page) in enumerate(corpus.items()):
+        category = page.get('category') or {}
+        pages.append({
+            'url': url,
+            'title': page.get('title'),
+            'category': category.get('category'),
+            'module': category.get('module'),
+            'markdown': page.get('markdown'),
+        })
+        for signature in page.get('api_signatures') or []:
+            signatures.append(dict(signature, page=index))
+
+    buffers = _BufferWriter()
+    header = {
+        'version': FORMAT_VERSION,
+        'metadata': corpus.metadata,
+        'tables': {
+            'pages': _encode_table(PAGE_COLUMNS, pages, buffers),
+            'api_signatures': _encode_table(SIGNATURE_COLUMNS, signatures, buffers),
+        },
+    }
+    header_bytes = json.dumps(header, sort_keys=True, ensure_ascii=False).encode('utf-8')
+    header_bytes += b' ' * (-(len(MAGIC) + 8 + len(header_bytes)) % ALIGNMENT)
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix='.' + path.name)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(MAGIC)
+            f.write(struct.pack('<Q', len(header_bytes)))
+            f.write(header_bytes)
+            for chunk in buffers.chunks:
+                f.write(chunk)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+    logger.info(f"Exported {len(pages)} pages and {len(signatures)} API signatures to {path}")
+    return path
+
+
+class StringColumn(Sequence):
+    """
+    Text column read straight from the mapped file.
+
+    Indexing decodes one cell; slicing decodes only the cells in the
+    slice. Missing values read as None.
+    """
+
+    def __init__(self, buffer: memoryview, spec: Dict[str, Any], rows: int, base: int):
+        offset, length = spec['offsets']
+        self._offsets = buffer[base + offset:base + offset + length].cast('Q')
+        offset, length = spec['data']
+        self._data = buffer[base + offset:base + offset + length]
+        self._valid = None
+        if 'validity' in spec:
+            offset, length = spec['validity']
+            self._valid = buffer[base + offset:base + offset + length]
+        self._rows = rows
+
+    def __len__(self) -> int:
+        return self._rows
+
+    def raw(self, index: int) -> Optional[memoryview]:
+        """Return a cell's UTF-8 bytes without copying them (None if missing)."""
+        if self._valid is not None and not self._valid[index]:
+            return None
+        return self._data[self._offsets[index]:self._offsets[index + 1]]
+
+    def _decode(self, raw: memoryview) -> Any:
+        return str(raw, 'utf-8')
+
+    def release(self) -> None:
+        """Release the views into the mapped file."""
+        for view in (self._offsets, self._data, self._valid):
+            if view is not None:
+                view.release()
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._rows))]
+        if index < 0:
+            index += self._rows
+        if not 0 <= index < self._rows:
+            raise IndexError(index)
+        raw = self.raw(index)
+        return None if raw is None else self._decode(raw)
+
+
+class JsonColumn(StringColumn):
+    """Column of JSON documents, parsed on access."""
+
+    def _decode(self, raw: memoryview) -> Any:
+        return json.loads(str(raw, 'utf-8'))
+
+
+def _uint32_column(buffer: memoryview, spec: Dict[str, Any], rows: int, base: int) -> memoryview:
+    offset, length = spec['data']
+    return buffer[base + offset:base + offset + length].cast('I')
+
+
+COLUMN_READERS = {'str': StringColumn, 'json': JsonColumn, 'uint32': _uint32_column}
+
+
+class Table:
+    """Named columns of one table; columns are opened on first use."""
+
+    def __init__(self, buffer: memoryview, spec: Dict[str, Any], base: int):
+        self.rows = spec['rows']
+        self._buffer = buffer
+        self._specs = spec['columns']
+        self._base = base
+        self._columns: Dict[str, Sequence] = {}
+
+    def __len__(self) -> int:
+        return self.rows
+
+    @property
+    def column_names(self) -> List[str]:
+        return list(self._specs)
+
+    def __getitem__(self, name: str) -> Sequence:
+        column = self._columns.get(name)
+        if column is None:
+            spec = self._specs[name]
+            column = COLUMN_READERS[spec['kind']](self._buffer, spec, self.rows, self._base)
+            self._columns[name] = column
+        return column
+
+    def row(self, index: int) -> Dict[str, Any]:
+        """Decode one row; missing values are left out."""
+        row = {}
+        for name in self._specs:
+            value = self[name][index]
+            if value is not None:
+                row[name] = value
+        return row
+
+    def release(self) -> None:
+        """Release every opened column; values already decoded stay valid."""
+        for column in self._columns.values():
+            column.release()
+        self._columns.clear()
+
+
+class ColumnarCorpus:
+    """
+    Memory-mapped reader for a columnar corpus file.
+
+    Use as a context manager (or call close()) so the mapping is released.
+    """
+
+    def __init__(self, path: Path = COLUMNAR_CORPUS_FILE):
+        if sys.byteorder != 'little':
+            raise OSError("Columnar corpus files are little-endian; this reader needs a little-endian host")
+        self.path = Path(path)
+        self._file = open(self.path, 'rb')
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except BaseException:
+            self._file.close()
+            raise
+        self._buffer = memoryview(self._mmap)
+
+        if self._buffer[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"{self.path} is not a columnar corpus file")
+        header_length, = struct.unpack_from('<Q', self._buffer, len(MAGIC))
+        header_start = len(MAGIC) + 8
+        header = json.loads(bytes(self._buffer[header_start:header_start + header_length]))
+        if header.get('version', 0) > FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"{self.path} has format version {header['version']}; "
+                             f"this reader supports up to {FORMAT_VERSION}")
+
+        base = header_start + header_length
+        self.metadata = header.get('metadata', {})
+        self.pages = Table(self._buffer, header['tables']['pages'], base)
+        self.api_signatures = Table(self._buffer, header['tables']['api_signatures'], base)
+        self._page_indexes: Optional[Dict[str, int]] = None
+
+    def __len__(self) -> int:
+        return len(self.pages)
+
+    def page_index(self, url: str) -> int:
+        """Return the row of a page in the pages table (KeyError if missing)."""
+        if self._page_indexes is None:
+            self._page_indexes = {page_url: index for index, page_url in enumerate(self.pages['url'])}
+        return self._page_indexes[url]
+
+    def signatures_for(self, page: int) -> range:
+        """Return the api_signatures rows of a page, found by binary search on the page column."""
+        pages = self.api_signatures['page']
+        return range(bisect_left(pages, page), bisect_right(pages, page))
+
+    def close(self) -> None:
+        """
+        Unmap the file.
+
+        Views returned by StringColumn.raw() must be released first;
+        decoded values stay valid.
+        """
+        if self._mmap is None:
+            return
+        for table in (getattr(self, 'pages', None), getattr(self, 'api_signatures', None)):
+            if table is not None:
+                table.release()
+        self._buffer.release()
+        self._mmap.close()
+        self._file.close()
+        self._mmap = None
+
+    def __enter__(self) -> 'ColumnarCorpus':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description='Export the processed X-Plane SDK corpus to a columnar file')
+    parser.add_argument('command', choices=['export'], help="'export' writes the columnar corpus file")
+    parser.add_argument('--output', type=Path, default=COLUMNAR_CORPUS_FILE, help='Output file')
+    args = parser.parse_args()
+    export_columnar_corpus(path=args.output)
@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""
+X-Plane SDK Documentation Scraped Corpus I/O
+
+Streaming storage for scraped pages. Each page is written as one JSON
+record per line to raw_data/scraped_content.jsonl as soon as it is scraped,
+and readers iterate the file record by record, so memory use stays flat no
+matter how large the corpus grows. Page bodies (content and raw_html) live
+in the content-addressed blob store next to the file; records carry only
+their hashes (content_hash, raw_html_hash).
+
+Purpose:
+- Write scrape results incrementally instead of dumping one giant document
+- Finish a run atomically: records go to a .partial file that is renamed on success
+- Resume an interrupted run: the .partial file doubles as the checkpoint journal
+- Iterate records lazily for processing and validation, loading only the bodies needed
+- Look up individual records from the previous run by byte offset
+
+Usage:
+    with ScrapedContentWriter() as writer:
+        writer.write(result)
+
+    with ScrapedContentWriter(resume=True) as writer:
+        todo = [url for url in urls if url not in writer.completed_urls()]
+
+    for url, record in iter_scraped_content():
+        ...
+
+Files:
+    raw_data/scraped_content.jsonl: Current format, one record per line
+    raw_data/blobs/: Compressed page bodies referenced by the records (see blob_store)
+    raw_data/scraped_content.json: Legacy single-document format (read-only fallback)
+"""
+
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from blob_store import BLOBS_DIR, BlobStore
+from change_detector import CONTENT_HASH_ALGORITHM, calculate_content_hash
+
+logger = logging.getLogger(__name__)
+
+# File paths
+PROJECT_ROOT = Path(__file__).parent.parent
+RAW_DATA_DIR = PROJECT_ROOT / "raw_data"
+SCRAPED_CONTENT_JSONL = RAW_DATA_DIR / "scraped_content.jsonl"
+LEGACY_SCRAPED_CONTENT_FILE = RAW_DATA_DIR / "scraped_content.json"
+
+# Journal records between fsyncs; a crash loses at most this many pages
+CHECKPOINT_INTERVAL = 25
+
+# Page bodies moved to the blob store; records keep '<field>_hash' instead
+BLOB_FIELDS = ('content', 'raw_html')
+
+# Result fields small enough to keep in memory for every page
+SUMMARY_FIELDS = ('url', 'status_code', 'success', 'error', 'content_fingerprint', 'fingerprint_algorithm',
+                  'http_validators', 'not_modified', 'timestamp')
+
+
+def partial_path(path: Path) -> Path:
+    """Return the in-progress file a writer appends to before the final rename."""
+    return path.with_name(path.name + '.partial')
+
+
+def blob_store_for(path: Path) -> BlobStore:
+    """Return the blob store that sits next to a scraped content file."""
+    return BlobStore(Path(path).parent / BLOBS_DIR.name)
+
+
+def has_content(record: Dict) -> bool:
+    """Return True if a result or stored record has extracted content, inline or as a blob."""
+    return bool(record.get('content') or record.get('content_hash'))
+
+
+def externalize_record(result: Dict, blob_store: BlobStore) -> Dict:
+    """
+    Move a result's page bodies into the blob store.
+
+    Args:
+        result: Scrape result with inline content/raw_html
+        blob_store: Store that receives the bodies
+
+    Returns:
+        Copy of the result with each non-empty BLOB_FIELDS value replaced by '<field>_hash'
+    """
+    record = dict(result)
+    for field in BLOB_FIELDS:
+        value = record.pop(field, None)
+        if value:
+            record[f'{field}_hash'] = blob_store.put(value)
+    return record
+
+
+def load_blob_fields(record: Dict, blob_store: BlobStore, fields: Iterable[str] = ('content',)) -> Dict:
+    """
+    Load page bodies referenced by a stored record back inline.
+
+    Args:
+        record: Stored record (modified in place)
+        blob_store: Store holding the bodies
+        fields: Which of BLOB_FIELDS to load
+
+    Returns:
+        The record, with each requested field set ('' if it had no body)
+    """
+    for field in fields:
+        if field not in record:
+            content_hash = record.get(f'{field}_hash')
+            record[field] = blob_store.get_text(content_hash) if content_hash else ''
+    return record
+
+
+def summarize_result(result: Dict) -> Dict:
+    """
+    Reduce a scrape result to the fields needed after it has been written.
+
+    Args:
+        result: Scrape result or stored record
+
+    Returns:
+        Dict with the SUMMARY_FIELDS plus content_hash (None if no content)
+    """
+    summary = {field: result.get(field) for field in SUMMARY_FIELDS}
+    content = result.get('content')
+    summary['content_hash'] = result.get('content_hash') or (
+        calculate_content_hash(content, CONTENT_HASH_ALGORITHM) if content else None)
+    return summary
+
+
+class ScrapedContentWriter:
+    """
+    Append scrape results to a JSONL file as they complete.
+
+    Records are written to `<path>.partial`, flushed one by one and fsync'd
+    every CHECKPOINT_INTERVAL records, so the partial file is an
+    append-only checkpoint journal. On a clean close it atomically replaces
+    `path`; if the run fails the previous file is left untouched and the
+    journal can be picked up again with resume=True.
+
+    Page bodies go to the blob store before the record that references
+    them is written. Only a lightweight summary of each record (see
+    summarize_result) is kept in memory, in `summaries`.
+    """
+
+    def __init__(self, path: Path = SCRAPED_CONTENT_JSONL, resume: bool = False,
+                 checkpoint_interval: int = CHECKPOINT_INTERVAL, blob_store: Optional[BlobStore] = None):
+        self.path = Path(path)
+        self.partial_path = partial_path(self.path)
+        self.blob_store = blob_store or blob_store_for(self.path)
+        self.resume = resume
+        self.checkpoint_interval = max(1, checkpoint_interval)
+        self.summaries: Dict[str, Dict] = {}
+        self._file = None
+        self._unsynced = 0
+        self._needs_compaction = False
+        self._lock = threading.Lock()
+
+    def open(self) -> 'ScrapedContentWriter':
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.resume and self.partial_path.exists():
+            self._recover_journal()
+            self._file = open(self.partial_path, 'a', encoding='utf-8')
+        else:
+            self._file = open(self.partial_path, 'w', encoding='utf-8')
+        return self
+
+    def _recover_journal(self) -> None:
+        """Load summaries from an existing journal and cut off any torn final record."""
+        valid_end = 0
+        for offset, record in _iter_jsonl(self.partial_path):
+            if record['url'] in self.summaries:
+                self._needs_compaction = True
+            summary = summarize_result(record)
+            # Blobs are not fsync'd; a page whose body was lost is fetched again
+            if summary['success'] and any(record[f'{field}_hash'] not in self.blob_store
+                                          for field in BLOB_FIELDS if f'{field}_hash' in record):
+                summary['success'] = False
+            self.summaries[record['url']] = summary
+        with open(self.partial_path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                valid_end += len(line)
+        os.truncate(self.partial_path, valid_end)
+        logger.info(f"Resuming from checkpoint journal {self.partial_path}: "
+                    f"{len(self.completed_urls())} of {len(self.summaries)} recorded URLs completed")
+
+    def completed_urls(self) -> Set[str]:
+        """Return URLs already scraped successfully in this journal."""
+        return {url for url, summary in self.summaries.items() if summary['success']}
+
+    def write(self, result: Dict) -> Dict:
+        """
+        Append one result and return its summary.
+
+        Args:
+            result: Scrape result in the scrape_single_url format
+
+        Returns:
+            Dict: Summary of the record that was written
+        """
+        record = externalize_record(result, self.blob_store)
+        line = json.dumps(record, ensure_ascii=False) + '\n'
+        summary = summarize_result(record)
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+            self._unsynced += 1
+            if self._unsynced >= self.checkpoint_interval:
+                os.fsync(self._file.fileno())
+                self._unsynced = 0
+            if result['url'] in self.summaries:
+                self._needs_compaction = True
+            self.summaries[result['url']] = summary
+        return summary
+
+    def close(self, commit: bool = True) -> None:
+        """
+        Close the partial file and, if commit is True, move it into place.
+
+        Args:
+            commit: Replace the final file with the partial one
+        """
+        if self._file is None:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        self._file = None
+
+        if commit:
+            if self._needs_compaction:
+                self._compact()
+            os.replace(self.partial_path, self.path)
+            logger.info(f"Saved {len(self.summaries)} scraped records to {self.path}")
+        else:
+            logger.warning(f"Scrape did not finish; partial results left in {self.partial_path}")
+
+    def _compact(self) -> None:
+        """Rewrite the journal keeping only the last record written for each URL."""
+        last_offsets: Dict[str, int] = {}
+        for offset, record in _iter_jsonl(self.partial_path):
+            last_offsets[record['url']] = offset
+
+        compacted_path = self.partial_path.with_name(self.partial_path.name + '.compact')
+        with open(self.partial_path, 'rb') as source, open(compacted_path, 'wb') as target:
+            for offset in last_offsets.values():
+                source.seek(offset)
+                target.write(source.readline())
+            target.flush()
+            os.fsync(target.fileno())
+        os.replace(compacted_path, self.partial_path)
+
+    def __enter__(self) -> 'ScrapedContentWriter':
+        return self.open()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close(commit=exc_type is None)
+
+
+def _iter_jsonl(path: Path) -> Iterator[Tuple[int, Dict]]:
+    """Yield (byte offset, record) for every complete line of a JSONL file."""
+    with open(path, 'rb') as f:
+        offset = 0
+        for line in f:
+            line_offset = offset
+            offset += len(line)
+            if not line.endswith(b'\n'):
+                # A crashed writer can leave a truncated final line
+                logger.warning(f"Ignoring truncated record at end of {path}")
+                break
+            try:
+                yield line_offset, json.loads(line)
+            except json.JSONDecodeError as e:
+                logger.warning(f"Skipping unreadable record at byte {line_offset} of {path}: {e}")
+
+
+def iter_scraped_content(path: Path = SCRAPED_CONTENT_JSONL,
+                         fields: Iterable[str] = ('content',)) -> Iterator[Tuple[str, Dict]]:
+    """
+    Iterate scraped records lazily.
+
+    Only the requested page bodies are loaded from the blob store, one
+    record at a time. Falls back to the legacy single-document
+    scraped_content.json next to `path` when no JSONL file exists; that
+    format has to be loaded whole and always carries its bodies inline.
+
+    Args:
+        path: JSONL file to read
+        fields: Which of BLOB_FIELDS to load into each record
+
+    Yields:
+        (url, record) tuples in file order
+
+    Raises:
+        FileNotFoundError: If neither the JSONL nor the legacy file exists
+    """
+    path = Path(path)
+    if path.exists():
+        blob_store = blob_store_for(path)
+        for _, record in _iter_jsonl(path):
+            yield record['url'], load_blob_fields(record, blob_store, fields)
+        return
+
+    legacy_path = path.with_suffix('.json')
+    if not legacy_path.exists():
+        raise FileNotFoundError(f"Scraped content file not found: {path}")
+
+    logger.info(f"Reading legacy scraped content from {legacy_path}")
+    with open(legacy_path, 'r', encoding='utf-8') as f:
+        scraped_content = json.load(f).get('scraped_content', {})
+    yield from scraped_content.items()
+
+
+def scraped_content_exists(path: Path = SCRAPED_CONTENT_JSONL) -> bool:
+    """Return True if scraped content exists in either format."""
+    path = Path(path)
+    return path.exists() or path.with_suffix('.json').exists()
+
+
+class ScrapedContentIndex:
+    """
+    Read-only, dict-like view of reusable records in a scraped JSONL file.
+
+    Only byte offsets are held in memory; each get() seeks to the record
+    and parses that single line. Records are returned as stored, with page
+    bodies as blob hashes. Only successful records with content are
+    indexed, since those are the only ones a 304 can stand in for.
+    """
+
+    def __init__(self, path: Path = SCRAPED_CONTENT_JSONL):
+        self.path = Path(path)
+        self._offsets: Dict[str, int] = {}
+        for offset, record in _iter_jsonl(self.path):
+            if record.get('success', False) and has_content(record):
+                self._offsets[record['url']] = offset
+            else:
+                self._offsets.pop(record['url'], None)
+        self._file = open(self.path, 'rb')
+        self._lock = threading.Lock()
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._offsets
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def urls(self) -> List[str]:
+        return list(self._offsets)
+
+    def get(self, url: str, default: Optional[Dict] = None) -> Optional[Dict]:
+        offset = self._offsets.get(url)
+        if offset is None:
+            return default
+        with self._lock:
+            self._file.seek(offset)
+            line = self._file.readline()
+        return json.loads(line)
+
+    def close(self) -> None:
+        self._file.close()
@@ -0,0 +1,413 @@
+#!/usr/bin/env python3
+"""
+X-Plane SDK Documentation Full-Text Index
+
+SQLite export of the processed corpus for ranked search: pages, API
+signatures, their parameters and enum values, and code examples, with
+FTS5 full-text indexes over the text columns and a symbol table for
+exact and prefix lookups of SDK names. The FTS5 tables index the rows of
+the regular tables (external content) and are kept in sync by triggers.
+
+The export is incremental. Each page row stores a key derived from the
+page's payload hash, title and category; refresh() replaces only the
+pages whose key changed and drops pages that are gone, so only their
+payloads are loaded. process_content.py refreshes it after every run.
+
+Purpose:
+- Ranked (bm25) full-text search over page text, signatures and code examples
+- Exact and prefix lookup of functions, enums, enum values and #defines
+- Query the SDK docs without rescanning docs/ or the processed corpus
+
+Usage:
+    python fts_index.py refresh                 # bring raw_data/sdk_fts.db up to date
+    python fts_index.py search "draw callback"  # ranked pages
+    python fts_index.py symbol XPLMGetData      # symbols starting with a prefix
+
+    with FtsIndex() as index:
+        index.refresh(ProcessedCorpus())
+        for hit in index.search_pages('flight loop', limit=5):
+            print(hit['url'], hit['snippet'])
+
+Files:
+    raw_data/sdk_fts.db: The database
+"""
+
+import argparse
+import logging
+import re
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from processed_corpus import ProcessedCorpus, page_source_key
+
+logger = logging.getLogger(__name__)
+
+# File paths
+PROJECT_ROOT = Path(__file__).parent.parent
+FTS_DB_FILE = PROJECT_ROOT / "raw_data" / "sdk_fts.db"
+
+SCHEMA_VERSION = 1
+
+# Identifiers keep their underscores, so xplm_Nav_Airport is one token
+TOKENIZER = "unicode61 tokenchars '_'"
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS pages (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL UNIQUE,
+    title TEXT,
+    category TEXT,
+    module TEXT,
+    markdown TEXT,
+    source_key TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS pages_category ON pages (category);
+CREATE TABLE IF NOT EXISTS signatures (
+    id INTEGER PRIMARY KEY,
+    page_id INTEGER NOT NULL REFERENCES pages (id) ON DELETE CASCADE,
+    name TEXT,
+    kind TEXT,
+    signature TEXT,
+    description TEXT,
+    deprecated INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS signatures_page ON signatures (page_id);
+CREATE TABLE IF NOT EXISTS parameters (
+    signature_id INTEGER NOT NULL REFERENCES signatures (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    name TEXT,
+    type TEXT,
+    declaration TEXT,
+    PRIMARY KEY (signature_id, position)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS enum_values (
+    signature_id INTEGER NOT NULL REFERENCES signatures (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    name TEXT,
+    value TEXT,
+    description TEXT,
+    PRIMARY KEY (signature_id, position)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS code_examples (
+    id INTEGER PRIMARY KEY,
+    page_id INTEGER NOT NULL REFERENCES pages (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    language TEXT,
+    context TEXT,
+    code TEXT
+);
+CREATE INDEX IF NOT EXISTS code_examples_page ON code_examples (page_id);
+CREATE TABLE IF NOT EXISTS symbols (
+    name TEXT NOT NULL COLLATE NOCASE,
+    kind TEXT NOT NULL,
+    page_id INTEGER NOT NULL REFERENCES pages (id) ON DELETE CASCADE,
+    signature_id INTEGER REFERENCES signatures (id) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS symbols_name ON symbols (name);
+CREATE INDEX IF NOT EXISTS symbols_page ON symbols (page_id);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS pages_fts USING fts5(
+    title, markdown, content='pages', content_rowid='id', tokenize="{TOKENIZER}");
+CREATE VIRTUAL TABLE IF NOT EXISTS signatures_fts USING fts5(
+    name, signature, description, content='signatures', content_rowid='id', tokenize="{TOKENIZER}");
+CREATE VIRTUAL TABLE IF NOT EXISTS code_examples_fts USING fts5(
+    context, code, content='code_examples', content_rowid='id', tokenize="{TOKENIZER}");
+"""
+
+# Insert and delete triggers keeping each FTS table in sync with its content table
+FTS_TABLES = {
+    'pages': ('title', 'markdown'),
+    'signatures': ('name', 'signature', 'description'),
+    'code_examples': ('context', 'code'),
+}
+
+
+def _trigger_sql(table: str, columns: Iterable[str]) -> str:
+    columns = list(columns)
+    names = ', '.join(columns)
+    new = ', '.join(f"new.{column}" for column in columns)
+    old = ', '.join(f"old.{column}" for column in columns)
+    fts = f"{table}_fts"
+    return f"""
+CREATE TRIGGER IF NOT EXISTS {table}_ai AFTER INSERT ON {table} BEGIN
+    INSERT INTO {fts} (rowid, {names}) VALUES (new.id, {new});
+END;
+CREATE TRIGGER IF NOT EXISTS {table}_ad AFTER DELETE ON {table} BEGIN
+    INSERT INTO {fts} ({fts}, rowid, {names}) VALUES ('delete', old.id, {old});
+END;
+CREATE TRIGGER IF NOT EXISTS {table}_au AFTER UPDATE ON {table} BEGIN
+    INSERT INTO {fts} ({fts}, rowid, {names}) VALUES ('delete', old.id, {old});
+    INSERT INTO {fts} (rowid, {names}) VALUES (new.id, {new});
+END;
+"""
+
+
+TRIGGERS = ''.join(_trigger_sql(table, columns) for table, columns in FTS_TABLES.items())
+
+# Words of a free-text query; FTS5 operators in user input are not interpreted
+QUERY_TERM_PATTERN = re.compile(r'\w+\*?')
+
+
+def fts_query(text: str) -> str:
+    """
+    Turn free text into an FTS5 query matching all of its words.
+
+    Every word is quoted, so punctuation and FTS5 keywords (AND, NEAR, ...)
+    are searched literally. A trailing * keeps prefix matching.
+
+    Args:
+        text: Query as typed, e.g. 'XPLMGetData* callback'
+
+    Returns:
+        str: FTS5 MATCH expression ('' if the text has no words)
+    """
+    terms = []
+    for term in QUERY_TERM_PATTERN.findall(text):
+        prefix = term.endswith('*')
+        terms.append('"' + term.rstrip('*') + '"' + ('*' if prefix else ''))
+    return ' '.join(terms)
+
+
+class FtsIndex:
+    """
+    SQLite full-text index of the processed corpus.
+
+    One connection per instance; refresh() runs in a single transaction,
+    so readers see either the previous or the refreshed index.
+    """
+
+    def __init__(self, path: Path = FTS_DB_FILE):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        with self.conn:
+            self.conn.executescript(SCHEMA + TRIGGERS)
+            self.conn.execute("INSERT INTO meta (key, value) VALUES ('schema_version', ?) "
+                              "ON CONFLICT (key) DO UPDATE SET value = excluded.value", (str(SCHEMA_VERSION),))
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> 'FtsIndex':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+
+    def _insert_page(self, url: str, page: Dict[str, Any], source_key: str) -> None:
+        """Insert one page with its signatures, parameters, enum values, code examples and symbols."""
+        conn = self.conn
+        category = page.get('category') or {}
+        page_id = conn.execute(
+            "INSERT INTO pages (url, title, category, module, markdown, source_key) VALUES (?, ?, ?, ?, ?, ?)",
+            (url, page.get('title'), category.get('category'), category.get('module'), page.get('markdown'),
+             source_key)).lastrowid
+
+        for signature in page.get('api_signatures') or []:
+            kind = signature.get('type') or 'function'
+            signature_id = conn.execute(
+                "INSERT INTO signatures (page_id, name, kind, signature, description, deprecated) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (page_id, signature.get('name'), kind, signature.get('signature'), signature.get('description'),
+                 int(bool(signature.get('deprecated'))))).lastrowid
+            conn.executemany(
+                "INSERT INTO parameters (signature_id, position, name, type, declaration) VALUES (?, ?, ?, ?, ?)",
+                [(signature_id, position, parameter.get('name'), parameter.get('type'),
+                  parameter.get('full_declaration'))
+                 for position, parameter in enumerate(signature.get('parameters') or [])])
+            values = signature.get('values') or []
+            conn.executemany(
+                "INSERT INTO enum_values (signature_id, position, name, value, description) VALUES (?, ?, ?, ?, ?)",
+                [(signature_id, position, value.get('name'), value.get('value'), value.get('description'))
+                 for position, value in enumerate(values)])
+
+            symbols = [(signature.get('name'), kind)] + [(value.get('name'), 'enum_value') for value in values]
+            conn.executemany(
+                "INSERT INTO symbols (name, kind, page_id, signature_id) VALUES (?, ?, ?, ?)",
+                [(name, symbol_kind, page_id, signature_id) for name, symbol_kind in symbols if name])
+
+        conn.executemany(
+            "INSERT INTO code_examples (page_id, position, language, context, code) VALUES (?, ?, ?, ?, ?)",
+            [(page_id, position, example.get('language'), example.get('context'), example.get('code'))
+             for position, example in enumerate(page.get('code_examples') or [])])
+
+    def refresh(self, corpus: ProcessedCorpus) -> Dict[str, int]:
+        """
+        Bring the index up to date with the processed corpus.
+
+        Args:
+            corpus: Processed corpus to index
+
+        Returns:
+            Dict: Number of pages 'added', 'updated', 'removed' and 'unchanged'
+        """
+        stats = {'added': 0, 'updated': 0, 'removed': 0, 'unchanged': 0}
+        indexed = {row['url']: row['source_key'] for row in self.conn.execute("SELECT url, source_key FROM pages")}
+
+        with self.conn:
+            for url, page in corpus.items():
+                source_key = page_source_key(page)
+                previous_key = indexed.pop(url, None)
+                if previous_key == source_key:
+                    stats['unchanged'] += 1
+                    continue
+                if previous_key is not None:
+                    # Child rows and FTS entries go with the page (ON DELETE CASCADE and triggers)
+                    self.conn.execute("DELETE FROM pages WHERE url = ?", (url,))
+                    stats['updated'] += 1
+                else:
+                    stats['added'] += 1
+                self._insert_page(url, page, source_key)
+
+            self.conn.executemany("DELETE FROM pages WHERE url = ?", [(url,) for url in indexed])
+            stats['removed'] = len(indexed)
+
+        logger.info(f"Full-text index {self.path.name}: {stats['added']} pages added, {stats['updated']} updated, "
+                    f"{stats['removed']} removed, {stats['unchanged']} unchanged")
+        return stats
+
+    def search_pages(self, query: str, limit: int = 10, category: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Rank pages by bm25 over title and markdown (title matches weigh more).
+
+        Args:
+            query: Free-text query (see fts_query)
+            limit: Maximum number of hits
+            category: Only search this category
+
+        Returns:
+            List of dicts with url, title, category, score (lower is better) and snippet
+        """
+        match = fts_query(query)
+        if not match:
+            return []
+        sql = ("SELECT pages.url, pages.title, pages.category, bm25(pages_fts, 5.0, 1.0) AS score, "
+               "snippet(pages_fts, 1, '[', ']', '...', 12) AS snippet "
+               "FROM pages_fts JOIN pages ON pages.id = pages_fts.rowid WHERE pages_fts MATCH ?")
+        params: List[Any] = [match]
+        if category:
+            sql += " AND pages.category = ?"
+            params.append(category)
+        sql += " ORDER BY score LIMIT ?"
+        params.append(limit)
+        return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def search_signatures(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Rank API signatures by bm25 over name, declaration and description.
+
+        Args:
+            query: Free-text query (see fts_query)
+            limit: Maximum number of hits
+
+        Returns:
+            List of dicts with name, kind, signature, url and score
+        """
+        match = fts_query(query)
+        if not match:
+            return []
+        rows = self.conn.execute(
+            "SELECT signatures.name, signatures.kind, signatures.signature, pages.url, "
+            "bm25(signatures_fts, 10.0, 2.0, 1.0) AS score "
+            "FROM signatures_fts JOIN signatures ON signatures.id = signatures_fts.rowid "
+            "JOIN pages ON pages.id = signatures.page_id "
+            "WHERE signatures_fts MATCH ? ORDER BY score LIMIT ?", (match, limit))
+        return [dict(row) for row in rows]
+
+    def search_code(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Rank code examples by bm25 over their context and code.
+
+        Args:
+            query: Free-text query (see fts_query)
+            limit: Maximum number of hits
+
+        Returns:
+            List of dicts with url, language, code and score
+        """
+        match = fts_query(query)
+        if not match:
+            return []
+        rows = self.conn.execute(
+            "SELECT pages.url, code_examples.language, code_examples.code, bm25(code_examples_fts) AS score "
+            "FROM code_examples_fts JOIN code_examples ON code_examples.id = code_examples_fts.rowid "
+            "JOIN pages ON pages.id = code_examples.page_id "
+            "WHERE code_examples_fts MATCH ? ORDER BY score LIMIT ?", (match, limit))
+        return [dict(row) for row in rows]
+
+    def lookup_symbols(self, name: str, prefix: bool = False, limit: int = 50) -> List[Dict[str, Any]]:
+        """
+        Find symbols by exact name or name prefix, ignoring case.
+
+        Args:
+            name: Symbol name, e.g. 'XPLMGetDatai'
+            prefix: Match every symbol starting with name
+            limit: Maximum number of results
+
+        Returns:
+            List of dicts with name, kind, url, category and signature (None for enum values)
+        """
+        sql = ("SELECT symbols.name, symbols.kind, pages.url, pages.category, signatures.signature "
+               "FROM symbols JOIN pages ON pages.id = symbols.page_id "
+               "LEFT JOIN signatures ON signatures.id = symbols.signature_id ")
+        if prefix:
+            # Range scan on the NOCASE index; LIKE would need case_sensitive_like to use it
+            sql += "WHERE symbols.name >= ? AND symbols.name < ? ORDER BY symbols.name LIMIT ?"
+            params = (name, name + '\U0010ffff', limit)
+        else:
+            sql += "WHERE symbols.name = ? ORDER BY symbols.name LIMIT ?"
+            params = (name, limit)
+        return [dict(row) for row in self.conn.execute(sql, params)]
+
+
+def refresh_fts_index(corpus: Optional[ProcessedCorpus] = None, path: Path = FTS_DB_FILE) -> Dict[str, int]:
+    """
+    Refresh the full-text index from the processed corpus.
+
+    Args:
+        corpus: Processed corpus (default: the one in raw_data/processed)
+        path: Database file
+
+    Returns:
+        Dict: Page counts per change type (see FtsIndex.refresh)
+    """
+    if corpus is None:
+        corpus = ProcessedCorpus()
+    with FtsIndex(path) as index:
+        return index.refresh(corpus)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description='Full-text index of the processed X-Plane SDK corpus')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('refresh', help='Bring the index up to date with the processed corpus')
+    search_parser = subparsers.add_parser('search', help='Ranked pages, signatures and code examples')
+    search_parser.add_argument('query')
+    search_parser.add_argument('--limit', type=int, default=10)
+    symbol_parser = subparsers.add_parser('symbol', help='Symbols starting with a prefix')
+    symbol_parser.add_argument('name')
+    args = parser.parse_args()
+
+    if args.command == 'refresh':
+        refresh_fts_index()
+    else:
+        with FtsIndex() as index:
+            if args.command == 'search':
+                for hit in index.search_signatures(args.query, args.limit):
+                    print(f"{hit['name']} ({hit['kind']})  {hit['url']}")
+                for hit in index.search_pages(args.query, args.limit):
+                    print(f"{hit['score']:8.2f}  {hit['url']}\n          {hit['snippet']}")
+            else:
+                for hit in index.lookup_symbols(args.name, prefix=True):
+                    print(f"{hit['name']} ({hit['kind']})  {hit['url']}")
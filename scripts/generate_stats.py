@@ -4,15 +4,13 @@ Generate statistics for the documentation organization step.
 """
 
 import os
-import json
 from pathlib import Path
 
-def main():
-    # Load processed content to get total URLs
-    with open('raw_data/processed_content.json', encoding='utf-8') as f:
-        data = json.load(f)
+from processed_corpus import ProcessedCorpus
 
-    total_urls = len(data['processed_content'])
+def main():
+    # Load the processed content manifest to get total URLs
+    total_urls = len(ProcessedCorpus(Path('raw_data') / 'processed'))
     print(f'Total URLs processed: {total_urls}')
 
     # Count generated files
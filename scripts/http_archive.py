@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+X-Plane SDK Documentation HTTP Archive
+
+Record the scraper's HTTP responses to a local archive and replay them
+later without network access. Both modes plug into the threaded engine as
+requests transport adapters, so replayed pages go through exactly the same
+scrape_single_url and extraction code as live ones.
+
+Purpose:
+- Capture a full scrape once (--record) for reproducible benchmarks and CI
+- Replay it offline (--replay) to measure extraction without network variance
+
+Usage:
+    python scrape_docs.py --record archives/2024-06
+    python scrape_docs.py --replay archives/2024-06 --full-refresh
+
+Archive layout:
+    <archive>/index.jsonl: One response per line (url, status, headers, body hash); last entry wins
+    <archive>/blobs/: Response bodies in a BlobStore, deduplicated by SHA-256
+"""
+
+import io
+import json
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from blob_store import BlobStore
+from scrape_docs import CONNECTION_STATS, POOL_CONNECTIONS, PooledHTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILENAME = "index.jsonl"
+BLOBS_DIRNAME = "blobs"
+
+# Bodies are archived decoded, so transfer-level headers no longer apply
+DROPPED_HEADERS = frozenset({'content-encoding', 'content-length', 'transfer-encoding', 'connection', 'keep-alive'})
+
+
+class HttpArchive:
+    """
+    Directory of recorded HTTP responses keyed by request URL.
+
+    Opened for recording, entries are appended to index.jsonl as responses
+    arrive. Opened for replay, the index is loaded into memory (bodies stay
+    in the blob store until requested).
+    """
+
+    def __init__(self, path: Path, mode: str = 'r'):
+        if mode not in ('r', 'a'):
+            raise ValueError(f"Unknown archive mode: {mode}")
+        self.path = Path(path)
+        self.mode = mode
+        self.index_path = self.path / INDEX_FILENAME
+        self.blob_store = BlobStore(self.path / BLOBS_DIRNAME)
+        self._entries: Dict[str, Dict] = {}
+        self._index_file = None
+        self._lock = threading.Lock()
+
+        if mode == 'a':
+            self.path.mkdir(parents=True, exist_ok=True)
+            self._index_file = open(self.index_path, 'a', encoding='utf-8')
+        else:
+            if not self.index_path.exists():
+                raise FileNotFoundError(f"HTTP archive index not found: {self.index_path}")
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._entries[entry['url']] = entry
+            logger.info(f"Loaded {len(self._entries)} archived responses from {self.path}")
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def record(self, response: requests.Response) -> None:
+        """
+        Append a response to the archive.
+
+        Args:
+            response: Response whose body has not been streamed
+        """
+        headers = {name: value for name, value in response.headers.items()
+                   if name.lower() not in DROPPED_HEADERS}
+        entry = {
+            'url': response.request.url,
+            'status_code': response.status_code,
+            'reason': response.reason,
+            'headers': headers,
+            'body_hash': self.blob_store.put(response.content),
+            'recorded_at': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+        }
+        line = json.dumps(entry, ensure_ascii=False) + '\n'
+        with self._lock:
+            self._index_file.write(line)
+            self._index_file.flush()
+            self._entries[entry['url']] = entry
+
+    def urls(self) -> List[str]:
+        """Return the archived URLs that were answered with 200 OK."""
+        return [url for url, entry in self._entries.items() if entry['status_code'] == 200]
+
+    def lookup(self, url: str) -> Optional[Dict]:
+        """Return the archived entry for a URL, or None."""
+        return self._entries.get(url)
+
+    def body(self, entry: Dict) -> bytes:
+        """Return the archived body of an entry."""
+        return self.blob_store.get(entry['body_hash'])
+
+    def close(self) -> None:
+        if self._index_file is not None:
+            self._index_file.close()
+            self._index_file = None
+            logger.info(f"Recorded {len(self._entries)} responses to {self.path}")
+
+
+class RecordingAdapter(PooledHTTPAdapter):
+    """Live keep-alive adapter that also writes every GET response to an archive."""
+
+    def __init__(self, archive: HttpArchive, **kwargs):
+        super().__init__(**kwargs)
+        self.archive = archive
+
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        if request.method == 'GET':
+            self.archive.record(response)
+        return response
+
+
+class ReplayAdapter(HTTPAdapter):
+    """
+    Adapter that answers requests from an archive instead of the network.
+
+    URLs missing from the archive get a 404. Conditional requests are
+    answered with 304 when their validators match the archived ones, so
+    change detection behaves as it did against the live site.
+    """
+
+    def __init__(self, archive: HttpArchive):
+        super().__init__()
+        self.archive = archive
+
+    def _not_modified(self, request, headers: CaseInsensitiveDict) -> bool:
+        etag = request.headers.get('If-None-Match')
+        if etag and etag == headers.get('ETag'):
+            return True
+        modified_since = request.headers.get('If-Modified-Since')
+        return bool(modified_since) and modified_since == headers.get('Last-Modified')
+
+    def send(self, request, **kwargs):
+        CONNECTION_STATS.record_request()
+        entry = self.archive.lookup(request.url)
+
+        response = requests.Response()
+        response.url = request.url
+        response.request = request
+        response.connection = self
+
+        if entry is None:
+            response.status_code = 404
+            response.reason = 'Not Found in archive'
+            response.headers = CaseInsensitiveDict()
+            body = b''
+        else:
+            response.headers = CaseInsensitiveDict(entry['headers'])
+            if entry['status_code'] == 200 and self._not_modified(request, response.headers):
+                response.status_code = 304
+                response.reason = 'Not Modified'
+                body = b''
+            else:
+                response.status_code = entry['status_code']
+                response.reason = entry['reason']
+                body = self.archive.body(entry)
+
+        response.raw = io.BytesIO(body)
+        response._content = body
+        response._content_consumed = True
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.elapsed = timedelta(0)
+        return response
+
+
+def recording_adapter_factory(archive: HttpArchive):
+    """Return an adapter factory for scrape_all_urls that records to `archive`."""
+    def factory(pool_size: int) -> HTTPAdapter:
+        return RecordingAdapter(archive, pool_connections=POOL_CONNECTIONS, pool_maxsize=pool_size)
+    return factory
+
+
+def replay_adapter_factory(archive: HttpArchive):
+    """Return an adapter factory for scrape_all_urls that replays from `archive`."""
+    def factory(pool_size: int) -> HTTPAdapter:
+        return ReplayAdapter(archive)
+    return factory
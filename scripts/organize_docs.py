@@ -2,18 +2,50 @@
 """
 Script to organize X-Plane SDK documentation into structured markdown files.
 This implements Task 6: Documentation Organization from the processing plan.
+
+Each category file is built from the processed pages of its category.
+Categories whose pages hash the same as at the last run are skipped (see
+build_pages_tree and change_detector.MerkleTree); --force rewrites all.
 """
 
+import argparse
 import json
 import os
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Any, Dict, List, Optional
 from datetime import datetime
 
-def load_processed_content(file_path: str) -> Dict[str, Any]:
-    """Load the processed content from JSON file."""
-    with open(file_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+from change_detector import (CONTENT_HASH_ALGORITHM, MerkleTree, build_merkle_tree, calculate_content_hash,
+                             load_merkle_snapshot, save_merkle_snapshot)
+from processed_corpus import ProcessedCorpus, page_source_key
+
+# Bump when the generated Markdown changes (create_module_markdown, format_api_signature),
+# so every category is rewritten once
+ORGANIZE_DOCS_VERSION = 1
+
+# Category to file mapping, relative to docs/
+CATEGORY_FILES = {
+    'XPLM_Camera': 'api/xplm-camera.md',
+    'XPLM_DataAccess': 'api/xplm-dataaccess.md',
+    'XPLM_Display': 'api/xplm-display.md',
+    'XPLM_Graphics': 'api/xplm-graphics.md',
+    'XPLM_Navigation': 'api/xplm-navigation.md',
+    'XPLM_Sound': 'api/xplm-sound.md',
+    'XPLM_Utilities': 'api/xplm-utilities.md',
+    'XPLM_Processing': 'api/xplm-processing.md',
+    'XPLM_Plugin': 'api/xplm-plugin.md',
+    'XPLM_Planes': 'api/xplm-planes.md',
+    'XPLM_Scenery': 'api/xplm-scenery.md',
+    'XPLM_Instance': 'api/xplm-instance.md',
+    'XPLM_Map': 'api/xplm-map.md',
+    'XPLM_Menus': 'api/xplm-menus.md',
+    'Widget_System': 'widgets/widget-system.md',
+    'Other_APIs': 'modules/other-apis.md'
+}
+
+def load_processed_content(corpus_path: Path) -> ProcessedCorpus:
+    """Open the processed content; page bodies are loaded only for the categories written."""
+    return ProcessedCorpus(corpus_path)
 
 def load_categorized_urls(file_path: str) -> Dict[str, Any]:
     """Load the categorized URLs from JSON file."""
@@ -72,6 +104,34 @@ def format_api_signature(api_sig: Dict[str, Any]) -> str:
     markdown += "---\n\n"
     return markdown
 
+def build_pages_tree(categories: Dict[str, List[str]], processed_content: ProcessedCorpus) -> MerkleTree:
+    """
+    Hash tree over what each category file is built from.
+    
+    A category's leaves are its categorized URLs and the processed pages
+    assigned to it. Each leaf hashes ORGANIZE_DOCS_VERSION with the page's
+    source key (payload, title and category), or with '' for a URL that
+    has not been processed. Changes to the processor's output, to the
+    category assignment or to this script's version all change the tree,
+    while only the manifest is read.
+    
+    Args:
+        categories: Category -> URL list
+        processed_content: The processed corpus
+        
+    Returns:
+        MerkleTree over the category files' inputs
+    """
+    def leaf(page: Optional[Dict[str, Any]]) -> str:
+        key = page_source_key(page) if page is not None else ''
+        return calculate_content_hash(json.dumps([ORGANIZE_DOCS_VERSION, key]), CONTENT_HASH_ALGORITHM)
+    
+    leaves = {}
+    for category, urls in categories.items():
+        pages = dict(processed_content.by_category(category))
+        leaves[category] = {url: leaf(pages.get(url)) for url in set(urls) | set(pages)}
+    return MerkleTree(leaves)
+
 def create_module_markdown(category: str, content_data: List[Dict[str, Any]], 
                           category_urls: List[str]) -> str:
     """Create markdown content for a module category."""
@@ -129,18 +189,23 @@ def create_module_markdown(category: str, content_data: List[Dict[str, Any]],
     
     return markdown
 
-def organize_documentation():
-    """Main function to organize documentation into structured markdown files."""
+def organize_documentation(force: bool = False):
+    """
+    Main function to organize documentation into structured markdown files.
+    
+    Args:
+        force: Rewrite every category, even if its content has not changed
+    """
     
     # Paths
     base_dir = Path(__file__).parent.parent
-    processed_content_path = base_dir / 'raw_data' / 'processed_content.json'
+    processed_corpus_path = base_dir / 'raw_data' / 'processed'
     categorized_urls_path = base_dir / 'raw_data' / 'categorized_urls.json'
     docs_dir = base_dir / 'docs'
     
     # Load data
     print("Loading processed content...")
-    processed_data = load_processed_content(processed_content_path)
+    processed_content = load_processed_content(processed_corpus_path)
     
     print("Loading categorized URLs...")
     categorized_data = load_categorized_urls(categorized_urls_path)
@@ -155,43 +220,32 @@ def organize_documentation():
     modules_dir.mkdir(parents=True, exist_ok=True)
     
     # Category to file mapping
-    category_files = {
-        'XPLM_Camera': api_dir / 'xplm-camera.md',
-        'XPLM_DataAccess': api_dir / 'xplm-dataaccess.md',
-        'XPLM_Display': api_dir / 'xplm-display.md',
-        'XPLM_Graphics': api_dir / 'xplm-graphics.md',
-        'XPLM_Navigation': api_dir / 'xplm-navigation.md',
-        'XPLM_Sound': api_dir / 'xplm-sound.md',
-        'XPLM_Utilities': api_dir / 'xplm-utilities.md',
-        'XPLM_Processing': api_dir / 'xplm-processing.md',
-        'XPLM_Plugin': api_dir / 'xplm-plugin.md',
-        'XPLM_Planes': api_dir / 'xplm-planes.md',
-        'XPLM_Scenery': api_dir / 'xplm-scenery.md',
-        'XPLM_Instance': api_dir / 'xplm-instance.md',
-        'XPLM_Map': api_dir / 'xplm-map.md',
-        'XPLM_Menus': api_dir / 'xplm-menus.md',
-        'Widget_System': widgets_dir / 'widget-system.md',
-        'Other_APIs': modules_dir / 'other-apis.md'
-    }
+    category_files = {category: docs_dir / path for category, path in CATEGORY_FILES.items()}
     
     # Process each category
     categories = categorized_data.get('categories', {})
-    processed_content = processed_data.get('processed_content', {})
+    
+    # Compare the processed pages with the ones the docs were last built from
+    pages_tree = build_pages_tree(categories, processed_content)
+    built_tree = None if force else load_merkle_snapshot('organize_docs_pages')
+    skipped = 0
     
     for category, urls in categories.items():
+        output_file = category_files.get(category)
+        if (built_tree and output_file and output_file.exists()
+                and not pages_tree.category_changed(built_tree, category)):
+            skipped += 1
+            continue
+        
         print(f"Processing category: {category}")
         
         # Find processed content for this category
-        category_content = []
-        for url, content in processed_content.items():
-            if content.get('category', {}).get('category') == category:
-                category_content.append(content)
+        category_content = [content for url, content in processed_content.by_category(category)]
         
         # Generate markdown
         markdown_content = create_module_markdown(category, category_content, urls)
         
         # Write to file
-        output_file = category_files.get(category)
         if output_file:
             print(f"Writing {output_file}")
             with open(output_file, 'w', encoding='utf-8') as f:
@@ -201,7 +255,12 @@ def organize_documentation():
     
     # Create index files
     create_index_files(docs_dir, categories)
+    save_merkle_snapshot('organize_docs_pages', pages_tree)
+    # The scraped content the docs now reflect, for change_detector --summary
+    save_merkle_snapshot('organize_docs', load_merkle_snapshot('process_content') or build_merkle_tree(categories))
     
+    if skipped:
+        print(f"Skipped {skipped} unchanged categories")
     print("Documentation organization complete!")
 
 def create_index_files(docs_dir: Path, categories: Dict[str, List[str]]):
@@ -243,4 +302,6 @@ def create_index_files(docs_dir: Path, categories: Dict[str, List[str]]):
         f.write(modules_index)
 
 if __name__ == '__main__':
-    organize_documentation()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='Organize processed X-Plane SDK documentation into markdown')
+    parser.add_argument('--force', action='store_true', help='Rewrite every category, even unchanged ones')
+    organize_documentation(force=parser.parse_args().force)
\ No newline at end of file
@@ -15,30 +15,43 @@ Purpose:
 - Process and categorize SDK URLs
 
 Usage:
-    python process_content.py [options]
+    python process_content.py                           # categorize the SDK map URLs
+    python process_content.py process [--workers N]     # process new and changed scraped pages
+    python process_content.py process --full-refresh    # reprocess every page
 
 Dependencies:
     - markdownify: For HTML to Markdown conversion
     - beautifulsoup4: For HTML processing and cleaning
 """
 
+import argparse
 import json
 import logging
+import os
 import re
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Set, Tuple, Optional, Any
+from typing import Dict, Iterable, Iterator, List, Set, Tuple, Optional, Any, Union
 from urllib.parse import urlparse
 
 try:
     from bs4 import BeautifulSoup, Comment
-    from markdownify import markdownify as md
+    from markdownify import MarkdownConverter
 except ImportError as e:
     logging.error(f"Missing required dependencies: {e}")
     logging.error("Please install: pip install beautifulsoup4 markdownify")
     raise
 
-from change_detector import get_changed_urls, load_existing_hashes
+from change_detector import (CONTENT_HASH_ALGORITHM, build_merkle_tree, calculate_content_hash, get_changed_urls,
+                             load_existing_hashes, save_merkle_snapshot)
+from corpus_io import (SCRAPED_CONTENT_JSONL, blob_store_for, iter_scraped_content, load_blob_fields,
+                       scraped_content_exists)
+from fts_index import refresh_fts_index
+from processed_corpus import PROCESSED_CORPUS_DIR, ProcessedCorpus, processed_corpus_exists, save_processed_corpus
+from symbol_matcher import SymbolMatcher
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -49,9 +62,98 @@ PROJECT_ROOT = Path(__file__).parent.parent
 SDK_MAP_FILE = PROJECT_ROOT.parent / "sdk_map_optimized.txt"
 RAW_DATA_DIR = PROJECT_ROOT / "raw_data"
 CATEGORIZED_URLS_FILE = RAW_DATA_DIR / "categorized_urls.json"
-SCRAPED_CONTENT_FILE = RAW_DATA_DIR / "scraped_content.json"
+SCRAPED_CONTENT_FILE = SCRAPED_CONTENT_JSONL
 PROCESSED_CONTENT_DIR = PROJECT_ROOT / "processed_content"
 
+# Bump when a change to the processing code changes its output; cached page
+# records from other versions are reprocessed (see processor_key)
+PROCESSOR_VERSION = '1.1.0'
+
+# markdownify options for convert_to_markdown
+MARKDOWN_OPTIONS = {
+    'heading_style': 'ATX',  # Use # for headings
+    'bullets': '-',  # Use - for bullet points
+    'code_language': 'cpp',  # Default language for code blocks
+    'wrap': True,
+    'wrap_width': 80,
+    'escape_asterisks': False,
+    'escape_underscores': False,
+}
+
+# Pages sent to a worker process at a time; large enough to amortize pickling
+PROCESS_CHUNK_SIZE = 16
+
+# Steps of process_page, in order, as reported in the stage timing breakdown
+PROCESSING_STAGES = ('clean', 'serialize', 'markdown', 'api_signatures', 'code_examples', 'categorize')
+
+# Module names cross-referenced in addition to the extracted API symbols
+XPLM_MODULES = [
+    'XPLMCamera', 'XPLMDataAccess', 'XPLMDisplay', 'XPLMGraphics',
+    'XPLMNavigation', 'XPLMSound', 'XPLMUtilities', 'XPLMInstance',
+    'XPLMMap', 'XPLMMenus', 'XPLMPlanes', 'XPLMPlugin',
+    'XPLMProcessing', 'XPLMScenery'
+]
+
+# URL categories in priority order: a page goes to the first category with a
+# pattern that matches its name (case-insensitive), else to DEFAULT_CATEGORY
+CATEGORY_PATTERNS = {
+    "XPLM_Camera": [
+        r"XPLMCamera", r"camera", r"view", r"perspective"
+    ],
+    "XPLM_DataAccess": [
+        r"XPLMDataAccess", r"XPLMData", r"dataref", r"GetData", r"SetData"
+    ],
+    "XPLM_Display": [
+        r"XPLMDisplay", r"window", r"screen", r"draw", r"render", r"texture",
+        r"XPLMGetScreen", r"XPLMGetWindow", r"XPLMSetWindow", r"XPLMCreateWindow"
+    ],
+    "XPLM_Graphics": [
+        r"XPLMGraphics", r"graphics", r"OpenGL", r"GL", r"vertex", r"shader"
+    ],
+    "XPLM_Navigation": [
+        r"XPLMNavigation", r"nav", r"GPS", r"FMS", r"waypoint", r"airport",
+        r"METAR", r"weather", r"magnetic"
+    ],
+    "XPLM_Sound": [
+        r"XPLMSound", r"audio", r"FMOD", r"sound", r"speaker"
+    ],
+    "XPLM_Utilities": [
+        r"XPLMUtilities", r"GetSystem", r"GetPrefs", r"GetLanguage", r"GetVersions",
+        r"GetMyID", r"keyboard", r"mouse", r"hotkey"
+    ],
+    "XPLM_Instance": [
+        r"XPLMInstance", r"instance", r"object", r"model"
+    ],
+    "XPLM_Map": [
+        r"XPLMMap", r"map", r"layer", r"projection"
+    ],
+    "XPLM_Menus": [
+        r"XPLMMenus", r"menu", r"item", r"check"
+    ],
+    "XPLM_Planes": [
+        r"XPLMPlanes", r"aircraft", r"plane", r"model"
+    ],
+    "XPLM_Plugin": [
+        r"XPLMPlugin", r"plugin", r"enable", r"disable", r"message"
+    ],
+    "XPLM_Processing": [
+        r"XPLMProcessing", r"flight", r"loop", r"callback", r"timer"
+    ],
+    "XPLM_Scenery": [
+        r"XPLMScenery", r"scenery", r"terrain", r"probe", r"object"
+    ],
+    "Widget_System": [
+        r"XP.*Widget", r"widget", r"button", r"text.*field", r"scroll.*bar",
+        r"progress", r"caption", r"window.*type"
+    ],
+    "Widget_Defs": [
+        r"Widget.*Properties", r"Widget.*Messages", r"Widget.*Types", r"Widget.*Values",
+        r"Button.*", r"Caption.*", r"Main.*Window", r"Sub.*Window", r"Text.*Field",
+        r"Scroll.*Bar", r"Progress.*Indicator"
+    ]
+}
+DEFAULT_CATEGORY = "Other_APIs"
+
 
 def read_sdk_map_file() -> List[str]:
     """
@@ -124,6 +226,78 @@ def validate_url_format(url: str) -> bool:
         return False
 
 
+def url_page_name(url: str) -> str:
+    """Return the function/page name a URL points at (its last non-empty path segment)."""
+    url_path = urlparse(url).path
+    return url_path.split('/')[-1] if url_path.split('/')[-1] else url_path.split('/')[-2]
+
+
+class UrlCategorizer:
+    """
+    Assign SDK URLs to module categories by their page name.
+    
+    All category patterns are compiled once into a single anchored regex
+    with one alternative per category, in priority order. Each alternative
+    is a lookahead that searches the whole name, so the first category with
+    any matching pattern wins, exactly as if the patterns were tried one by
+    one. Results are memoized per page name.
+    """
+    
+    def __init__(self, patterns: Optional[Dict[str, List[str]]] = None, default: str = DEFAULT_CATEGORY):
+        """
+        Args:
+            patterns: Category -> regex patterns, in priority order (defaults to CATEGORY_PATTERNS)
+            default: Category for names no pattern matches
+        """
+        self.patterns = CATEGORY_PATTERNS if patterns is None else patterns
+        self.default = default
+        self.categories = list(self.patterns) + ([default] if default not in self.patterns else [])
+        
+        # Category names are not always valid group names, so groups are numbered
+        self._group_categories = {}
+        alternatives = []
+        for index, (category, category_patterns) in enumerate(self.patterns.items()):
+            if not category_patterns:
+                continue
+            group = f"c{index}"
+            self._group_categories[group] = category
+            alternatives.append(f"(?=[\\s\\S]*?(?:{'|'.join(f'(?:{p})' for p in category_patterns)}))(?P<{group}>)")
+        self._pattern = re.compile('|'.join(alternatives) or '(?!)', re.IGNORECASE)
+        self._cache: Dict[str, str] = {}
+    
+    def category_for_name(self, page_name: str) -> str:
+        """Return the category of a page name."""
+        category = self._cache.get(page_name)
+        if category is None:
+            match = self._pattern.match(page_name)
+            category = self._group_categories[match.lastgroup] if match else self.default
+            self._cache[page_name] = category
+        return category
+    
+    def category_for(self, url: str) -> str:
+        """Return the category of a URL."""
+        return self.category_for_name(url_page_name(url))
+    
+    def categorize(self, urls: Iterable[str]) -> Dict[str, List[str]]:
+        """
+        Categorize many URLs at once.
+        
+        Args:
+            urls: URLs to categorize
+            
+        Returns:
+            Dict mapping every category (empty ones included) to its URLs, in input order
+        """
+        categories = {category: [] for category in self.categories}
+        for url in urls:
+            categories[self.category_for(url)].append(url)
+        return categories
+
+
+# Shared categorizer, so its memo is reused across pages
+URL_CATEGORIZER = UrlCategorizer()
+
+
 def categorize_urls_by_module(urls: List[str]) -> Dict[str, List[str]]:
     """
     Categorize URLs by SDK module based on URL patterns and function names.
@@ -134,104 +308,7 @@ def categorize_urls_by_module(urls: List[str]) -> Dict[str, List[str]]:
     Returns:
         Dict[str, List[str]]: Dictionary mapping category names to URL lists
     """
-    categories = {
-        "XPLM_Camera": [],
-        "XPLM_DataAccess": [],
-        "XPLM_Display": [],
-        "XPLM_Graphics": [],
-        "XPLM_Navigation": [],
-        "XPLM_Sound": [],
-        "XPLM_Utilities": [],
-        "XPLM_Instance": [],
-        "XPLM_Map": [],
-        "XPLM_Menus": [],
-        "XPLM_Planes": [],
-        "XPLM_Plugin": [],
-        "XPLM_Processing": [],
-        "XPLM_Scenery": [],
-        "Widget_System": [],
-        "Widget_Defs": [],
-        "Other_APIs": []
-    }
-    
-    # Define patterns for categorization
-    patterns = {
-        "XPLM_Camera": [
-            r"XPLMCamera", r"camera", r"view", r"perspective"
-        ],
-        "XPLM_DataAccess": [
-            r"XPLMDataAccess", r"XPLMData", r"dataref", r"GetData", r"SetData"
-        ],
-        "XPLM_Display": [
-            r"XPLMDisplay", r"window", r"screen", r"draw", r"render", r"texture",
-            r"XPLMGetScreen", r"XPLMGetWindow", r"XPLMSetWindow", r"XPLMCreateWindow"
-        ],
-        "XPLM_Graphics": [
-            r"XPLMGraphics", r"graphics", r"OpenGL", r"GL", r"vertex", r"shader"
-        ],
-        "XPLM_Navigation": [
-            r"XPLMNavigation", r"nav", r"GPS", r"FMS", r"waypoint", r"airport",
-            r"METAR", r"weather", r"magnetic"
-        ],
-        "XPLM_Sound": [
-            r"XPLMSound", r"audio", r"FMOD", r"sound", r"speaker"
-        ],
-        "XPLM_Utilities": [
-            r"XPLMUtilities", r"GetSystem", r"GetPrefs", r"GetLanguage", r"GetVersions",
-            r"GetMyID", r"keyboard", r"mouse", r"hotkey"
-        ],
-        "XPLM_Instance": [
-            r"XPLMInstance", r"instance", r"object", r"model"
-        ],
-        "XPLM_Map": [
-            r"XPLMMap", r"map", r"layer", r"projection"
-        ],
-        "XPLM_Menus": [
-            r"XPLMMenus", r"menu", r"item", r"check"
-        ],
-        "XPLM_Planes": [
-            r"XPLMPlanes", r"aircraft", r"plane", r"model"
-        ],
-        "XPLM_Plugin": [
-            r"XPLMPlugin", r"plugin", r"enable", r"disable", r"message"
-        ],
-        "XPLM_Processing": [
-            r"XPLMProcessing", r"flight", r"loop", r"callback", r"timer"
-        ],
-        "XPLM_Scenery": [
-            r"XPLMScenery", r"scenery", r"terrain", r"probe", r"object"
-        ],
-        "Widget_System": [
-            r"XP.*Widget", r"widget", r"button", r"text.*field", r"scroll.*bar",
-            r"progress", r"caption", r"window.*type"
-        ],
-        "Widget_Defs": [
-            r"Widget.*Properties", r"Widget.*Messages", r"Widget.*Types", r"Widget.*Values",
-            r"Button.*", r"Caption.*", r"Main.*Window", r"Sub.*Window", r"Text.*Field",
-            r"Scroll.*Bar", r"Progress.*Indicator"
-        ]
-    }
-    
-    for url in urls:
-        # Extract the function/page name from URL
-        url_path = urlparse(url).path
-        page_name = url_path.split('/')[-1] if url_path.split('/')[-1] else url_path.split('/')[-2]
-        
-        categorized = False
-        
-        # Try to match against patterns
-        for category, category_patterns in patterns.items():
-            for pattern in category_patterns:
-                if re.search(pattern, page_name, re.IGNORECASE):
-                    categories[category].append(url)
-                    categorized = True
-                    break
-            if categorized:
-                break
-                
-        # If no pattern matched, put in Other_APIs
-        if not categorized:
-            categories["Other_APIs"].append(url)
+    categories = URL_CATEGORIZER.categorize(urls)
     
     # Log categorization results
     for category, category_urls in categories.items():
@@ -283,24 +360,28 @@ def filter_valid_urls(urls: List[str]) -> List[str]:
     return valid_urls
 
 
-def export_categorized_urls(categorized_urls: Dict[str, List[str]], total_urls: int) -> None:
+def export_categorized_urls(categorized_urls: Dict[str, List[str]], total_urls: int,
+                            output_file: Optional[Path] = None, timestamp: Optional[str] = None) -> None:
     """
     Export categorized URL list as JSON with metadata.
     
     Args:
         categorized_urls: Dictionary of categorized URLs
         total_urls: Total number of URLs processed
+        output_file: Where to write the JSON (defaults to CATEGORIZED_URLS_FILE)
+        timestamp: Export time to record (defaults to now)
     """
+    output_file = output_file or CATEGORIZED_URLS_FILE
     try:
-        # Ensure raw_data directory exists
-        RAW_DATA_DIR.mkdir(parents=True, exist_ok=True)
+        # Ensure the output directory exists
+        output_file.parent.mkdir(parents=True, exist_ok=True)
         
         # Create export data structure
         export_data = {
             "metadata": {
                 "total_urls": total_urls,
                 "categories_count": len([cat for cat, urls in categorized_urls.items() if urls]),
-                "timestamp": datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+                "timestamp": timestamp or datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
                 "source_file": str(SDK_MAP_FILE.name),
                 "processing_version": "1.0.0"
             },
@@ -311,10 +392,10 @@ def export_categorized_urls(categorized_urls: Dict[str, List[str]], total_urls:
         }
         
         # Save to JSON file
-        with open(CATEGORIZED_URLS_FILE, 'w', encoding='utf-8') as f:
+        with open(output_file, 'w', encoding='utf-8') as f:
             json.dump(export_data, f, indent=2, sort_keys=True)
             
-        logger.info(f"Exported categorized URLs to {CATEGORIZED_URLS_FILE}")
+        logger.info(f"Exported categorized URLs to {output_file}")
         logger.info(f"Total categories with URLs: {len(export_data['summary'])}")
         
     except Exception as e:
@@ -396,6 +477,69 @@ def main():
         raise
 
 
+def clean_html_tree(html: str) -> BeautifulSoup:
+    """
+    Parse HTML once and reduce it to its cleaned main content.
+    
+    The main content element is moved into a document of its own, so the
+    result has the same shape as parsing clean_html_content's output and
+    can be handed to every extractor without serializing it.
+    
+    Args:
+        html: Raw HTML content to clean
+        
+    Returns:
+        BeautifulSoup: Document holding only the cleaned content
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+        
+    # Remove unwanted elements
+    unwanted_selectors = [
+        'script', 'style', 'nav', 'header', 'footer',
+        '.site-header', '.site-footer', '.site-colophon',
+        '.banner', '.widget-area', '.sidebar-1',
+        '.cs-loader', '.search-nav', '.menu-main-menu-container',
+        '.social-icons', '.email-container', '.gdpr',
+        '.subscribe-form', '.footer-nav', '#secondary',
+        '#primary', '.right-nav', '.api-breadcrumbs'
+    ]
+    
+    for selector in unwanted_selectors:
+        for element in soup.select(selector):
+            element.decompose()
+    
+    # Remove comments
+    for comment in soup.find_all(string=lambda text: isinstance(text, Comment)):
+        comment.extract()
+    
+    # Remove empty elements
+    for element in soup.find_all():
+        if not element.get_text(strip=True) and not element.find_all(['img', 'br', 'hr']):
+            element.decompose()
+    
+    # Find the main content area
+    main_content = soup.find('article', class_='page')
+    
+    # Fallback to finding content by common patterns
+    if not main_content:
+        content_selectors = ['.std_docs', '.api', '.main-section']
+        for selector in content_selectors:
+            main_content = soup.select_one(selector)
+            if main_content:
+                break
+    
+    # If no specific content area found, use the cleaned body
+    if not main_content:
+        main_content = soup.find('body')
+    
+    if not main_content:
+        return soup
+    
+    document = BeautifulSoup('', 'html.parser')
+    document.append(main_content.extract())
+    return document
+
+
 def clean_html_content(html: str) -> str:
     """
     Remove navigation, ads, and irrelevant content from HTML.
@@ -408,81 +552,31 @@ def clean_html_content(html: str) -> str:
         str: Cleaned HTML content
     """
     try:
-        soup = BeautifulSoup(html, 'html.parser')
-        
-        # Remove unwanted elements
-        unwanted_selectors = [
-            'script', 'style', 'nav', 'header', 'footer',
-            '.site-header', '.site-footer', '.site-colophon',
-            '.banner', '.widget-area', '.sidebar-1',
-            '.cs-loader', '.search-nav', '.menu-main-menu-container',
-            '.social-icons', '.email-container', '.gdpr',
-            '.subscribe-form', '.footer-nav', '#secondary',
-            '#primary', '.right-nav', '.api-breadcrumbs'
-        ]
-        
-        for selector in unwanted_selectors:
-            for element in soup.select(selector):
-                element.decompose()
-        
-        # Remove comments
-        for comment in soup.find_all(string=lambda text: isinstance(text, Comment)):
-            comment.extract()
-        
-        # Remove empty elements
-        for element in soup.find_all():
-            if not element.get_text(strip=True) and not element.find_all(['img', 'br', 'hr']):
-                element.decompose()
-        
-        # Find the main content area
-        main_content = soup.find('article', class_='page')
-        if main_content:
-            return str(main_content)
-        
-        # Fallback to finding content by common patterns
-        content_selectors = ['.std_docs', '.api', '.main-section']
-        for selector in content_selectors:
-            content = soup.select_one(selector)
-            if content:
-                return str(content)
-        
-        # If no specific content area found, return cleaned body
-        body = soup.find('body')
-        if body:
-            return str(body)
-        
-        return str(soup)
+        return str(clean_html_tree(html))
         
     except Exception as e:
         logger.error(f"Error cleaning HTML content: {e}")
         return html
 
 
-def convert_to_markdown(html: str) -> str:
+def convert_to_markdown(html: Union[str, BeautifulSoup]) -> str:
     """
     Convert cleaned HTML to well-formatted Markdown.
     Use markdownify library with custom rules for code blocks.
     
     Args:
-        html: Cleaned HTML content to convert
+        html: Cleaned HTML content to convert, or its parsed tree (see clean_html_tree)
         
     Returns:
         str: Markdown formatted content
     """
     try:
-        # Custom conversion options
-        markdown_options = {
-            'heading_style': 'ATX',  # Use # for headings
-            'bullets': '-',  # Use - for bullet points
-            'code_language': 'cpp',  # Default language for code blocks
-            'wrap': True,
-            'wrap_width': 80,
-            'escape_asterisks': False,
-            'escape_underscores': False,
-        }
-        
-        # Convert HTML to Markdown
-        markdown_content = md(html, **markdown_options)
+        # Convert HTML to Markdown, reusing the tree when one is given
+        converter = MarkdownConverter(**MARKDOWN_OPTIONS)
+        if isinstance(html, str):
+            markdown_content = converter.convert(html)
+        else:
+            markdown_content = converter.convert_soup(html)
         
         # Post-process the markdown
         markdown_content = _post_process_markdown(markdown_content)
@@ -523,13 +617,13 @@ def _post_process_markdown(markdown: str) -> str:
     return markdown.strip()
 
 
-def extract_api_signatures(content: str) -> List[Dict[str, Any]]:
+def extract_api_signatures(content: Union[str, BeautifulSoup]) -> List[Dict[str, Any]]:
     """
     Parse function signatures and parameters from content.
     Identify C/C++ function declarations and definitions.
     
     Args:
-        content: Content to parse for API signatures
+        content: Content to parse for API signatures, or its parsed tree
         
     Returns:
         List[Dict]: List of API function information
@@ -538,7 +632,7 @@ def extract_api_signatures(content: str) -> List[Dict[str, Any]]:
         signatures = []
         
         # Parse HTML content for structured API information
-        soup = BeautifulSoup(content, 'html.parser')
+        soup = BeautifulSoup(content, 'html.parser') if isinstance(content, str) else content
         
         # Find function definitions using multiple patterns
         functions = soup.find_all(['div', 'section'], class_='function')
@@ -722,19 +816,19 @@ def _parse_function_parameters(signature: str) -> List[Dict[str, str]]:
         return []
 
 
-def extract_code_examples(content: str) -> List[Dict[str, Any]]:
+def extract_code_examples(content: Union[str, BeautifulSoup]) -> List[Dict[str, Any]]:
     """
     Extract code examples from content for Context7 usefulness.
     
     Args:
-        content: Content to parse for code examples
+        content: Content to parse for code examples, or its parsed tree
         
     Returns:
         List[Dict]: List of code examples with metadata
     """
     try:
         examples = []
-        soup = BeautifulSoup(content, 'html.parser')
+        soup = BeautifulSoup(content, 'html.parser') if isinstance(content, str) else content
         
         # Find all code blocks
         code_blocks = soup.find_all('pre')
@@ -812,22 +906,11 @@ def categorize_content(url: str, content: str) -> Dict[str, str]:
     """
     try:
         # Use existing categorization logic
-        categorized_urls = categorize_urls_by_module([url])
-        
-        # Find which category this URL belongs to
-        for category, urls in categorized_urls.items():
-            if url in urls:
-                return {
-                    'category': category,
-                    'url': url,
-                    'module': category.replace('_', ' ').title()
-                }
-        
-        # Default category if not found
+        category = URL_CATEGORIZER.category_for(url)
         return {
-            'category': 'Other_APIs',
+            'category': category,
             'url': url,
-            'module': 'Other APIs'
+            'module': category.replace('_', ' ').title()
         }
         
     except Exception as e:
@@ -839,6 +922,88 @@ def categorize_content(url: str, content: str) -> Dict[str, str]:
         }
 
 
+def api_symbol_names(content_dict: Dict[str, Any]) -> Set[str]:
+    """Return the names of all API signatures across the processed pages."""
+    all_functions = set()
+    for url, content_info in content_dict.items():
+        # own_functions holds the same names and is available without loading the page payload
+        if 'own_functions' in content_info:
+            all_functions.update(content_info['own_functions'])
+        elif 'api_signatures' in content_info:
+            for sig in content_info['api_signatures']:
+                if 'name' in sig:
+                    all_functions.add(sig['name'])
+    return all_functions
+
+
+def find_cross_references(content_dict: Dict[str, Any],
+                          urls: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, List[int]]]:
+    """
+    Locate references to known functions and modules in each page.
+    
+    All function names from every page's api_signatures, plus the XPLM
+    modules, are compiled into one SymbolMatcher, and each page's Markdown
+    is scanned once. Matches are whole words. A page does not reference
+    its own functions, or the module its URL is named after.
+    
+    Args:
+        content_dict: Dictionary of processed content
+        urls: Only scan these pages (default: all); symbols still come from every page
+        
+    Returns:
+        Dict: URL -> {referenced name: character offsets in the page's Markdown}
+    """
+    all_functions = api_symbol_names(content_dict)
+    matcher = SymbolMatcher(all_functions | set(XPLM_MODULES))
+    modules = set(XPLM_MODULES)
+    
+    positions = {}
+    for url in (content_dict if urls is None else urls):
+        content_info = content_dict[url]
+        own_functions = set(content_info.get('own_functions', []))
+        found = matcher.find_positions(content_info.get('markdown', ''))
+        positions[url] = {
+            name: offsets for name, offsets in found.items()
+            if (name in all_functions and name not in own_functions) or (name in modules and name not in url)
+        }
+    
+    return positions
+
+
+def cross_reference_targets(content_dict: Dict[str, Any], previous_content: Dict[str, Any],
+                            reprocessed: Set[str]) -> Set[str]:
+    """
+    Find the pages whose cached cross-references may be out of date.
+    
+    Besides the reprocessed pages, these are the pages mentioning a symbol
+    that no page defined before, and the pages referencing a symbol that
+    no page defines any more.
+    
+    Args:
+        content_dict: Processed content of this run
+        previous_content: Processed content of the previous run
+        reprocessed: URLs processed again in this run
+        
+    Returns:
+        Set[str]: URLs whose cross-references have to be recomputed
+    """
+    symbols = api_symbol_names(content_dict)
+    previous_symbols = api_symbol_names(previous_content)
+    added = symbols - previous_symbols
+    removed = previous_symbols - symbols
+    
+    targets = set(reprocessed)
+    targets.update(url for url, info in content_dict.items() if 'cross_references' not in info)
+    if added:
+        matcher = SymbolMatcher(added)
+        targets.update(url for url, info in content_dict.items()
+                       if url not in targets and next(matcher.find_all(info.get('markdown', '')), None))
+    if removed:
+        targets.update(url for url, info in content_dict.items()
+                       if removed.intersection(info.get('cross_references', [])))
+    return targets
+
+
 def generate_cross_references(content_dict: Dict[str, Any]) -> Dict[str, List[str]]:
     """
     Create links between related functions and modules.
@@ -848,130 +1013,315 @@ def generate_cross_references(content_dict: Dict[str, Any]) -> Dict[str, List[st
         content_dict: Dictionary of processed content
         
     Returns:
-        Dict: Cross-reference mapping
+        Dict: Cross-reference mapping (URL -> sorted referenced names)
     """
     try:
-        cross_refs = {}
-        
-        # Extract all function names from all content
-        all_functions = set()
-        for url, content_info in content_dict.items():
-            if 'api_signatures' in content_info:
-                for sig in content_info['api_signatures']:
-                    if 'name' in sig:
-                        all_functions.add(sig['name'])
-        
-        # Find cross-references in each piece of content
-        for url, content_info in content_dict.items():
-            refs = []
-            content_text = content_info.get('markdown', '')
-            
-            # Look for function references in the content
-            for func_name in all_functions:
-                if func_name in content_text and func_name not in content_info.get('own_functions', []):
-                    refs.append(func_name)
-            
-            # Look for XPLM module references
-            xplm_modules = [
-                'XPLMCamera', 'XPLMDataAccess', 'XPLMDisplay', 'XPLMGraphics',
-                'XPLMNavigation', 'XPLMSound', 'XPLMUtilities', 'XPLMInstance',
-                'XPLMMap', 'XPLMMenus', 'XPLMPlanes', 'XPLMPlugin',
-                'XPLMProcessing', 'XPLMScenery'
-            ]
-            
-            for module in xplm_modules:
-                if module in content_text and module not in url:
-                    refs.append(module)
-            
-            cross_refs[url] = list(set(refs))
-        
-        return cross_refs
+        return {url: sorted(refs) for url, refs in find_cross_references(content_dict).items()}
         
     except Exception as e:
         logger.error(f"Error generating cross-references: {e}")
         return {}
 
 
-def process_scraped_content() -> Dict[str, Any]:
+def _timed(timings: Optional[Dict[str, float]], stage: str, func, *args):
+    """Call func(*args), adding its wall time to timings[stage] when timings is given."""
+    start = time.perf_counter()
+    result = func(*args)
+    if timings is not None:
+        timings[stage] = timings.get(stage, 0.0) + time.perf_counter() - start
+    return result
+
+
+def process_page(url: str, page_data: Dict[str, Any],
+                 timings: Optional[Dict[str, float]] = None) -> Optional[Dict[str, Any]]:
+    """
+    Clean, convert and analyze one scraped page.
+    
+    The page is parsed once; the cleaned tree is handed to the Markdown
+    converter and every extractor, and serialized only for storage.
+    
+    Args:
+        url: URL of the page
+        page_data: Scraped record with its content loaded
+        timings: Accumulates seconds per PROCESSING_STAGES entry (optional)
+        
+    Returns:
+        Dict: Processed page record, or None if the page has no content
+    """
+    logger.info(f"Processing: {url}")
+    
+    # Extract content from page data
+    raw_html = page_data.get('content', '')
+    if not raw_html:
+        logger.warning(f"No content found for {url}")
+        return None
+    
+    # Process the content
+    try:
+        tree = _timed(timings, 'clean', clean_html_tree, raw_html)
+        cleaned_html = _timed(timings, 'serialize', str, tree)
+    except Exception as e:
+        logger.error(f"Error cleaning HTML content: {e}")
+        tree = BeautifulSoup(raw_html, 'html.parser')
+        cleaned_html = raw_html
+    
+    markdown_content = _timed(timings, 'markdown', convert_to_markdown, tree)
+    api_signatures = _timed(timings, 'api_signatures', extract_api_signatures, tree)
+    code_examples = _timed(timings, 'code_examples', extract_code_examples, tree)
+    category_info = _timed(timings, 'categorize', categorize_content, url, cleaned_html)
+    
+    return {
+        'url': url,
+        'title': page_data.get('metadata', {}).get('title', ''),
+        'cleaned_html': cleaned_html,
+        'markdown': markdown_content,
+        'api_signatures': api_signatures,
+        'code_examples': code_examples,
+        'category': category_info,
+        'own_functions': [sig['name'] for sig in api_signatures if 'name' in sig],
+        'processing_timestamp': datetime.now(timezone.utc).isoformat()
+    }
+
+
+def _process_chunk(pages: List[Tuple[str, Dict[str, Any]]]) -> Tuple[List[Tuple[str, Optional[Dict[str, Any]], Optional[str]]], Dict[str, float]]:
+    """
+    Process a chunk of pages in a worker process.
+    
+    Returns:
+        (url, processed record or None, error message or None) in input
+        order, and the chunk's seconds per processing stage
+    """
+    results = []
+    timings: Dict[str, float] = {}
+    for url, page_data in pages:
+        try:
+            results.append((url, process_page(url, page_data, timings), None))
+        except Exception as e:
+            results.append((url, None, str(e)))
+    return results, timings
+
+
+def _merge_chunk(chunk_result, timings: Optional[Dict[str, float]]) -> List[Tuple[str, Optional[Dict[str, Any]], Optional[str]]]:
+    """Add a chunk's stage timings to `timings` and return its page results."""
+    results, chunk_timings = chunk_result
+    if timings is not None:
+        for stage, seconds in chunk_timings.items():
+            timings[stage] = timings.get(stage, 0.0) + seconds
+    return results
+
+
+def _chunks(pages: Iterable[Tuple[str, Dict[str, Any]]], size: int) -> Iterator[List[Tuple[str, Dict[str, Any]]]]:
+    """Group (url, record) pairs into lists of at most `size`."""
+    chunk = []
+    for page in pages:
+        chunk.append(page)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def iter_processed_pages(pages: Iterable[Tuple[str, Dict[str, Any]]], workers: int = 1,
+                         chunk_size: int = PROCESS_CHUNK_SIZE,
+                         timings: Optional[Dict[str, float]] = None) -> Iterator[Tuple[str, Optional[Dict[str, Any]], Optional[str]]]:
+    """
+    Process pages, in parallel when workers > 1, yielding results in input order.
+    
+    Pages are dispatched to a process pool in chunks. At most two chunks
+    per worker are in flight, so pages are still read from disk lazily
+    and memory stays bounded however large the corpus is.
+    
+    Args:
+        pages: (url, scraped record) pairs, e.g. from iter_scraped_content
+        workers: Worker processes (1 processes in this process)
+        chunk_size: Pages per dispatched chunk
+        timings: Accumulates seconds per processing stage, summed over workers (optional)
+        
+    Yields:
+        (url, processed record or None, error message or None) per page
+    """
+    if workers <= 1:
+        for chunk in _chunks(pages, chunk_size):
+            yield from _merge_chunk(_process_chunk(chunk), timings)
+        return
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        in_flight = deque()
+        for chunk in _chunks(pages, chunk_size):
+            in_flight.append(executor.submit(_process_chunk, chunk))
+            if len(in_flight) >= workers * 2:
+                yield from _merge_chunk(in_flight.popleft().result(), timings)
+        while in_flight:
+            yield from _merge_chunk(in_flight.popleft().result(), timings)
+
+
+def log_stage_timings(timings: Dict[str, float], pages: int) -> None:
+    """
+    Log the time spent in each processing stage.
+    
+    Args:
+        timings: Seconds per stage (see iter_processed_pages)
+        pages: Number of pages the timings cover
+    """
+    total = sum(timings.values())
+    if not total or not pages:
+        return
+    logger.info(f"Stage timings ({total:.2f}s of processing time over {pages} pages):")
+    for stage in PROCESSING_STAGES:
+        seconds = timings.get(stage, 0.0)
+        logger.info(f"  {stage:<15} {seconds:8.2f}s {seconds / pages * 1000:8.2f} ms/page "
+                    f"{seconds / total:6.1%}")
+
+
+def processor_key() -> str:
+    """
+    Identify the processing code and options a page record is built with.
+    
+    Returns:
+        str: Hash of PROCESSOR_VERSION and the options that shape page records
+    """
+    options = {
+        'version': PROCESSOR_VERSION,
+        'markdown': MARKDOWN_OPTIONS,
+        'categories': CATEGORY_PATTERNS,
+        'modules': XPLM_MODULES,
+    }
+    return calculate_content_hash(json.dumps(options, sort_keys=True), CONTENT_HASH_ALGORITHM)
+
+
+def scraped_content_hash(record: Dict[str, Any]) -> Optional[str]:
+    """Return the content hash of a scraped record, hashing inline content from the legacy format."""
+    if record.get('content_hash'):
+        return record['content_hash']
+    content = record.get('content')
+    return calculate_content_hash(content, CONTENT_HASH_ALGORITHM) if content else None
+
+
+def load_processed_content(root: Optional[Path] = None) -> Dict[str, Any]:
+    """
+    Load the page records of the previous processing run.
+    
+    Records come from the processed corpus manifest; their payloads are
+    only read if a payload field is accessed (see processed_corpus).
+    
+    Args:
+        root: Processed corpus directory to read (defaults to PROCESSED_CORPUS_DIR)
+        
+    Returns:
+        Dict: URL -> processed page record, empty if there is no readable previous run
+    """
+    root = root or PROCESSED_CORPUS_DIR
+    if not processed_corpus_exists(root):
+        return {}
+    try:
+        return ProcessedCorpus(root).pages
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable processed content in {root}: {e}")
+        return {}
+
+
+def process_scraped_content(workers: int = 1, incremental: bool = True) -> Dict[str, Any]:
     """
     Process raw scraped content and convert to structured format.
     
+    Scraped records are streamed from disk and processed one page at a
+    time, or in a pool of worker processes when workers > 1. Results are
+    merged in corpus order either way.
+    
+    When incremental, each page record of the previous run is reused if it
+    was built from the same content hash with the same processor_key(), so
+    only new and changed pages are loaded and processed, and
+    cross-references are recomputed only for the pages they can differ on
+    (see cross_reference_targets).
+    
+    Args:
+        workers: Worker processes for page processing
+        incremental: Reuse up-to-date page records from the previous run
+        
     Returns:
         Dict: Processed content data
     """
     try:
         # Load scraped content
-        if not SCRAPED_CONTENT_FILE.exists():
+        if not scraped_content_exists(SCRAPED_CONTENT_FILE):
             raise FileNotFoundError(f"Scraped content file not found: {SCRAPED_CONTENT_FILE}")
         
-        with open(SCRAPED_CONTENT_FILE, 'r', encoding='utf-8') as f:
-            scraped_data = json.load(f)
-        
+        key = processor_key()
+        previous_content = load_processed_content() if incremental else {}
         processed_content = {}
         processing_stats = {
             'total_pages': 0,
             'successful_processing': 0,
             'failed_processing': 0,
+            'cached_pages': 0,
             'categories': {}
         }
         
-        scraped_content = scraped_data.get('scraped_content', {})
-        processing_stats['total_pages'] = len(scraped_content)
-        
-        logger.info(f"Processing {len(scraped_content)} scraped pages...")
-        
-        for url, page_data in scraped_content.items():
-            try:
-                logger.info(f"Processing: {url}")
-                
-                # Extract content from page data
-                raw_html = page_data.get('content', '')
-                if not raw_html:
-                    logger.warning(f"No content found for {url}")
-                    continue
-                
-                # Process the content
-                cleaned_html = clean_html_content(raw_html)
-                markdown_content = convert_to_markdown(cleaned_html)
-                api_signatures = extract_api_signatures(cleaned_html)
-                code_examples = extract_code_examples(cleaned_html)
-                category_info = categorize_content(url, cleaned_html)
-                
-                # Store processed content
-                processed_content[url] = {
-                    'url': url,
-                    'title': page_data.get('metadata', {}).get('title', ''),
-                    'cleaned_html': cleaned_html,
-                    'markdown': markdown_content,
-                    'api_signatures': api_signatures,
-                    'code_examples': code_examples,
-                    'category': category_info,
-                    'own_functions': [sig['name'] for sig in api_signatures if 'name' in sig],
-                    'processing_timestamp': datetime.now(timezone.utc).isoformat()
-                }
-                
-                # Update stats
-                processing_stats['successful_processing'] += 1
-                category = category_info['category']
-                processing_stats['categories'][category] = processing_stats['categories'].get(category, 0) + 1
-                
-            except Exception as e:
-                logger.error(f"Error processing {url}: {e}")
+        # Reuse up-to-date records; page bodies are only loaded for the rest
+        corpus_order = []
+        pending = []
+        for url, record in iter_scraped_content(SCRAPED_CONTENT_FILE, fields=()):
+            corpus_order.append(url)
+            content_hash = scraped_content_hash(record)
+            cached = previous_content.get(url)
+            if (cached and content_hash and cached.get('content_hash') == content_hash
+                    and cached.get('processor_key') == key):
+                processed_content[url] = cached
+            else:
+                pending.append((url, record, content_hash))
+        processing_stats['total_pages'] = len(corpus_order)
+        processing_stats['cached_pages'] = len(processed_content)
+        
+        logger.info(f"Processing {len(pending)} of {len(corpus_order)} scraped pages from "
+                    f"{SCRAPED_CONTENT_FILE.name} with {workers} worker(s) "
+                    f"({len(processed_content)} unchanged pages reused)...")
+        
+        blob_store = blob_store_for(SCRAPED_CONTENT_FILE)
+        pages = ((url, load_blob_fields(record, blob_store)) for url, record, _ in pending)
+        content_hashes = {url: content_hash for url, _, content_hash in pending}
+        reprocessed = set()
+        stage_timings: Dict[str, float] = {}
+        for url, page_record, error in iter_processed_pages(pages, workers, timings=stage_timings):
+            if error is not None:
+                logger.error(f"Error processing {url}: {error}")
                 processing_stats['failed_processing'] += 1
-        
-        # Generate cross-references
-        logger.info("Generating cross-references...")
-        cross_references = generate_cross_references(processed_content)
+                continue
+            if page_record is None:
+                continue
+            
+            # Store processed content with what it was built from
+            page_record['content_hash'] = content_hashes[url]
+            page_record['processor_key'] = key
+            processed_content[url] = page_record
+            reprocessed.add(url)
+        
+        processed_content = {url: processed_content[url] for url in corpus_order if url in processed_content}
+        
+        # Update stats
+        processing_stats['successful_processing'] = len(processed_content)
+        for page_record in processed_content.values():
+            category = page_record['category']['category']
+            processing_stats['categories'][category] = processing_stats['categories'].get(category, 0) + 1
+        
+        # Generate cross-references for the pages they may have changed on
+        if previous_content:
+            targets = cross_reference_targets(processed_content, previous_content, reprocessed)
+        else:
+            targets = set(processed_content)
+        logger.info(f"Generating cross-references for {len(targets)} pages...")
+        references = find_cross_references(processed_content, [url for url in processed_content if url in targets])
         
         # Add cross-references to processed content
-        for url in processed_content:
-            processed_content[url]['cross_references'] = cross_references.get(url, [])
+        for url, refs in references.items():
+            processed_content[url]['cross_references'] = sorted(refs)
+        cross_references = {url: page_record['cross_references'] for url, page_record in processed_content.items()}
         
         # Create final output structure
         output_data = {
             'metadata': {
                 'processing_timestamp': datetime.now(timezone.utc).isoformat(),
-                'processor_version': '1.0.0',
+                'processor_version': PROCESSOR_VERSION,
                 'source_file': str(SCRAPED_CONTENT_FILE.name),
                 'statistics': processing_stats
             },
@@ -980,9 +1330,11 @@ def process_scraped_content() -> Dict[str, Any]:
         }
         
         logger.info("Content processing completed successfully!")
-        logger.info(f"Processed: {processing_stats['successful_processing']} pages")
+        logger.info(f"Processed: {processing_stats['successful_processing']} pages "
+                    f"({len(reprocessed)} reprocessed, {processing_stats['cached_pages']} reused)")
         logger.info(f"Failed: {processing_stats['failed_processing']} pages")
         logger.info(f"Categories: {len(processing_stats['categories'])}")
+        log_stage_timings(stage_timings, len(reprocessed))
         
         return output_data
         
@@ -993,19 +1345,16 @@ def process_scraped_content() -> Dict[str, Any]:
 
 def save_processed_content(processed_data: Dict[str, Any]) -> None:
     """
-    Save processed content to JSON file.
+    Save processed content as a manifest plus per-page payloads.
+    
+    Pages reused from the previous run keep their payload files; only
+    new and changed pages are written (see processed_corpus).
     
     Args:
         processed_data: Processed content data to save
     """
     try:
-        # Ensure output directory exists
-        RAW_DATA_DIR.mkdir(parents=True, exist_ok=True)
-        
-        output_file = RAW_DATA_DIR / "processed_content.json"
-        
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(processed_data, f, indent=2, sort_keys=True, ensure_ascii=False)
+        output_file = save_processed_corpus(processed_data, PROCESSED_CORPUS_DIR)
         
         logger.info(f"Processed content saved to: {output_file}")
         
@@ -1062,8 +1411,14 @@ def test_content_processing() -> None:
         logger.error(f"Content processing test failed: {e}")
         raise
 
-def main_content_processing():
-    """Main function for content processing workflow."""
+def main_content_processing(workers: int = 1, full_refresh: bool = False):
+    """
+    Main function for content processing workflow.
+    
+    Args:
+        workers: Worker processes for page processing
+        full_refresh: Reprocess every page instead of reusing unchanged ones
+    """
     try:
         logger.info("Starting X-Plane SDK Content Processing")
         logger.info("=" * 50)
@@ -1074,16 +1429,24 @@ def main_content_processing():
         
         # Process scraped content
         logger.info("Step 2: Processing scraped content")
-        processed_data = process_scraped_content()
+        processed_data = process_scraped_content(workers, incremental=not full_refresh)
         
         # Save processed content
         logger.info("Step 3: Saving processed content")
         save_processed_content(processed_data)
         
+        # Record the corpus tree the processed content was built from (see organize_docs)
+        save_merkle_snapshot('process_content', build_merkle_tree())
+        
+        # Re-index the pages that changed for full-text search
+        logger.info("Step 4: Refreshing the full-text index")
+        refresh_fts_index(ProcessedCorpus(PROCESSED_CORPUS_DIR))
+        
         # Summary
         stats = processed_data['metadata']['statistics']
         logger.info("\nContent Processing Summary:")
         logger.info(f"  Total pages processed: {stats['total_pages']}")
+        logger.info(f"  Reused unchanged: {stats['cached_pages']}")
         logger.info(f"  Successful: {stats['successful_processing']}")
         logger.info(f"  Failed: {stats['failed_processing']}")
         logger.info(f"  Categories found: {len(stats['categories'])}")
@@ -1099,9 +1462,16 @@ def main_content_processing():
 
 
 if __name__ == "__main__":
-    import sys
+    parser = argparse.ArgumentParser(description='Categorize SDK URLs or process scraped X-Plane SDK content')
+    parser.add_argument('command', nargs='?', choices=['process'],
+                        help="'process' processes scraped content; omit to categorize the SDK map URLs")
+    parser.add_argument('--workers', type=int, default=1,
+                        help=f"Worker processes for content processing (this machine has {os.cpu_count()} CPUs)")
+    parser.add_argument('--full-refresh', action='store_true',
+                        help='Reprocess every page instead of reusing unchanged ones')
+    args = parser.parse_args()
     
-    if len(sys.argv) > 1 and sys.argv[1] == "process":
-        main_content_processing()
+    if args.command == 'process':
+        main_content_processing(workers=args.workers, full_refresh=args.full_refresh)
     else:
         main()
\ No newline at end of file
@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""
+X-Plane SDK Documentation Processed Corpus
+
+Split storage for processed pages. A small manifest holds what most tools
+need about every page (URL, title, category, hashes, symbol names,
+cross-references, signature and example counts), and each page's bulky
+payload (cleaned_html, markdown, api_signatures, code_examples) is a
+separate compressed file in a content-addressed store next to it.
+Opening the corpus reads only the manifest; a page's payload is read the
+first time one of its payload fields is accessed.
+
+Purpose:
+- Let metadata-only tools (stats, validation summaries) start without parsing page bodies
+- Load page bodies on demand, one page at a time
+- Rewrite only the payloads of pages that changed when saving an incremental run
+- Read the legacy single-document processed_content.json until it is migrated
+
+Usage:
+    corpus = ProcessedCorpus()
+    print(len(corpus))
+    for url, page in corpus.by_category('XPLM_Camera'):
+        print(page['title'], len(page['markdown']))
+
+    python processed_corpus.py migrate    # convert processed_content.json to the split layout
+
+Files:
+    raw_data/processed/manifest.json: Page metadata and the payload hash of every page
+    raw_data/processed/pages/: Compressed page payloads (see blob_store)
+    raw_data/processed_content.json: Legacy single-document format (read-only fallback)
+"""
+
+import argparse
+import json
+import logging
+import os
+import tempfile
+from collections.abc import MutableMapping
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from blob_store import BlobStore
+from change_detector import CONTENT_HASH_ALGORITHM, calculate_content_hash
+
+logger = logging.getLogger(__name__)
+
+# File paths
+PROJECT_ROOT = Path(__file__).parent.parent
+RAW_DATA_DIR = PROJECT_ROOT / "raw_data"
+PROCESSED_CORPUS_DIR = RAW_DATA_DIR / "processed"
+MANIFEST_NAME = "manifest.json"
+PAYLOADS_DIR_NAME = "pages"
+LEGACY_PROCESSED_CONTENT_NAME = "processed_content.json"
+
+MANIFEST_VERSION = 1
+
+# Page record fields stored in the payload files; everything else goes in the manifest
+PAYLOAD_FIELDS = ('cleaned_html', 'markdown', 'api_signatures', 'code_examples')
+
+
+def manifest_path(root: Path) -> Path:
+    """Return the manifest of a processed corpus directory."""
+    return Path(root) / MANIFEST_NAME
+
+
+def legacy_path_for(root: Path) -> Path:
+    """Return the legacy processed_content.json a corpus directory replaces."""
+    return Path(root).parent / LEGACY_PROCESSED_CONTENT_NAME
+
+
+def payload_store_for(root: Path) -> BlobStore:
+    """Return the payload store of a processed corpus directory."""
+    return BlobStore(Path(root) / PAYLOADS_DIR_NAME)
+
+
+def processed_corpus_exists(root: Path = PROCESSED_CORPUS_DIR) -> bool:
+    """Return True if processed content exists in either format."""
+    return manifest_path(root).exists() or legacy_path_for(root).exists()
+
+
+class ProcessedPage(MutableMapping):
+    """
+    Processed page record whose payload fields are loaded on first access.
+
+    Behaves like the page dict process_content builds. Manifest fields are
+    available immediately; reading any PAYLOAD_FIELDS entry (or iterating
+    over the record) loads the whole payload once. Changing a payload field
+    drops payload_hash, so the page gets a new payload when it is saved.
+    """
+
+    def __init__(self, fields: Dict[str, Any], load_payload: Optional[Callable[[], Dict[str, Any]]] = None):
+        self._fields = dict(fields)
+        self._load_payload = load_payload
+
+    @property
+    def payload_loaded(self) -> bool:
+        return self._load_payload is None
+
+    def _ensure_payload(self) -> None:
+        if self._load_payload is not None:
+            load_payload, self._load_payload = self._load_payload, None
+            for field, value in load_payload().items():
+                self._fields.setdefault(field, value)
+
+    def manifest_fields(self) -> Dict[str, Any]:
+        """Return the fields kept in the manifest, without loading the payload."""
+        return {field: value for field, value in self._fields.items() if field not in PAYLOAD_FIELDS}
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._fields and key in PAYLOAD_FIELDS:
+            self._ensure_payload()
+        return self._fields[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in PAYLOAD_FIELDS:
+            self._ensure_payload()
+            self._fields.pop('payload_hash', None)
+        self._fields[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        if key in PAYLOAD_FIELDS:
+            self._ensure_payload()
+            self._fields.pop('payload_hash', None)
+        del self._fields[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._fields or (self._load_payload is not None and key in PAYLOAD_FIELDS)
+
+    def __iter__(self) -> Iterator[str]:
+        self._ensure_payload()
+        return iter(self._fields)
+
+    def __len__(self) -> int:
+        if self._load_payload is None:
+            return len(self._fields)
+        return len(self._fields.keys() | set(PAYLOAD_FIELDS))
+
+    def __repr__(self) -> str:
+        return f"ProcessedPage({self._fields.get('url')!r}, payload_loaded={self.payload_loaded})"
+
+
+class ProcessedCorpus:
+    """
+    Read-only view of the processed pages, in processing order.
+
+    Opening the corpus parses only the manifest. Pages are ProcessedPage
+    records whose payloads come from the payload store on demand. When
+    there is no manifest yet, the legacy processed_content.json next to
+    the corpus directory is loaded whole instead.
+    """
+
+    def __init__(self, root: Path = PROCESSED_CORPUS_DIR):
+        self.root = Path(root)
+        self.payload_store = payload_store_for(self.root)
+        path = manifest_path(self.root)
+        if path.exists():
+            self.legacy = False
+            with open(path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest.get('manifest_version', 0) > MANIFEST_VERSION:
+                raise ValueError(f"{path} has manifest version {manifest['manifest_version']}; "
+                                 f"this reader supports up to {MANIFEST_VERSION}")
+            self.metadata = manifest.get('metadata', {})
+            self.pages = {url: ProcessedPage(fields, self._payload_loader(fields['payload_hash']))
+                          for url, fields in manifest.get('pages', {}).items()}
+            return
+
+        legacy_path = legacy_path_for(self.root)
+        if not legacy_path.exists():
+            raise FileNotFoundError(f"Processed content not found: {path}")
+
+        logger.info(f"Reading legacy processed content from {legacy_path}")
+        self.legacy = True
+        with open(legacy_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        self.metadata = data.get('metadata', {})
+        self.pages = {url: ProcessedPage(dict(record, **_count_fields(record)))
+                      for url, record in data.get('processed_content', {}).items()}
+
+    def _payload_loader(self, payload_hash: str) -> Callable[[], Dict[str, Any]]:
+        return lambda: json.loads(self.payload_store.get_text(payload_hash))
+
+    def __len__(self) -> int:
+        return len(self.pages)
+
+    def __contains__(self, url: str) -> bool:
+        return url in self.pages
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.pages)
+
+    def __getitem__(self, url: str) -> ProcessedPage:
+        return self.pages[url]
+
+    def get(self, url: str, default: Optional[ProcessedPage] = None) -> Optional[ProcessedPage]:
+        return self.pages.get(url, default)
+
+    def urls(self) -> List[str]:
+        return list(self.pages)
+
+    def items(self) -> Iterator[Tuple[str, ProcessedPage]]:
+        """Yield (url, page) for every page; payloads load only when a payload field is read."""
+        return iter(self.pages.items())
+
+    def by_category(self, category: str) -> List[Tuple[str, ProcessedPage]]:
+        """
+        Select the pages of one category using only the manifest.
+
+        Args:
+            category: Category name, e.g. 'XPLM_Camera'
+
+        Returns:
+            (url, page) tuples in corpus order
+        """
+        return [(url, page) for url, page in self.pages.items()
+                if (page.get('category') or {}).get('category') == category]
+
+    def cross_references(self) -> Dict[str, List[str]]:
+        """Return the cross-references of every page (URL -> referenced names)."""
+        return {url: page.get('cross_references', []) for url, page in self.pages.items()}
+
+    def symbol_names(self) -> Set[str]:
+        """Return the API symbol names defined across all pages."""
+        return {name for page in self.pages.values() for name in page.get('own_functions', [])}
+
+
+def _count_fields(record: Dict[str, Any]) -> Dict[str, int]:
+    return {
+        'api_signature_count': len(record.get('api_signatures') or []),
+        'code_example_count': len(record.get('code_examples') or []),
+    }
+
+
+def page_source_key(page: Dict[str, Any]) -> str:
+    """
+    Identify the version of a processed page that derived outputs
+    (full-text index rows, generated docs) were built from.
+
+    Uses the payload hash from the manifest when there is one, so
+    unchanged pages are recognized without loading their payloads.
+
+    Args:
+        page: Processed page record
+
+    Returns:
+        str: Hash over the page's payload, title and category
+    """
+    payload = page.get('payload_hash') or {field: page.get(field) for field in
+                                           ('markdown', 'api_signatures', 'code_examples')}
+    return calculate_content_hash(json.dumps([payload, page.get('title'), page.get('category')], sort_keys=True),
+                                  CONTENT_HASH_ALGORITHM)
+
+
+def manifest_entry(record: Dict[str, Any], payload_store: BlobStore) -> Dict[str, Any]:
+    """
+    Split a page record into its manifest entry, storing the payload.
+
+    A ProcessedPage whose payload is unchanged and already in the store
+    keeps its payload_hash without its payload being loaded.
+
+    Args:
+        record: Processed page record (dict or ProcessedPage)
+        payload_store: Store that receives the payload
+
+    Returns:
+        Dict: Manifest fields of the page, including payload_hash and the counts
+    """
+    if isinstance(record, ProcessedPage):
+        entry = record.manifest_fields()
+        payload_hash = entry.get('payload_hash')
+        if payload_hash and payload_hash in payload_store and 'api_signature_count' in entry:
+            return entry
+    else:
+        entry = {field: value for field, value in record.items() if field not in PAYLOAD_FIELDS}
+
+    payload = {field: record.get(field) for field in PAYLOAD_FIELDS}
+    entry.update(_count_fields(payload))
+    entry['payload_hash'] = payload_store.put(json.dumps(payload, sort_keys=True, ensure_ascii=False))
+    return entry
+
+
+def prune_payloads(payload_store: BlobStore, keep: Set[str]) -> int:
+    """
+    Delete payloads no manifest entry refers to any more.
+
+    Args:
+        payload_store: Payload store to clean up
+        keep: Payload hashes still referenced
+
+    Returns:
+        int: Number of payload files removed
+    """
+    removed = 0
+    for path in payload_store.root.glob('*/*'):
+        # Dotted names are another writer's temporary files
+        if path.name.startswith('.') or path.name.split('.')[0] in keep:
+            continue
+        path.unlink()
+        removed += 1
+    return removed
+
+
+def save_processed_corpus(processed_data: Dict[str, Any], root: Path = PROCESSED_CORPUS_DIR) -> Path:
+    """
+    Write processed content in the split layout.
+
+    Payloads are stored first and the manifest then replaces the previous
+    one atomically, so readers never see a manifest whose payloads are
+    missing. Payloads the new manifest no longer refers to are deleted
+    afterwards. A legacy processed_content.json is left untouched; the
+    manifest takes precedence over it once it exists.
+
+    Args:
+        processed_data: Processed content data ('metadata' and 'processed_content')
+        root: Corpus directory
+
+    Returns:
+        Path: The manifest that was written
+    """
+    root = Path(root)
+    payload_store = payload_store_for(root)
+    pages = {url: manifest_entry(record, payload_store)
+             for url, record in processed_data.get('processed_content', {}).items()}
+    manifest = {
+        'manifest_version': MANIFEST_VERSION,
+        'metadata': processed_data.get('metadata', {}),
+        'pages': pages,
+    }
+
+    path = manifest_path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=root, prefix='.' + MANIFEST_NAME)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True, ensure_ascii=False)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+    removed = prune_payloads(payload_store, {entry['payload_hash'] for entry in pages.values()})
+    if removed:
+        logger.info(f"Removed {removed} unreferenced page payloads from {payload_store.root}")
+    return path
+
+
+def migrate_legacy(root: Path = PROCESSED_CORPUS_DIR) -> Path:
+    """
+    Convert the legacy processed_content.json to the split layout.
+
+    Args:
+        root: Corpus directory to create next to the legacy file
+
+    Returns:
+        Path: The manifest that was written
+
+    Raises:
+        FileNotFoundError: If there is no legacy file to migrate
+    """
+    legacy_path = legacy_path_for(root)
+    if not legacy_path.exists():
+        raise FileNotFoundError(f"Legacy processed content not found: {legacy_path}")
+
+    with open(legacy_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    path = save_processed_corpus(data, root)
+    logger.info(f"Migrated {len(data.get('processed_content', {}))} pages to {path}")
+    return path
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description='Manage the processed X-Plane SDK corpus')
+    parser.add_argument('command', choices=['migrate'],
+                        help="'migrate' converts raw_data/processed_content.json to the split layout")
+    parser.parse_args()
+    migrate_legacy()
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+X-Plane SDK Documentation Scraper Rate Limiter
+
+Shared per-host token-bucket rate limiter used by both scraping engines.
+Workers acquire a token before each request, so the request rate is
+limited at the source instead of by sleeping after results arrive.
+
+Purpose:
+- Enforce a sustained requests/second rate with a configurable burst per host
+- Back off adaptively when the server returns 429/503 or responses slow down
+- Recover gradually towards the configured rate once the server is healthy
+
+Usage:
+    limiter = HostRateLimiter(requests_per_second=3.0, burst=3)
+    limiter.acquire(url)                      # threads
+    await limiter.acquire_async(url)          # asyncio
+    limiter.record_response(url, status, latency, retry_after)
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+# Adaptive back-off configuration
+BACKOFF_FACTOR = 0.5  # Multiply the rate by this on 429/503
+SLOW_RESPONSE_FACTOR = 0.8  # Multiply the rate by this on slow responses
+RECOVERY_FRACTION = 0.1  # Add this fraction of the configured rate per healthy response
+MIN_RATE_FRACTION = 0.05  # Never throttle below this fraction of the configured rate
+LATENCY_THRESHOLD = 2.0  # Seconds; slower responses count as server pressure
+THROTTLE_STATUS_CODES = (429, 503)
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket that hands out reservations.
+
+    reserve() always claims a token, letting the balance go negative, and
+    returns how long the caller must wait before using it. Concurrent
+    callers are therefore queued in arrival order at exactly `rate`
+    requests per second once the burst is spent.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        if now > self._last:
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+
+    def reserve(self) -> float:
+        """
+        Claim one token.
+
+        Returns:
+            float: Seconds to wait before the token may be used
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= 1
+            # _last is in the future while the bucket is paused
+            return max(0.0, self._last - now) + max(0.0, -self._tokens) / self.rate
+
+    def set_rate(self, rate: float) -> None:
+        """Change the refill rate, keeping tokens accrued at the old rate."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = rate
+
+    def pause(self, seconds: float) -> None:
+        """Hand out no tokens for `seconds` and drop any saved-up burst."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens = min(self._tokens, 0.0)
+            self._last = max(self._last, now + seconds)
+
+
+class HostRateLimiter:
+    """
+    Per-host token buckets with adaptive (AIMD) back-off.
+
+    Each host gets its own bucket at the configured rate. Throttling
+    responses (429/503) halve the host's rate and honour Retry-After, slow
+    responses trim it, and every healthy response adds back a fraction of
+    the configured rate until it is reached again.
+    """
+
+    def __init__(self, requests_per_second: float, burst: int = 1,
+                 latency_threshold: float = LATENCY_THRESHOLD):
+        if requests_per_second <= 0:
+            raise ValueError("requests_per_second must be positive")
+        self.requests_per_second = requests_per_second
+        self.burst = max(1, burst)
+        self.latency_threshold = latency_threshold
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, url: str) -> TokenBucket:
+        host = urlparse(url).netloc
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(self.requests_per_second, self.burst)
+                self._buckets[host] = bucket
+            return bucket
+
+    def acquire(self, url: str) -> float:
+        """
+        Block the calling thread until a request to url's host is allowed.
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        delay = self._bucket(url).reserve()
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    async def acquire_async(self, url: str) -> float:
+        """
+        Suspend the calling coroutine until a request to url's host is allowed.
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        delay = self._bucket(url).reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+    def current_rate(self, url: str) -> float:
+        """Return the current (possibly backed-off) rate for url's host."""
+        return self._bucket(url).rate
+
+    def record_response(self, url: str, status_code: Optional[int], latency: float,
+                        retry_after: Optional[str] = None) -> None:
+        """
+        Adapt the host's rate to how the server responded.
+
+        Args:
+            url: URL that was requested
+            status_code: HTTP status code, or None if the request failed outright
+            latency: Seconds the request took
+            retry_after: Raw Retry-After header value, if any
+        """
+        bucket = self._bucket(url)
+        host = urlparse(url).netloc
+        min_rate = self.requests_per_second * MIN_RATE_FRACTION
+
+        if status_code in THROTTLE_STATUS_CODES:
+            new_rate = max(min_rate, bucket.rate * BACKOFF_FACTOR)
+            bucket.set_rate(new_rate)
+            pause = parse_retry_after(retry_after)
+            if pause:
+                bucket.pause(pause)
+            logger.warning(f"{host} returned {status_code}; backing off to {new_rate:.2f} req/s"
+                           + (f" and pausing {pause:.1f}s" if pause else ""))
+
+        elif status_code is None or latency > self.latency_threshold:
+            new_rate = max(min_rate, bucket.rate * SLOW_RESPONSE_FACTOR)
+            if new_rate < bucket.rate:
+                bucket.set_rate(new_rate)
+                logger.info(f"{host} is slow ({latency:.1f}s); reducing to {new_rate:.2f} req/s")
+
+        elif bucket.rate < self.requests_per_second:
+            bucket.set_rate(min(self.requests_per_second,
+                                bucket.rate + self.requests_per_second * RECOVERY_FRACTION))
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header (delta-seconds or HTTP-date).
+
+    Args:
+        value: Raw header value
+
+    Returns:
+        float: Seconds to wait, or None if absent or unparseable
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
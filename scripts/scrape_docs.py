@@ -10,32 +10,51 @@ Purpose:
 - Scrape X-Plane SDK documentation from web sources
 - Handle different documentation formats and structures
 - Save raw content for processing pipeline
-- Manage rate limiting and respectful scraping practices
+- Manage rate limiting and respectful scraping practices (see rate_limiter.py)
 
 Usage:
-    python scrape_docs.py [options]
+    python scrape_docs.py [--engine {thread,async}] [--workers N] [--max-in-flight N]
+                          [--rps N] [--burst N] [--parser {html.parser,lxml}]
+                          [--full-refresh] [--resume] [--record ARCHIVE | --replay ARCHIVE]
 
 Dependencies:
     - requests: For HTTP requests
     - beautifulsoup4: For HTML parsing
+    - lxml: Faster HTML parser for BeautifulSoup (optional, --parser lxml)
     - concurrent.futures: For parallel processing
 """
 
+import argparse
 import json
 import logging
 import re
+import threading
 import time
+from bisect import bisect_right
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Tuple, Union
 from urllib.parse import urljoin, urlparse
 
 import requests
-from bs4 import BeautifulSoup, Comment
+from bs4 import BeautifulSoup, CData, Comment, NavigableString, Tag
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
 
-from change_detector import calculate_content_hash, load_existing_hashes, save_content_hashes
+from change_detector import (CONTENT_HASH_ALGORITHM, HASH_ALGORITHM, calculate_content_fingerprint,
+                             calculate_content_hash, get_state_store, load_http_validators)
+from corpus_io import (LEGACY_SCRAPED_CONTENT_FILE, SCRAPED_CONTENT_JSONL, ScrapedContentIndex,
+                       ScrapedContentWriter, has_content)
 from process_content import read_sdk_map_file
+from rate_limiter import HostRateLimiter
+
+try:
+    import lxml  # noqa: F401 - only needed as a BeautifulSoup tree builder
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
 
 # Configure logging
 logging.basicConfig(
@@ -49,15 +68,18 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 # Configuration
-RATE_LIMIT_DELAY = 0.3  # 0.3 seconds between requests
+REQUESTS_PER_SECOND = 3.0  # Sustained request rate per host
+BURST_SIZE = 3  # Requests a host may receive back-to-back before pacing starts
 MAX_RETRIES = 3
 TIMEOUT = 30
 MAX_WORKERS = 5  # Conservative thread count for respectful scraping
+POOL_CONNECTIONS = 4  # Number of per-host connection pools cached by each session
+POOL_MAXSIZE = 2  # Keep-alive connections kept per host by each worker session
 
 # File paths
 PROJECT_ROOT = Path(__file__).parent.parent
 RAW_DATA_DIR = PROJECT_ROOT / "raw_data"
-SCRAPED_CONTENT_FILE = RAW_DATA_DIR / "scraped_content.json"
+SCRAPED_CONTENT_FILE = SCRAPED_CONTENT_JSONL
 CATEGORIZED_URLS_FILE = RAW_DATA_DIR / "categorized_urls.json"
 
 # Request headers to appear as a legitimate browser
@@ -70,13 +92,352 @@ HEADERS = {
     'Upgrade-Insecure-Requests': '1',
 }
 
+# HTML parsers for BeautifulSoup; lxml is faster but optional
+HTML_PARSER = 'html.parser'
+HTML_PARSERS = ('html.parser', 'lxml')
+
+# Page chrome removed before the main content is located
+UNWANTED_SELECTORS = [
+    'nav', 'header', 'footer', 'aside',
+    '.navigation', '.nav', '.sidebar', '.menu',
+    '.advertisement', '.ads', '.ad',
+    '.social', '.share', '.comments',
+    'script', 'style', 'noscript',
+    '.breadcrumb', '.breadcrumbs',
+    '.search', '.search-form',
+    '.pagination', '.pager'
+]
+
+# Common patterns for the main content area, in priority order
+MAIN_CONTENT_SELECTORS = [
+    'main',
+    'article',
+    '.content',
+    '.main-content',
+    '.documentation',
+    '.doc-content',
+    '#content',
+    '#main',
+    '.entry-content',
+    '.post-content',
+    '.page-content'
+]
+
+# Common selectors for code blocks
+CODE_SELECTORS = [
+    'pre code',
+    'pre',
+    '.code',
+    '.highlight',
+    '.codehilite',
+    '.syntax',
+    'code.language-c',
+    'code.language-cpp',
+    'code[class*="language-c"]',  # More flexible C++ selector
+    '.c-code',
+    '.cpp-code'
+]
+
+# Language hints in the class attribute of a code block and of its parent
+C_CODE_CLASSES = frozenset({'c', 'cpp', 'c++', 'c-code', 'cpp-code'})
+C_PARENT_CLASSES = frozenset({'c', 'cpp', 'c++', 'highlight-c', 'highlight-cpp'})
+
+# Heuristics for C/C++ code blocks without a language class; any match means C
+C_CODE_PATTERNS = [
+    r'\b(int|char|float|double|void|struct|typedef)\b',
+    r'\b(XP[A-Z][a-zA-Z]*)\b',  # X-Plane API functions
+    r'#include\s*[<"]',
+    r'\*\s*\w+\s*\(',  # Function pointers
+    r'\w+\s*\*\s*\w+',  # Pointer declarations
+]
+C_CODE_PATTERN = re.compile('|'.join(f'(?:{pattern})' for pattern in C_CODE_PATTERNS))
+
+# Elements whose text gives a code example its context
+CONTEXT_TAGS = ['h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p']
+
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+
+class ConnectionStats:
+    """Thread-safe counters for TCP connections opened versus HTTP requests sent."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.connections_opened = 0
+        self.requests_made = 0
+
+    def reset(self) -> None:
+        """Zero both counters (called at the start of each scrape run)."""
+        with self._lock:
+            self.connections_opened = 0
+            self.requests_made = 0
+
+    def record_connection(self) -> None:
+        """Count one newly opened connection."""
+        with self._lock:
+            self.connections_opened += 1
+
+    def record_request(self) -> None:
+        """Count one request sent over any connection."""
+        with self._lock:
+            self.requests_made += 1
+
+    def snapshot(self) -> Dict[str, int]:
+        """Return a consistent copy of the counters."""
+        with self._lock:
+            return {
+                'connections_opened': self.connections_opened,
+                'requests_made': self.requests_made
+            }
+
+
+CONNECTION_STATS = ConnectionStats()
+
+
+# urllib3 re-uses connection objects after the server drops a socket, so the
+# count is taken where the socket is actually opened rather than per pool slot.
+class _CountingHTTPConnection(HTTPConnection):
+    def _new_conn(self):
+        sock = super()._new_conn()
+        CONNECTION_STATS.record_connection()
+        return sock
+
+
+class _CountingHTTPSConnection(HTTPSConnection):
+    def _new_conn(self):
+        sock = super()._new_conn()
+        CONNECTION_STATS.record_connection()
+        return sock
+
+
+class _CountingHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _CountingHTTPConnection
+
+
+class _CountingHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _CountingHTTPSConnection
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """
+    HTTPAdapter that keeps connections alive between requests and reports
+    every new connection and every request to CONNECTION_STATS.
+    """
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        super().init_poolmanager(connections, maxsize, block=block, **pool_kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _CountingHTTPConnectionPool,
+            'https': _CountingHTTPSConnectionPool,
+        }
+
+    def send(self, request, **kwargs):
+        CONNECTION_STATS.record_request()
+        return super().send(request, **kwargs)
+
+
+# Worker-scoped sessions: each scraper thread reuses one keep-alive session.
+# The generation counter lets close_all_sessions() invalidate sessions that
+# are still referenced from long-lived threads (e.g. the main thread).
+_thread_local = threading.local()
+_session_registry: List[requests.Session] = []
+_session_registry_lock = threading.Lock()
+_session_generation = 0
+
+
+# Builds a session's transport adapter from the pool size (see http_archive)
+AdapterFactory = Callable[[int], HTTPAdapter]
+
+
+def create_session(pool_size: int = POOL_MAXSIZE,
+                   adapter_factory: Optional[AdapterFactory] = None) -> requests.Session:
+    """
+    Build a session with browser headers and a keep-alive connection pool.
+    
+    Args:
+        pool_size: Maximum number of connections kept alive per host
+        adapter_factory: Alternative transport, e.g. for recording or replay
+        
+    Returns:
+        requests.Session: Configured session
+    """
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    
+    if adapter_factory:
+        adapter = adapter_factory(pool_size)
+    else:
+        adapter = PooledHTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    
+    with _session_registry_lock:
+        _session_registry.append(session)
+    
+    return session
+
+
+def get_session(pool_size: int = POOL_MAXSIZE,
+                adapter_factory: Optional[AdapterFactory] = None) -> requests.Session:
+    """
+    Return the calling thread's session, creating it on first use.
+    
+    Args:
+        pool_size: Pool size used if a new session has to be created
+        adapter_factory: Transport used if a new session has to be created
+        
+    Returns:
+        requests.Session: Session owned by the current thread
+    """
+    session = getattr(_thread_local, 'session', None)
+    if session is None or getattr(_thread_local, 'generation', None) != _session_generation:
+        session = create_session(pool_size, adapter_factory)
+        _thread_local.session = session
+        _thread_local.generation = _session_generation
+    return session
+
+
+def close_all_sessions() -> None:
+    """Close every worker session and release their pooled connections."""
+    global _session_generation
+    
+    with _session_registry_lock:
+        sessions = list(_session_registry)
+        _session_registry.clear()
+        _session_generation += 1
+    
+    for session in sessions:
+        session.close()
+
+
+def new_scrape_result(url: str) -> Dict[str, Union[str, int, bool, Dict]]:
+    """
+    Create an empty scrape result record for a URL.
+    
+    Args:
+        url: URL the record describes
+        
+    Returns:
+        Dict with every result field set to its "not scraped" value
+    """
+    return {
+        'url': url,
+        'content': '',
+        'raw_html': '',
+        'status_code': 0,
+        'success': False,
+        'error': None,
+        'metadata': {},
+        'code_examples': [],
+        'content_fingerprint': None,
+        'fingerprint_algorithm': None,
+        'http_validators': {},
+        'not_modified': False,
+        'timestamp': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+    }
+
+
+def conditional_request_headers(validators: Optional[Dict[str, str]]) -> Dict[str, str]:
+    """
+    Build If-None-Match / If-Modified-Since headers from stored validators.
+    
+    Args:
+        validators: Dict with optional 'etag' and 'last_modified' entries
+        
+    Returns:
+        Dict of request headers (empty if there is nothing to validate against)
+    """
+    headers = {}
+    if validators:
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
+    return headers
+
+
+def extract_http_validators(response_headers) -> Dict[str, str]:
+    """
+    Pick the ETag and Last-Modified validators out of response headers.
+    
+    Args:
+        response_headers: Case-insensitive header mapping from requests or aiohttp
+        
+    Returns:
+        Dict with 'etag' and/or 'last_modified' entries
+    """
+    validators = {}
+    if response_headers.get('ETag'):
+        validators['etag'] = response_headers['ETag']
+    if response_headers.get('Last-Modified'):
+        validators['last_modified'] = response_headers['Last-Modified']
+    return validators
+
 
-def scrape_single_url(url: str) -> Dict[str, Union[str, int, bool, Dict]]:
+def reuse_previous_result(previous: Dict, status_code: int, validators: Dict[str, str]) -> Dict:
+    """
+    Build the result for a 304 Not Modified response from the previous run's record.
+    
+    Args:
+        previous: Successful result recorded for the same URL on the last run
+        status_code: Status code of the conditional response (304)
+        validators: Validators sent back with the 304, if any
+        
+    Returns:
+        Copy of the previous result marked as not modified; page bodies
+        stay as blob hashes when the previous result is a stored record
+    """
+    result = dict(previous)
+    result['status_code'] = status_code
+    result['success'] = True
+    result['error'] = None
+    result['not_modified'] = True
+    result['http_validators'] = {**previous.get('http_validators', {}), **validators}
+    result['timestamp'] = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+    return result
+
+
+def parse_page(html: str, url: str, parser: str = HTML_PARSER) -> Dict[str, Union[str, Dict, List]]:
+    """
+    Parse a fetched page once and run all extractors over the tree.
+    
+    Kept free of network and session state so it can run in a worker
+    process (see async_scraper).
+    
+    Args:
+        html: Page HTML
+        url: URL the page was fetched from
+        parser: BeautifulSoup tree builder ('html.parser' or 'lxml')
+        
+    Returns:
+        Dict with content, metadata, code_examples and content_fingerprint fields
+    """
+    page = extract_page(BeautifulSoup(html, parser), url)
+    page['content_fingerprint'] = calculate_content_fingerprint(page['content'], HASH_ALGORITHM)
+    page['fingerprint_algorithm'] = HASH_ALGORITHM
+    return page
+
+
+def scrape_single_url(url: str, session: Optional[requests.Session] = None,
+                      validators: Optional[Dict[str, str]] = None,
+                      previous_results: Optional[Mapping[str, Dict]] = None,
+                      rate_limiter: Optional[HostRateLimiter] = None,
+                      parser: str = HTML_PARSER) -> Dict[str, Union[str, int, bool, Dict]]:
     """
     Extract content from one URL using requests and BeautifulSoup.
     
+    When validators are given and the previous run has a reusable result for
+    the URL, the request is conditional; a 304 Not Modified reuses the
+    previous extraction instead of downloading and parsing the page again.
+    The previous result is only loaded once the 304 arrives.
+    
     Args:
         url: URL to scrape
+        session: Session to use; defaults to the calling thread's pooled session
+        validators: Stored ETag/Last-Modified validators for the URL
+        previous_results: Previous run's reusable results by URL (dict or ScrapedContentIndex)
+        rate_limiter: Shared limiter acquired before every request attempt
+        parser: BeautifulSoup tree builder used by parse_page
         
     Returns:
         Dict containing:
@@ -88,43 +449,44 @@ def scrape_single_url(url: str) -> Dict[str, Union[str, int, bool, Dict]]:
         - error: Error message if failed
         - metadata: Additional information (title, description, etc.)
         - code_examples: List of extracted code examples
+        - http_validators: ETag/Last-Modified returned by the server
+        - not_modified: True if the previous extraction was reused (304)
         - timestamp: When the content was scraped
     """
-    result = {
-        'url': url,
-        'content': '',
-        'raw_html': '',
-        'status_code': 0,
-        'success': False,
-        'error': None,
-        'metadata': {},
-        'code_examples': [],
-        'timestamp': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
-    }
+    result = new_scrape_result(url)
     
-    session = requests.Session()
-    session.headers.update(HEADERS)
+    if session is None:
+        session = get_session()
+    
+    # Only ask for a 304 when there is a previous extraction to fall back on
+    has_previous = bool(previous_results) and url in previous_results
+    request_headers = conditional_request_headers(validators) if has_previous else {}
     
     for attempt in range(MAX_RETRIES):
         try:
             logger.debug(f"Scraping {url} (attempt {attempt + 1}/{MAX_RETRIES})")
             
-            response = session.get(url, timeout=TIMEOUT)
+            if rate_limiter:
+                rate_limiter.acquire(url)
+            request_start = time.monotonic()
+            
+            response = session.get(url, timeout=TIMEOUT, headers=request_headers)
             result['status_code'] = response.status_code
+            if rate_limiter:
+                rate_limiter.record_response(url, response.status_code, response.elapsed.total_seconds(),
+                                             response.headers.get('Retry-After'))
+            result['http_validators'] = extract_http_validators(response.headers)
+            
+            previous = usable_previous_result(previous_results, url) if response.status_code == 304 else None
+            if previous:
+                result = reuse_previous_result(previous, response.status_code, result['http_validators'])
+                logger.debug(f"Not modified, reusing previous extraction: {url}")
+                break
+            
             result['raw_html'] = response.text
             
             if response.status_code == 200:
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
-                # Extract main content
-                result['content'] = extract_main_content(soup)
-                
-                # Extract metadata
-                result['metadata'] = extract_metadata(soup, url)
-                
-                # Extract code examples
-                result['code_examples'] = extract_code_examples(soup)
-                
+                result.update(parse_page(response.text, url, parser))
                 result['success'] = True
                 logger.debug(f"Successfully scraped {url}")
                 break
@@ -146,14 +508,22 @@ def scrape_single_url(url: str) -> Dict[str, Union[str, int, bool, Dict]]:
         except requests.exceptions.Timeout:
             result['error'] = f"Timeout after {TIMEOUT}s: {url}"
             logger.warning(result['error'])
+            if rate_limiter:
+                rate_limiter.record_response(url, None, time.monotonic() - request_start)
             
         except requests.exceptions.ConnectionError:
             result['error'] = f"Connection error: {url}"
             logger.warning(result['error'])
+            if rate_limiter:
+                rate_limiter.record_response(url, None, time.monotonic() - request_start)
             
         except requests.exceptions.RequestException as e:
             result['error'] = f"Request error: {e}"
             logger.warning(result['error'])
+            # Transport failures (broken responses, redirect loops) count against the host;
+            # malformed requests (invalid URL, schema or header) are ValueErrors and never reached it
+            if rate_limiter and not isinstance(e, ValueError):
+                rate_limiter.record_response(url, None, time.monotonic() - request_start)
             
         except Exception as e:
             result['error'] = f"Unexpected error: {e}"
@@ -179,18 +549,7 @@ def extract_main_content(soup: BeautifulSoup) -> str:
         str: Cleaned main content HTML
     """
     # Remove unwanted elements
-    unwanted_selectors = [
-        'nav', 'header', 'footer', 'aside',
-        '.navigation', '.nav', '.sidebar', '.menu',
-        '.advertisement', '.ads', '.ad',
-        '.social', '.share', '.comments',
-        'script', 'style', 'noscript',
-        '.breadcrumb', '.breadcrumbs',
-        '.search', '.search-form',
-        '.pagination', '.pager'
-    ]
-    
-    for selector in unwanted_selectors:
+    for selector in UNWANTED_SELECTORS:
         for element in soup.select(selector):
             element.decompose()
     
@@ -199,22 +558,8 @@ def extract_main_content(soup: BeautifulSoup) -> str:
         comment.extract()
     
     # Try to find main content area using common patterns
-    main_content_selectors = [
-        'main',
-        'article',
-        '.content',
-        '.main-content',
-        '.documentation',
-        '.doc-content',
-        '#content',
-        '#main',
-        '.entry-content',
-        '.post-content',
-        '.page-content'
-    ]
-    
     main_content = None
-    for selector in main_content_selectors:
+    for selector in MAIN_CONTENT_SELECTORS:
         main_content = soup.select_one(selector)
         if main_content:
             logger.debug(f"Found main content using selector: {selector}")
@@ -243,7 +588,7 @@ def extract_main_content(soup: BeautifulSoup) -> str:
         # Clean up whitespace in text nodes
         for text_node in main_content.find_all(string=True):
             if text_node.parent.name not in ['pre', 'code']:
-                cleaned_text = re.sub(r'\s+', ' ', text_node).strip()
+                cleaned_text = WHITESPACE_PATTERN.sub(' ', text_node).strip()
                 text_node.replace_with(cleaned_text)
         
         return str(main_content)
@@ -255,105 +600,107 @@ def extract_code_examples(soup: BeautifulSoup) -> List[Dict[str, str]]:
     """
     Find and extract code snippets from the documentation.
     
+    All CODE_SELECTORS are matched in one traversal of the tree (see
+    _match_code_blocks) instead of one soup.select pass per selector.
+    
     Args:
         soup: BeautifulSoup object of the page
         
     Returns:
         List of dictionaries containing code examples with context
     """
-    code_examples = []
+    return build_code_examples(_match_code_blocks(soup))
+
+
+def build_code_examples(matches: Iterable[Tuple[str, List[Tag]]]) -> List[Dict[str, str]]:
+    """
+    Turn code block matches into code examples with language and context.
     
-    # Common selectors for code blocks
-    code_selectors = [
-        'pre code',
-        'pre',
-        '.code',
-        '.highlight',
-        '.codehilite',
-        '.syntax',
-        'code.language-c',
-        'code.language-cpp',
-        'code[class*="language-c"]',  # More flexible C++ selector
-        '.c-code',
-        '.cpp-code'
-    ]
+    A block matched by several selectors is only turned into an example
+    the first time it is met, and examples whose code was already seen
+    are skipped up front, so each block's text, language and context are
+    computed at most once.
     
-    for selector in code_selectors:
-        code_blocks = soup.select(selector)
+    Args:
+        matches: (selector, matching blocks in document order) pairs, in CODE_SELECTORS order
         
+    Returns:
+        List of dictionaries containing code examples with context
+    """
+    code_examples = []
+    seen_blocks = set()
+    seen_codes = set()
+    contexts: Dict[int, str] = {}
+    
+    for selector, code_blocks in matches:
         for i, block in enumerate(code_blocks):
-            code_text = block.get_text()
-            
-            # Skip very short code snippets (likely inline code)
-            if len(code_text.strip()) < 10:
+            # The same element matched by an earlier selector can only yield a duplicate
+            if id(block) in seen_blocks:
                 continue
+            seen_blocks.add(id(block))
             
-            # Try to determine the language
-            language = 'unknown'
-            
-            # Check class attributes for language hints
-            classes = block.get('class', [])
-            for cls in classes:
-                if 'language-' in cls:
-                    language = cls.replace('language-', '')
-                elif cls in ['c', 'cpp', 'c++', 'c-code', 'cpp-code']:
-                    language = cls
-            
-            # Check parent classes
-            if language == 'unknown' and block.parent:
-                parent_classes = block.parent.get('class', [])
-                for cls in parent_classes:
-                    if 'language-' in cls:
-                        language = cls.replace('language-', '')
-                    elif cls in ['c', 'cpp', 'c++', 'highlight-c', 'highlight-cpp']:
-                        language = cls
-            
-            # Heuristic detection for C/C++ code
-            if language == 'unknown':
-                c_patterns = [
-                    r'\b(int|char|float|double|void|struct|typedef)\b',
-                    r'\b(XP[A-Z][a-zA-Z]*)\b',  # X-Plane API functions
-                    r'#include\s*[<"]',
-                    r'\*\s*\w+\s*\(',  # Function pointers
-                    r'\w+\s*\*\s*\w+',  # Pointer declarations
-                ]
-                
-                for pattern in c_patterns:
-                    if re.search(pattern, code_text):
-                        language = 'c'
-                        break
+            code_text = block.get_text()
+            code = code_text.strip()
             
-            # Get context (preceding heading or paragraph)
-            context = ""
-            prev_element = block.parent
-            while prev_element and not context:
-                prev_sibling = prev_element.find_previous_sibling(['h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p'])
-                if prev_sibling:
-                    context = prev_sibling.get_text().strip()[:200]  # First 200 chars
-                    break
-                prev_element = prev_element.parent
+            # Skip very short code snippets (likely inline code) and repeated snippets
+            if len(code) < 10 or code in seen_codes:
+                continue
+            seen_codes.add(code)
             
-            code_example = {
-                'code': code_text.strip(),
-                'language': language,
-                'context': context,
+            code_examples.append({
+                'code': code,
+                'language': _code_language(block, code_text),
+                'context': _code_context(block.parent, contexts),
                 'selector_used': selector,
                 'index': i
-            }
-            
-            code_examples.append(code_example)
+            })
     
-    # Remove duplicates (same code content)
-    seen_codes = set()
-    unique_examples = []
-    for example in code_examples:
-        code_hash = calculate_content_hash(example['code'])
-        if code_hash not in seen_codes:
-            seen_codes.add(code_hash)
-            unique_examples.append(example)
+    logger.debug(f"Extracted {len(code_examples)} unique code examples")
+    return code_examples
+
+
+def _code_language(block: Tag, code_text: str) -> str:
+    """Determine a code block's language from its classes, its parent's classes or its text."""
+    language = 'unknown'
+    
+    # Check class attributes for language hints
+    for cls in block.get('class', []):
+        if 'language-' in cls:
+            language = cls.replace('language-', '')
+        elif cls in C_CODE_CLASSES:
+            language = cls
     
-    logger.debug(f"Extracted {len(unique_examples)} unique code examples")
-    return unique_examples
+    # Check parent classes
+    if language == 'unknown' and block.parent:
+        for cls in block.parent.get('class', []):
+            if 'language-' in cls:
+                language = cls.replace('language-', '')
+            elif cls in C_PARENT_CLASSES:
+                language = cls
+    
+    # Heuristic detection for C/C++ code
+    if language == 'unknown' and C_CODE_PATTERN.search(code_text):
+        language = 'c'
+    
+    return language
+
+
+def _code_context(parent: Optional[Tag], contexts: Dict[int, str]) -> str:
+    """Return the text of the heading or paragraph preceding a code block's parent (or its ancestors)."""
+    if parent is None:
+        return ""
+    if id(parent) not in contexts:
+        # Get context (preceding heading or paragraph)
+        context = ""
+        prev_element = parent
+        while prev_element:
+            prev_sibling = prev_element.find_previous_sibling(CONTEXT_TAGS)
+            if prev_sibling:
+                context = prev_sibling.get_text().strip()[:200]  # First 200 chars
+                break
+            prev_element = prev_element.parent
+        contexts[id(parent)] = context
+    return contexts[id(parent)]
 
 
 def extract_metadata(soup: BeautifulSoup, url: str) -> Dict[str, str]:
@@ -404,46 +751,384 @@ def extract_metadata(soup: BeautifulSoup, url: str) -> Dict[str, str]:
     metadata['link_count'] = len(soup.find_all('a'))
     
     # Extract function name from URL if it's an API page
+    metadata.update(_url_metadata(url))
+    
+    return metadata
+
+
+def _url_metadata(url: str) -> Dict[str, str]:
+    """Derive the API function and module from an SDK reference URL."""
+    metadata = {}
     path_parts = urlparse(url).path.strip('/').split('/')
     if len(path_parts) >= 2 and path_parts[0] == 'sdk':
         metadata['api_function'] = path_parts[-1]
         metadata['api_module'] = path_parts[1] if len(path_parts) > 1 else ''
-    
     return metadata
 
 
-def scrape_all_urls(url_list: List[str]) -> Dict[str, Dict]:
+class _SimpleSelector:
+    """
+    The small CSS subset used by the selector lists above.
+    
+    Supports `tag`, `.class`, `#id`, `tag.class`, `tag[attr*="value"]` and
+    a single descendant combinator whose ancestor is a bare tag name
+    (`pre code`), which is all the single-pass walker needs to match
+    elements without calling soup.select.
+    """
+    
+    PATTERN = re.compile(r'^(?:(?P<ancestor>\w+)\s+)?(?P<tag>\w+)?(?:\.(?P<cls>[\w-]+))?(?:#(?P<id>[\w-]+))?'
+                         r'(?:\[(?P<attr>[\w-]+)\*="(?P<substring>[^"]*)"\])?$')
+    
+    def __init__(self, selector: str):
+        match = self.PATTERN.match(selector)
+        if not match:
+            raise ValueError(f"Unsupported selector: {selector}")
+        self.selector = selector
+        self.ancestor = match.group('ancestor')
+        self.tag = match.group('tag')
+        self.cls = match.group('cls')
+        self.id = match.group('id')
+        self.attr = match.group('attr')
+        self.substring = match.group('substring')
+    
+    def matches(self, tag: Tag, classes: List[str], open_tags: Dict[str, int]) -> bool:
+        """Check tag against the selector; open_tags counts the tag names of its ancestors."""
+        if self.tag and tag.name != self.tag:
+            return False
+        if self.cls and self.cls not in classes:
+            return False
+        if self.id and tag.get('id') != self.id:
+            return False
+        if self.attr:
+            value = tag.get(self.attr)
+            if value is None:
+                return False
+            if isinstance(value, list):
+                value = ' '.join(value)
+            if self.substring not in value:
+                return False
+        if self.ancestor and not open_tags.get(self.ancestor):
+            return False
+        return True
+
+
+_UNWANTED_MATCHERS = [_SimpleSelector(selector) for selector in UNWANTED_SELECTORS]
+_MAIN_CONTENT_MATCHERS = [_SimpleSelector(selector) for selector in MAIN_CONTENT_SELECTORS]
+_CODE_MATCHERS = [_SimpleSelector(selector) for selector in CODE_SELECTORS]
+_CODE_TAGS = frozenset(m.tag for m in _CODE_MATCHERS if m.tag)
+_UNWANTED_TAGS = frozenset(m.tag for m in _UNWANTED_MATCHERS if m.tag and not (m.cls or m.id or m.attr))
+_UNWANTED_CLASSES = frozenset(m.cls for m in _UNWANTED_MATCHERS if m.cls and not (m.tag or m.id or m.attr))
+_MEDIA_TAGS = frozenset({'img', 'video', 'audio'})
+_HEADING_LEVELS = {f'h{level}': level for level in range(1, 7)}
+# String types that count as text for Tag.get_text() on p/div elements
+_TEXT_STRING_TYPES = (NavigableString, CData)
+
+
+class _Frame:
+    """One open element during the walk (see _walk_page)."""
+    
+    __slots__ = ('tag', 'start', 'end', 'children', 'has_text', 'has_media')
+    
+    def __init__(self, tag: Tag, start: int):
+        self.tag = tag
+        self.start = start
+        self.end = start
+        self.children = iter(list(tag.contents))
+        self.has_text = False
+        self.has_media = False
+
+
+class _PageWalk:
+    """Everything extract_page needs, gathered in one traversal of the tree."""
+    
+    def __init__(self):
+        self.titles: List[Tuple[int, Tag]] = []
+        self.descriptions: List[Tuple[int, Tag]] = []
+        self.headings: List[Tuple[int, int, Tag]] = []
+        self.paragraphs: List[int] = []
+        self.code_blocks: List[int] = []
+        self.links: List[int] = []
+        self.strings: List[Tuple[int, NavigableString]] = []
+        self.blank_blocks: List[_Frame] = []
+        self.main_candidates: List[Optional[_Frame]] = [None] * len(_MAIN_CONTENT_MATCHERS)
+        self.code_matches: List[List[Tuple[int, Tag]]] = [[] for _ in _CODE_MATCHERS]
+
+
+def _walk_page(soup: BeautifulSoup) -> _PageWalk:
+    """
+    Single pre-order traversal of a freshly parsed page.
+    
+    Unwanted subtrees are decomposed and comments extracted as they are
+    met, exactly as extract_main_content does with soup.select. Every
+    node gets a document-order position so that subtree membership can
+    later be checked by range, and p/div emptiness is computed bottom-up
+    when each element is closed.
+    """
+    walk = _PageWalk()
+    position = 0
+    open_tags: Dict[str, int] = {}
+    frames = [_Frame(soup, 0)]
+    
+    while frames:
+        frame = frames[-1]
+        node = next(frame.children, None)
+        
+        if node is None:
+            # Close the element and report its flags to the parent
+            frames.pop()
+            frame.end = position
+            name = frame.tag.name
+            if frames:
+                open_tags[name] -= 1
+                if name in ('p', 'div') and not frame.has_text and not frame.has_media:
+                    walk.blank_blocks.append(frame)
+                parent = frames[-1]
+                parent.has_text = parent.has_text or frame.has_text
+                parent.has_media = parent.has_media or frame.has_media or name in _MEDIA_TAGS
+            continue
+        
+        if isinstance(node, Comment):
+            node.extract()
+            continue
+        
+        if isinstance(node, NavigableString):
+            position += 1
+            walk.strings.append((position, node))
+            if not frame.has_text and type(node) in _TEXT_STRING_TYPES and node.strip():
+                frame.has_text = True
+            continue
+        
+        if not isinstance(node, Tag):
+            continue
+        
+        name = node.name
+        classes = node.get('class') or []
+        if name in _UNWANTED_TAGS or any(cls in _UNWANTED_CLASSES for cls in classes):
+            node.decompose()
+            continue
+        
+        position += 1
+        child = _Frame(node, position)
+        
+        if name == 'title':
+            walk.titles.append((position, node))
+        elif name == 'meta' and node.get('name') == 'description':
+            walk.descriptions.append((position, node))
+        elif name in _HEADING_LEVELS:
+            walk.headings.append((_HEADING_LEVELS[name], position, node))
+        elif name == 'p':
+            walk.paragraphs.append(position)
+        elif name == 'a':
+            walk.links.append(position)
+        if name in ('pre', 'code'):
+            walk.code_blocks.append(position)
+        
+        for i, matcher in enumerate(_MAIN_CONTENT_MATCHERS):
+            if walk.main_candidates[i] is None and matcher.matches(node, classes, open_tags):
+                walk.main_candidates[i] = child
+        if name in _CODE_TAGS or classes:
+            for i, matcher in enumerate(_CODE_MATCHERS):
+                if matcher.matches(node, classes, open_tags):
+                    walk.code_matches[i].append((position, node))
+        
+        open_tags[name] = open_tags.get(name, 0) + 1
+        frames.append(child)
+    
+    return walk
+
+
+def _match_code_blocks(root: Tag) -> List[Tuple[str, List[Tag]]]:
+    """
+    Match every CODE_SELECTORS entry against the descendants of root in one traversal.
+    
+    Args:
+        root: Parsed page or element to search
+        
+    Returns:
+        (selector, matching elements in document order) pairs, in CODE_SELECTORS
+        order, as soup.select would return them selector by selector
+    """
+    code_matches: List[List[Tag]] = [[] for _ in _CODE_MATCHERS]
+    open_tags: Dict[str, int] = {}
+    open_names: List[str] = []
+    children = [iter(root.contents)]
+    
+    while children:
+        node = next(children[-1], None)
+        if node is None:
+            children.pop()
+            if open_names:
+                open_tags[open_names.pop()] -= 1
+            continue
+        if not isinstance(node, Tag):
+            continue
+        
+        name = node.name
+        classes = node.get('class') or []
+        # Every code selector names a tag or a class, so other elements cannot match
+        if name in _CODE_TAGS or classes:
+            for matches, matcher in zip(code_matches, _CODE_MATCHERS):
+                if matcher.matches(node, classes, open_tags):
+                    matches.append(node)
+        
+        open_tags[name] = open_tags.get(name, 0) + 1
+        open_names.append(name)
+        children.append(iter(node.contents))
+    
+    return list(zip(CODE_SELECTORS, code_matches))
+
+
+def extract_page(soup: BeautifulSoup, url: str) -> Dict[str, Union[str, Dict, List]]:
+    """
+    Extract content, metadata and code examples in a single traversal.
+    
+    Produces the same result as running extract_main_content,
+    extract_metadata and extract_code_examples in that order on the same
+    soup, but walks the tree once instead of once per selector. Pages
+    without any main content container take the original path, which
+    needs extra body clean-up.
+    
+    Args:
+        soup: Freshly parsed page (modified in place)
+        url: Original URL
+        
+    Returns:
+        Dict with content, metadata and code_examples fields
+    """
+    walk = _walk_page(soup)
+    
+    main = next((frame for frame in walk.main_candidates if frame is not None), None)
+    if main is None:
+        return {
+            'content': extract_main_content(soup),
+            'metadata': extract_metadata(soup, url),
+            'code_examples': extract_code_examples(soup)
+        }
+    
+    def in_main(position: int) -> bool:
+        return main.start < position <= main.end
+    
+    # Remove empty paragraphs and divs inside the main content, outermost first
+    removed_starts: List[int] = []
+    removed_ends: List[int] = []
+    for frame in sorted(walk.blank_blocks, key=lambda f: f.start):
+        if not in_main(frame.start) or (removed_ends and frame.start <= removed_ends[-1]):
+            continue
+        frame.tag.decompose()
+        removed_starts.append(frame.start)
+        removed_ends.append(frame.end)
+    
+    def kept(position: int) -> bool:
+        i = bisect_right(removed_starts, position) - 1
+        return i < 0 or position > removed_ends[i]
+    
+    # Clean up whitespace in text nodes
+    for position, text_node in walk.strings:
+        if in_main(position) and kept(position) and text_node.parent.name not in ('pre', 'code'):
+            text_node.replace_with(WHITESPACE_PATTERN.sub(' ', text_node).strip())
+    
+    metadata = {
+        'url': url,
+        'domain': urlparse(url).netloc
+    }
+    
+    title = next((tag for position, tag in walk.titles if kept(position)), None)
+    if title:
+        metadata['title'] = title.get_text().strip()
+    
+    description = next((tag for position, tag in walk.descriptions if kept(position)), None)
+    if description:
+        metadata['description'] = description.get('content', '').strip()
+    
+    headings = sorted((level, position, tag) for level, position, tag in walk.headings if kept(position))
+    main_heading = next((tag for level, position, tag in headings if level == 1), None)
+    if main_heading:
+        metadata['main_heading'] = main_heading.get_text().strip()
+    
+    metadata['headings'] = [
+        {'level': level, 'text': tag.get_text().strip(), 'id': tag.get('id', '')}
+        for level, position, tag in headings
+    ]
+    
+    metadata['paragraph_count'] = sum(1 for position in walk.paragraphs if kept(position))
+    metadata['code_block_count'] = sum(1 for position in walk.code_blocks if kept(position))
+    metadata['link_count'] = sum(1 for position in walk.links if kept(position))
+    metadata.update(_url_metadata(url))
+    
+    code_examples = build_code_examples(
+        (matcher.selector, [tag for position, tag in matches if kept(position)])
+        for matcher, matches in zip(_CODE_MATCHERS, walk.code_matches)
+    )
+    
+    return {
+        'content': str(main.tag),
+        'metadata': metadata,
+        'code_examples': code_examples
+    }
+
+
+def scrape_all_urls(url_list: List[str], max_workers: int = MAX_WORKERS,
+                    pool_size: int = POOL_MAXSIZE,
+                    validators: Optional[Dict[str, Dict[str, str]]] = None,
+                    previous_results: Optional[Mapping[str, Dict]] = None,
+                    requests_per_second: float = REQUESTS_PER_SECOND,
+                    burst: int = BURST_SIZE,
+                    writer: Optional[ScrapedContentWriter] = None,
+                    parser: str = HTML_PARSER,
+                    adapter_factory: Optional[AdapterFactory] = None) -> Dict[str, Dict]:
     """
     Multi-threaded scraping with rate limiting.
     
+    Each worker thread owns one pooled keep-alive session, so connections
+    are reused across all URLs that worker handles. Workers take a token
+    from a shared per-host limiter before every request.
+    
+    With a writer, each result is streamed to disk as soon as it completes
+    and only its summary is kept in the returned dict.
+    
     Args:
         url_list: List of URLs to scrape
+        max_workers: Number of worker threads
+        pool_size: Keep-alive connections per host for each worker session
+        validators: Stored HTTP validators by URL, for conditional requests
+        previous_results: Previous run's results by URL, reused on 304
+        requests_per_second: Sustained rate per host (0 disables rate limiting)
+        burst: Requests a host may receive back-to-back
+        writer: Streams full results to disk (see corpus_io)
+        parser: BeautifulSoup tree builder ('html.parser' or 'lxml')
+        adapter_factory: Transport for the worker sessions (see http_archive)
         
     Returns:
-        Dict mapping URLs to their scraped content
+        Dict mapping URLs to their scraped content, or to result summaries
+        when a writer is given
     """
-    logger.info(f"Starting to scrape {len(url_list)} URLs with {MAX_WORKERS} workers")
-    logger.info(f"Rate limit: {RATE_LIMIT_DELAY}s between requests")
+    logger.info(f"Starting to scrape {len(url_list)} URLs with {max_workers} workers")
+    rate_limiter = create_rate_limiter(requests_per_second, burst)
     
     results = {}
     completed_count = 0
     failed_count = 0
+    validators = validators or {}
+    CONNECTION_STATS.reset()
     
-    # Use ThreadPoolExecutor for concurrent scraping
-    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+    # Use ThreadPoolExecutor for concurrent scraping; the initializer gives
+    # every worker its own session up front
+    with ThreadPoolExecutor(max_workers=max_workers, initializer=get_session,
+                            initargs=(pool_size, adapter_factory)) as executor:
         # Submit all tasks
         future_to_url = {
-            executor.submit(scrape_single_url, url): url 
+            executor.submit(scrape_single_url, url, None, validators.get(url),
+                            previous_results, rate_limiter, parser): url
             for url in url_list
         }
         
-        # Process completed tasks
+        # Process completed tasks; popping the future releases its result
         for future in as_completed(future_to_url):
-            url = future_to_url[future]
+            url = future_to_url.pop(future)
             
             try:
                 result = future.result()
-                results[url] = result
+                results[url] = writer.write(result) if writer else result
                 
                 if result['success']:
                     completed_count += 1
@@ -459,20 +1144,56 @@ def scrape_all_urls(url_list: List[str]) -> Dict[str, Dict]:
             except Exception as e:
                 failed_count += 1
                 logger.error(f"✗ [{completed_count + failed_count}/{len(url_list)}] {url} - Exception: {e}")
-                results[url] = {
-                    'url': url,
-                    'success': False,
-                    'error': f"Exception during processing: {e}",
-                    'timestamp': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
-                }
-            
-            # Rate limiting - sleep between requests
-            time.sleep(RATE_LIMIT_DELAY)
+                result = new_scrape_result(url)
+                result['error'] = f"Exception during processing: {e}"
+                results[url] = writer.write(result) if writer else result
+    
+    close_all_sessions()
     
+    stats = CONNECTION_STATS.snapshot()
     logger.info(f"Scraping completed: {completed_count} successful, {failed_count} failed")
+    logger.info(f"Connections opened: {stats['connections_opened']} for {stats['requests_made']} requests")
     return results
 
 
+def create_rate_limiter(requests_per_second: float, burst: int) -> Optional[HostRateLimiter]:
+    """
+    Create the shared per-host limiter for one scrape run.
+    
+    Args:
+        requests_per_second: Sustained rate per host (0 or less disables limiting)
+        burst: Requests a host may receive back-to-back
+        
+    Returns:
+        HostRateLimiter, or None when rate limiting is disabled
+    """
+    if requests_per_second <= 0:
+        logger.info("Rate limit: disabled")
+        return None
+    
+    logger.info(f"Rate limit: {requests_per_second} requests/s per host (burst {burst})")
+    return HostRateLimiter(requests_per_second, burst)
+
+
+def usable_previous_result(previous_results: Optional[Mapping[str, Dict]], url: str) -> Optional[Dict]:
+    """
+    Return the previous run's result for a URL if it can stand in for a 304.
+    
+    Args:
+        previous_results: Previous run's results by URL (may be None)
+        url: URL to look up
+        
+    Returns:
+        The previous successful result with content, or None
+    """
+    if not previous_results:
+        return None
+    previous = previous_results.get(url)
+    if previous and previous.get('success', False) and has_content(previous):
+        return previous
+    return None
+
+
 def scrape_changed_urls_only(changed_urls: List[str]) -> Dict[str, Dict]:
     """
     Incremental scraping mode for efficiency.
@@ -522,37 +1243,53 @@ def load_categorized_urls() -> List[str]:
         return read_sdk_map_file()
 
 
+def load_scraped_content() -> Mapping[str, Dict]:
+    """
+    Load the previous run's reusable scrape results.
+    
+    For the JSONL format only byte offsets are loaded; records are read
+    from disk on demand. The legacy JSON document is loaded whole.
+    
+    Returns:
+        Mapping of URLs to successful results with content, empty if unavailable
+    """
+    try:
+        if SCRAPED_CONTENT_FILE.exists():
+            previous_results = ScrapedContentIndex(SCRAPED_CONTENT_FILE)
+        elif LEGACY_SCRAPED_CONTENT_FILE.exists():
+            with open(LEGACY_SCRAPED_CONTENT_FILE, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            previous_results = {url: record for url, record in data.get('scraped_content', {}).items()
+                                if record.get('success', False) and has_content(record)}
+        else:
+            return {}
+        
+        logger.info(f"Loaded previous scrape results for {len(previous_results)} URLs")
+        return previous_results
+        
+    except Exception as e:
+        logger.warning(f"Could not load previous scrape results: {e}")
+        return {}
+
+
 def save_scraped_content(scraped_data: Dict[str, Dict]) -> None:
     """
-    Save scraped content to JSON file.
+    Save already collected scrape results to the JSONL file.
+    
+    The main workflow streams results through a ScrapedContentWriter while
+    scraping; this is for callers that hold full results in memory.
     
     Args:
         scraped_data: Dictionary of scraped content
     """
     try:
-        # Ensure directory exists
-        RAW_DATA_DIR.mkdir(parents=True, exist_ok=True)
-        
-        # Create export data with metadata
-        export_data = {
-            'metadata': {
-                'total_urls': len(scraped_data),
-                'successful_scrapes': len([r for r in scraped_data.values() if r.get('success', False)]),
-                'failed_scrapes': len([r for r in scraped_data.values() if not r.get('success', False)]),
-                'timestamp': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
-                'scraper_version': '1.0.0'
-            },
-            'scraped_content': scraped_data
-        }
-        
-        # Save to file
-        with open(SCRAPED_CONTENT_FILE, 'w', encoding='utf-8') as f:
-            json.dump(export_data, f, indent=2, ensure_ascii=False)
+        with ScrapedContentWriter(SCRAPED_CONTENT_FILE) as writer:
+            for result in scraped_data.values():
+                writer.write(result)
         
-        logger.info(f"Saved scraped content to {SCRAPED_CONTENT_FILE}")
-        logger.info(f"Total: {export_data['metadata']['total_urls']} URLs")
-        logger.info(f"Successful: {export_data['metadata']['successful_scrapes']} URLs")
-        logger.info(f"Failed: {export_data['metadata']['failed_scrapes']} URLs")
+        logger.info(f"Total: {len(scraped_data)} URLs")
+        logger.info(f"Successful: {len([r for r in scraped_data.values() if r.get('success', False)])} URLs")
+        logger.info(f"Failed: {len([r for r in scraped_data.values() if not r.get('success', False)])} URLs")
         
     except Exception as e:
         logger.error(f"Error saving scraped content: {e}")
@@ -561,33 +1298,72 @@ def save_scraped_content(scraped_data: Dict[str, Dict]) -> None:
 
 def update_content_hashes(scraped_data: Dict[str, Dict]) -> None:
     """
-    Update content hashes after successful scraping.
+    Record hashes, fingerprints, validators and fetch status in the state store.
+    
+    Only the scraped URLs are written, in batched transactions; failed
+    pages keep their last good hash.
     
     Args:
-        scraped_data: Dictionary of scraped content
+        scraped_data: Scrape results or result summaries by URL
     """
+    def with_hashes(data: Dict) -> Dict:
+        # Full results from older callers carry content instead of its hashes
+        if data.get('content') and not data.get('content_hash'):
+            data = dict(data, content_hash=calculate_content_hash(data['content'], CONTENT_HASH_ALGORITHM))
+            if not data.get('content_fingerprint'):
+                data.update(content_fingerprint=calculate_content_fingerprint(data['content'], HASH_ALGORITHM),
+                            fingerprint_algorithm=HASH_ALGORITHM)
+        return data
+    
     try:
-        # Load existing hashes
-        existing_hashes = load_existing_hashes()
-        
-        # Update hashes for successfully scraped content
-        updated_count = 0
-        for url, data in scraped_data.items():
-            if data.get('success', False) and data.get('content'):
-                content_hash = calculate_content_hash(data['content'])
-                existing_hashes[url] = content_hash
-                updated_count += 1
-        
-        # Save updated hashes
-        save_content_hashes(existing_hashes)
+        updated_count = get_state_store().record_results(with_hashes(data) for data in scraped_data.values())
         logger.info(f"Updated content hashes for {updated_count} URLs")
         
     except Exception as e:
         logger.error(f"Error updating content hashes: {e}")
 
 
-def main():
+def parse_arguments(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line options for the scraper."""
+    parser = argparse.ArgumentParser(description='Scrape X-Plane SDK documentation')
+    parser.add_argument('--engine', choices=['thread', 'async'], default='thread',
+                        help='Scraping engine: thread pool (default) or asyncio event loop (needs aiohttp)')
+    parser.add_argument('--workers', type=int, default=MAX_WORKERS,
+                        help='Worker threads for the thread engine')
+    parser.add_argument('--pool-size', type=int, default=POOL_MAXSIZE,
+                        help='Keep-alive connections per host for each worker session')
+    parser.add_argument('--max-in-flight', type=int, default=None,
+                        help='Concurrent requests for the async engine')
+    parser.add_argument('--rps', type=float, default=REQUESTS_PER_SECOND,
+                        help='Sustained requests per second per host (0 disables rate limiting)')
+    parser.add_argument('--burst', type=int, default=BURST_SIZE,
+                        help='Requests a host may receive back-to-back before pacing starts')
+    parser.add_argument('--parser', choices=HTML_PARSERS, default=HTML_PARSER,
+                        help='BeautifulSoup tree builder; lxml is faster but must be installed')
+    parser.add_argument('--full-refresh', action='store_true',
+                        help='Ignore stored ETag/Last-Modified validators and download every page')
+    parser.add_argument('--resume', action='store_true',
+                        help='Continue an interrupted scrape, fetching only URLs that are missing or failed')
+    archive_group = parser.add_mutually_exclusive_group()
+    archive_group.add_argument('--record', metavar='ARCHIVE', type=Path,
+                               help='Also save every HTTP response to this archive directory (implies --full-refresh)')
+    archive_group.add_argument('--replay', metavar='ARCHIVE', type=Path,
+                               help='Serve responses from a recorded archive instead of the network')
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
     """Main function to execute the scraping workflow."""
+    args = parse_arguments(argv)
+    
+    if args.parser == 'lxml' and not LXML_AVAILABLE:
+        logger.error("The lxml parser is not installed. Please install: pip install lxml")
+        return
+    
+    if (args.record or args.replay) and args.engine != 'thread':
+        logger.error("--record and --replay are only supported by the thread engine")
+        return
+    
     try:
         logger.info("X-Plane SDK Documentation Scraper")
         logger.info("=" * 50)
@@ -602,9 +1378,63 @@ def main():
         
         logger.info(f"Found {len(all_urls)} URLs to process")
         
+        # Conditional requests: pages with stored validators are only
+        # downloaded again if the server reports them as modified
+        # A recording needs every page body, so it never sends conditional requests
+        if args.full_refresh or args.record:
+            validators, previous_results = {}, {}
+        else:
+            validators, previous_results = load_http_validators(), load_scraped_content()
+        
         # Option 1: Scrape all URLs (full scrape) - ENABLED for complete regeneration
-        logger.info("Starting full scrape of all URLs...")
-        scraped_data = scrape_all_urls(all_urls)
+        # Results are streamed to disk as they complete; scraped_data only
+        # holds per-URL summaries
+        logger.info(f"Starting full scrape of all URLs ({args.engine} engine)...")
+        
+        # Recording and replay swap the worker sessions' transport adapter
+        archive, adapter_factory, requests_per_second = None, None, args.rps
+        if args.record or args.replay:
+            from http_archive import HttpArchive, recording_adapter_factory, replay_adapter_factory
+            if args.record:
+                archive = HttpArchive(args.record, mode='a')
+                adapter_factory = recording_adapter_factory(archive)
+                logger.info(f"Recording HTTP responses to {args.record}")
+            else:
+                archive = HttpArchive(args.replay)
+                adapter_factory = replay_adapter_factory(archive)
+                requests_per_second = 0  # Nothing to be polite to
+                logger.info(f"Replaying HTTP responses from {args.replay}")
+        
+        with ScrapedContentWriter(SCRAPED_CONTENT_FILE, resume=args.resume) as writer:
+            # With --resume the checkpoint journal from the interrupted run
+            # already holds some pages; only the rest are fetched
+            completed_urls = writer.completed_urls()
+            pending_urls = [url for url in all_urls if url not in completed_urls]
+            if completed_urls:
+                logger.info(f"Resuming: {len(all_urls) - len(pending_urls)} URLs already scraped, "
+                            f"{len(pending_urls)} remaining")
+            
+            try:
+                if args.engine == 'async':
+                    from async_scraper import MAX_IN_FLIGHT, scrape_all_urls_async
+                    scrape_all_urls_async(pending_urls, max_in_flight=args.max_in_flight or MAX_IN_FLIGHT,
+                                          validators=validators, previous_results=previous_results,
+                                          requests_per_second=args.rps, burst=args.burst, writer=writer,
+                                          parser=args.parser)
+                else:
+                    scrape_all_urls(pending_urls, max_workers=args.workers, pool_size=args.pool_size,
+                                    validators=validators, previous_results=previous_results,
+                                    requests_per_second=requests_per_second, burst=args.burst, writer=writer,
+                                    parser=args.parser, adapter_factory=adapter_factory)
+            finally:
+                # The previous file is replaced when the writer closes
+                if isinstance(previous_results, ScrapedContentIndex):
+                    previous_results.close()
+                if archive:
+                    archive.close()
+        
+        # Summaries of every page in the run, including resumed ones
+        scraped_data = writer.summaries
         
         # Option 2: Incremental scraping (use change detection) - DISABLED for full regeneration
         # logger.info("Detecting changed URLs...")
@@ -618,10 +1448,6 @@ def main():
         # logger.info(f"Found {len(changed_urls)} URLs that need scraping")
         # scraped_data = scrape_changed_urls_only(changed_urls)
         
-        # Save results
-        logger.info("Saving scraped content...")
-        save_scraped_content(scraped_data)
-        
         # Update content hashes
         logger.info("Updating content hashes...")
         update_content_hashes(scraped_data)
@@ -634,7 +1460,11 @@ def main():
         logger.info(f"  Total URLs processed: {len(scraped_data)}")
         logger.info(f"  Successful scrapes: {successful}")
         logger.info(f"  Failed scrapes: {failed}")
+        logger.info(f"  Not modified (304): {len([r for r in scraped_data.values() if r.get('not_modified', False)])}")
         logger.info(f"  Success rate: {(successful/len(scraped_data)*100):.1f}%")
+        connection_stats = CONNECTION_STATS.snapshot()
+        logger.info(f"  HTTP requests made: {connection_stats['requests_made']}")
+        logger.info(f"  Connections opened: {connection_stats['connections_opened']}")
         logger.info(f"  Results saved to: {SCRAPED_CONTENT_FILE}")
         
         logger.info("Scraping completed successfully!")
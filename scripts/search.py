@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+"""
+X-Plane SDK Documentation Search
+
+In-process BM25 search over the generated documentation and the API
+signatures of the processed corpus. Every docs/**/*.md file is split into
+sections at its headings, and every API signature (name, declaration,
+description, parameters, enum values) is a document of its own. Results
+are the top-k sections, with the file and GitHub-style heading anchor to
+link to, and signatures, with their page URL and the docs section that
+documents them.
+
+The tokenizer knows SDK identifiers: besides the whole identifier it
+indexes its camel-case and underscore parts, so XPLMGetDatai is found by
+"XPLMGetDatai", "get datai" or "datai", and xpButtonBehaviorPushButton by
+"push button".
+
+The index is saved to raw_data/search_index.json together with a key
+over the sizes and modification times of its sources. Loading it again is
+much cheaper than a rebuild, which only happens when docs/ or the
+processed corpus changed.
+
+Purpose:
+- Ranked search for the integration tests' sample queries and for tools
+- Link results to the exact docs section (file + heading anchor)
+
+Usage:
+    python search.py "flight loop callback" [-k 10] [--rebuild]
+
+    index = load_search_index()
+    for hit in index.search('XPLMGetDatai', k=5):
+        print(hit['score'], hit['path'], hit['anchor'])
+"""
+
+import argparse
+import heapq
+import json
+import logging
+import math
+import os
+import re
+import tempfile
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from change_detector import CONTENT_HASH_ALGORITHM, calculate_content_hash
+from processed_corpus import (LEGACY_PROCESSED_CONTENT_NAME, MANIFEST_NAME, PROCESSED_CORPUS_DIR, ProcessedCorpus,
+                              processed_corpus_exists)
+
+logger = logging.getLogger(__name__)
+
+# File paths
+PROJECT_ROOT = Path(__file__).parent.parent
+DOCS_DIR = PROJECT_ROOT / "docs"
+SEARCH_INDEX_FILE = PROJECT_ROOT / "raw_data" / "search_index.json"
+
+INDEX_VERSION = 1
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Heading tokens count this many times in their section
+HEADING_WEIGHT = 3
+
+# Words, then the parts of an identifier: XPLM|Get|Datai, xp|Button|Behavior, Texture|2|d
+WORD_PATTERN = re.compile(r'\w+')
+IDENTIFIER_PART_PATTERN = re.compile(r'[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|[0-9]+')
+
+HEADING_PATTERN = re.compile(r'^(#{1,6})\s+(.*?)\s*#*\s*$')
+FENCE_PATTERN = re.compile(r'^\s*(```|~~~)')
+LINK_PATTERN = re.compile(r'!?\[([^\]]*)\]\([^)]*\)')
+ANCHOR_STRIP_PATTERN = re.compile(r'[^\w\- ]')
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase search terms.
+
+    Each word is a term. Words made of several identifier parts
+    (camel case, underscores, digit runs) also yield each part.
+
+    Args:
+        text: Text to tokenize
+
+    Returns:
+        List of terms in text order
+    """
+    tokens = []
+    for word in WORD_PATTERN.findall(text):
+        lower = word.lower()
+        tokens.append(lower)
+        parts = [part.lower() for piece in word.split('_') for part in IDENTIFIER_PART_PATTERN.findall(piece)]
+        if len(parts) > 1:
+            tokens.extend(parts)
+    return tokens
+
+
+def heading_text(heading: str) -> str:
+    """Return a Markdown heading as displayed: links replaced by their text, emphasis removed."""
+    return LINK_PATTERN.sub(r'\1', heading).replace('`', '').replace('*', '').strip()
+
+
+def heading_anchor(text: str, seen: Dict[str, int]) -> str:
+    """
+    Compute the GitHub-style anchor of a heading.
+
+    Args:
+        text: Displayed heading text (see heading_text)
+        seen: Anchors already used in the file; repeated ones get -1, -2, ...
+
+    Returns:
+        str: Anchor without the leading '#'
+    """
+    anchor = ANCHOR_STRIP_PATTERN.sub('', text.lower()).replace(' ', '-')
+    count = seen.get(anchor, 0)
+    seen[anchor] = count + 1
+    return f"{anchor}-{count}" if count else anchor
+
+
+def iter_sections(markdown: str) -> Iterator[Tuple[int, str, str, int, str]]:
+    """
+    Split a Markdown document at its headings.
+
+    YAML front matter is skipped, and lines inside fenced code blocks are
+    never headings (so a #define in a code sample does not start a section).
+    Text before the first heading is yielded with level 0 and an empty heading.
+
+    Args:
+        markdown: Document text
+
+    Yields:
+        (level, heading text, anchor, line number, section body) tuples
+    """
+    lines = markdown.split('\n')
+    start = 0
+    if lines and lines[0].strip() == '---':
+        for index in range(1, len(lines)):
+            if lines[index].strip() == '---':
+                start = index + 1
+                break
+
+    seen: Dict[str, int] = {}
+    level, heading, anchor, line_number, body = 0, '', '', start + 1, []
+    in_fence = False
+    for index in range(start, len(lines)):
+        line = lines[index]
+        if FENCE_PATTERN.match(line):
+            in_fence = not in_fence
+        match = None if in_fence else HEADING_PATTERN.match(line)
+        if match:
+            if heading or any(text.strip() for text in body):
+                yield level, heading, anchor, line_number, '\n'.join(body)
+            level = len(match.group(1))
+            heading = heading_text(match.group(2))
+            anchor = heading_anchor(heading, seen)
+            line_number, body = index + 1, []
+        else:
+            body.append(line)
+    if heading or any(text.strip() for text in body):
+        yield level, heading, anchor, line_number, '\n'.join(body)
+
+
+def signature_text(signature: Dict[str, Any]) -> str:
+    """Collect the searchable text of an API signature."""
+    parts = [signature.get('signature') or '', signature.get('description') or '']
+    for parameter in signature.get('parameters') or []:
+        parts.append(f"{parameter.get('type', '')} {parameter.get('name', '')}")
+    for value in signature.get('values') or []:
+        parts.append(f"{value.get('name', '')} {value.get('description', '')}")
+    return '\n'.join(parts)
+
+
+def source_key(docs_dir: Path, corpus_root: Path) -> str:
+    """
+    Identify the state of the index sources without reading them.
+
+    Args:
+        docs_dir: Documentation directory
+        corpus_root: Processed corpus directory
+
+    Returns:
+        str: Hash over the path, size and modification time of every source file
+    """
+    files = sorted(Path(docs_dir).rglob('*.md'))
+    files += [path for path in (Path(corpus_root) / MANIFEST_NAME, Path(corpus_root).parent / LEGACY_PROCESSED_CONTENT_NAME)
+              if path.exists()]
+    stats = []
+    for path in files:
+        stat = path.stat()
+        stats.append([str(path), stat.st_size, stat.st_mtime_ns])
+    return calculate_content_hash(json.dumps([INDEX_VERSION, stats]), CONTENT_HASH_ALGORITHM)
+
+
+class SearchIndex:
+    """
+    Inverted index with BM25 ranking.
+
+    Documents are dicts describing a section ('kind': 'section', with path,
+    heading, anchor, line) or a signature ('kind': 'signature', with name,
+    url, category, and path/anchor of its docs section when there is one).
+    Postings map each term to a flat [doc, term frequency, doc, ...] list.
+    """
+
+    def __init__(self, documents: List[Dict[str, Any]], lengths: List[int],
+                 postings: Dict[str, List[int]], key: str = ''):
+        self.documents = documents
+        self.lengths = lengths
+        self.postings = postings
+        self.key = key
+        self.average_length = sum(lengths) / len(lengths) if lengths else 0.0
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    @classmethod
+    def build(cls, docs_dir: Path = DOCS_DIR, corpus: Optional[ProcessedCorpus] = None,
+              key: str = '') -> 'SearchIndex':
+        """
+        Index the docs sections and the corpus API signatures.
+
+        Args:
+            docs_dir: Documentation directory (every *.md file below it)
+            corpus: Processed corpus whose api_signatures are indexed (optional)
+            key: Source key stored with the index (see source_key)
+
+        Returns:
+            SearchIndex: The new index
+        """
+        documents: List[Dict[str, Any]] = []
+        term_counts: List[Counter] = []
+        headings: Dict[str, Tuple[str, str]] = {}
+
+        docs_dir = Path(docs_dir)
+        for path in sorted(docs_dir.rglob('*.md')):
+            relative = path.relative_to(docs_dir).as_posix()
+            for level, heading, anchor, line, body in iter_sections(path.read_text(encoding='utf-8')):
+                counts = Counter(tokenize(body))
+                for _ in range(HEADING_WEIGHT):
+                    counts.update(tokenize(heading))
+                documents.append({'kind': 'section', 'path': relative, 'heading': heading, 'anchor': anchor,
+                                  'level': level, 'line': line})
+                term_counts.append(counts)
+                headings.setdefault(heading, (relative, anchor))
+
+        if corpus is not None:
+            for url, page in corpus.items():
+                category = (page.get('category') or {}).get('category')
+                indexed = set()
+                for signature in page.get('api_signatures') or []:
+                    name = signature.get('name') or ''
+                    if (name, signature.get('signature')) in indexed:
+                        continue
+                    indexed.add((name, signature.get('signature')))
+                    counts = Counter(tokenize(signature_text(signature)))
+                    for _ in range(HEADING_WEIGHT):
+                        counts.update(tokenize(name))
+                    path, anchor = headings.get(name, (None, None))
+                    documents.append({'kind': 'signature', 'name': name, 'type': signature.get('type') or 'function',
+                                      'url': url, 'category': category, 'path': path, 'anchor': anchor,
+                                      'signature': signature.get('signature')})
+                    term_counts.append(counts)
+
+        postings: Dict[str, List[int]] = {}
+        for doc, counts in enumerate(term_counts):
+            for term, count in counts.items():
+                postings.setdefault(term, []).extend((doc, count))
+        lengths = [sum(counts.values()) for counts in term_counts]
+        return cls(documents, lengths, postings, key)
+
+    def search(self, query: str, k: int = 10, kind: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Rank documents against a query with BM25.
+
+        Args:
+            query: Free-text query; identifiers match whole or by their parts
+            k: Number of results
+            kind: Only return 'section' or 'signature' results
+
+        Returns:
+            Up to k document dicts, best first, each with its 'score' added
+        """
+        total = len(self.documents)
+        scores: Dict[int, float] = {}
+        for term in set(tokenize(query)):
+            posting = self.postings.get(term)
+            if not posting:
+                continue
+            frequency = len(posting) // 2
+            idf = math.log(1 + (total - frequency + 0.5) / (frequency + 0.5))
+            for i in range(0, len(posting), 2):
+                doc, count = posting[i], posting[i + 1]
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * self.lengths[doc] / self.average_length)
+                scores[doc] = scores.get(doc, 0.0) + idf * count * (BM25_K1 + 1) / (count + norm)
+
+        if kind is not None:
+            scores = {doc: score for doc, score in scores.items() if self.documents[doc]['kind'] == kind}
+        best = heapq.nlargest(k, scores.items(), key=lambda item: (item[1], -item[0]))
+        return [dict(self.documents[doc], score=score) for doc, score in best]
+
+    def save(self, path: Path = SEARCH_INDEX_FILE) -> None:
+        """Write the index atomically."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = {'version': INDEX_VERSION, 'key': self.key, 'documents': self.documents,
+                'lengths': self.lengths, 'postings': self.postings}
+        fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix='.' + path.name)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    @classmethod
+    def load(cls, path: Path = SEARCH_INDEX_FILE) -> Optional['SearchIndex']:
+        """Read a saved index; None if it is missing, unreadable or from another index version."""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        if data.get('version') != INDEX_VERSION:
+            return None
+        return cls(data['documents'], data['lengths'], data['postings'], data.get('key', ''))
+
+
+def load_search_index(docs_dir: Path = DOCS_DIR, corpus_root: Path = PROCESSED_CORPUS_DIR,
+                      index_file: Path = SEARCH_INDEX_FILE, rebuild: bool = False) -> SearchIndex:
+    """
+    Load the saved search index, rebuilding it if its sources changed.
+
+    Args:
+        docs_dir: Documentation directory
+        corpus_root: Processed corpus directory (its signatures are indexed if it exists)
+        index_file: Where the index is saved
+        rebuild: Rebuild even if the saved index is up to date
+
+    Returns:
+        SearchIndex: An index of the current sources
+    """
+    key = source_key(docs_dir, corpus_root)
+    if not rebuild:
+        index = SearchIndex.load(index_file)
+        if index is not None and index.key == key:
+            return index
+
+    corpus = ProcessedCorpus(corpus_root) if processed_corpus_exists(corpus_root) else None
+    index = SearchIndex.build(docs_dir, corpus, key)
+    index.save(index_file)
+    logger.info(f"Indexed {len(index)} sections and signatures into {index_file}")
+    return index
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description='Search the X-Plane SDK documentation')
+    parser.add_argument('query', help='Search terms')
+    parser.add_argument('-k', type=int, default=10, help='Number of results')
+    parser.add_argument('--rebuild', action='store_true', help='Rebuild the index even if it is up to date')
+    args = parser.parse_args()
+
+    for hit in load_search_index(rebuild=args.rebuild).search(args.query, args.k):
+        location = f"docs/{hit['path']}#{hit['anchor']}" if hit.get('path') else hit.get('url', '')
+        title = hit['heading'] if hit['kind'] == 'section' else f"{hit['name']} ({hit['type']})"
+        print(f"{hit['score']:7.2f}  {title}\n         {location}")
@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+"""
+X-Plane SDK Documentation State Store
+
+SQLite database holding the per-URL state the pipeline carries between
+runs: content hash, content fingerprint (and the algorithm that computed
+it), HTTP validators, last fetch time
+and status. It replaces content_hashes.json, http_validators.json and
+content_fingerprints.json, which had to be loaded and rewritten whole on
+every update.
+
+Purpose:
+- Update only the rows that changed, in batched transactions
+- Look up single URLs through the primary key
+- Let several threads or processes write at once (WAL mode, one connection per thread)
+- Import the legacy JSON state files once, on first use
+- Keep named snapshots of the corpus hash tree (see change_detector.MerkleTree)
+
+Usage:
+    store = StateStore()
+    store.migrate_from_json(HASHES_FILE, VALIDATORS_FILE, FINGERPRINTS_FILE)
+    store.record_results(scraped_data.values())
+    hashes = store.hashes()
+
+Files:
+    raw_data/state.db: The database (state.db-wal and state.db-shm while it is open)
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# File paths
+PROJECT_ROOT = Path(__file__).parent.parent
+STATE_DB_FILE = PROJECT_ROOT / "raw_data" / "state.db"
+
+SCHEMA_VERSION = 4
+
+# Algorithm of fingerprints and snapshots stored before it was recorded
+LEGACY_HASH_ALGORITHM = 'sha256'
+
+# Rows written per transaction
+BATCH_SIZE = 500
+
+# Seconds a writer waits for another connection's transaction to finish
+BUSY_TIMEOUT = 30.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    url TEXT PRIMARY KEY,
+    content_hash TEXT,
+    content_fingerprint TEXT,
+    fingerprint_algorithm TEXT,
+    etag TEXT,
+    last_modified TEXT,
+    status_code INTEGER,
+    success INTEGER,
+    last_fetched TEXT
+);
+CREATE TABLE IF NOT EXISTS merkle_nodes (
+    snapshot TEXT NOT NULL,
+    parent TEXT NOT NULL,
+    node TEXT NOT NULL,
+    hash TEXT NOT NULL,
+    PRIMARY KEY (snapshot, parent, node)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+PAGE_COLUMNS = ('url', 'content_hash', 'content_fingerprint', 'fingerprint_algorithm', 'etag', 'last_modified',
+                'status_code', 'success', 'last_fetched')
+
+
+def _utc_now() -> str:
+    return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def _batches(rows: Iterable[Tuple], size: int = BATCH_SIZE) -> Iterator[List[Tuple]]:
+    """Split rows into lists of at most `size`."""
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class StateStore:
+    """
+    Per-URL pipeline state in a SQLite database.
+
+    Every thread gets its own connection, so scraper workers can write
+    concurrently; WAL mode lets readers proceed while a writer commits,
+    and writers wait up to BUSY_TIMEOUT for each other instead of failing.
+    Writes are upserts that only touch the columns they are given.
+    """
+
+    def __init__(self, path: Path = STATE_DB_FILE):
+        self.path = Path(path)
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connection() as conn:
+            conn.executescript(SCHEMA)
+            self._upgrade(conn)
+            conn.execute("INSERT INTO meta (key, value) VALUES ('schema_version', ?) "
+                         "ON CONFLICT (key) DO UPDATE SET value = excluded.value", (str(SCHEMA_VERSION),))
+
+    def _upgrade(self, conn: sqlite3.Connection) -> None:
+        """Bring an older database to the current schema (new tables come from SCHEMA)."""
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(pages)")}
+        if 'fingerprint_algorithm' not in columns:
+            # Version 2 fingerprints were always SHA-256
+            conn.execute("ALTER TABLE pages ADD COLUMN fingerprint_algorithm TEXT")
+            conn.execute("UPDATE pages SET fingerprint_algorithm = ? WHERE content_fingerprint IS NOT NULL",
+                         (LEGACY_HASH_ALGORITHM,))
+        # Version 3 had a per-URL stage version table that no stage wrote, and a hash index only it used
+        conn.execute("DROP TABLE IF EXISTS stage_versions")
+        conn.execute("DROP INDEX IF EXISTS pages_content_hash")
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return the calling thread's connection, opening it on first use."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            # WAL keeps the database consistent on power loss; a crash only loses the last commits
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def close(self) -> None:
+        """Close the connections of all threads."""
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections = []
+        self._local = threading.local()
+
+    def __enter__(self) -> 'StateStore':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _upsert(self, columns: Sequence[str], rows: Iterable[Tuple]) -> int:
+        """
+        Insert or update pages rows, touching only the given columns.
+
+        Args:
+            columns: Column names, starting with 'url'
+            rows: Value tuples in column order
+
+        Returns:
+            int: Number of rows written
+        """
+        placeholders = ', '.join('?' for _ in columns)
+        updates = ', '.join(f"{column} = excluded.{column}" for column in columns[1:])
+        sql = (f"INSERT INTO pages ({', '.join(columns)}) VALUES ({placeholders}) "
+               f"ON CONFLICT (url) DO UPDATE SET {updates}")
+
+        conn = self._connection()
+        written = 0
+        for batch in _batches(rows):
+            with conn:
+                conn.executemany(sql, batch)
+            written += len(batch)
+        return written
+
+    def _column(self, column: str) -> Dict[str, str]:
+        rows = self._connection().execute(f"SELECT url, {column} FROM pages WHERE {column} IS NOT NULL")
+        return dict(rows)
+
+    def get(self, url: str) -> Optional[Dict]:
+        """Return the stored state of one URL, or None."""
+        row = self._connection().execute(
+            f"SELECT {', '.join(PAGE_COLUMNS)} FROM pages WHERE url = ?", (url,)).fetchone()
+        return dict(zip(PAGE_COLUMNS, row)) if row else None
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+
+    def hashes(self) -> Dict[str, str]:
+        """Return URL -> content hash for every URL with a stored hash."""
+        return self._column('content_hash')
+
+    def fingerprints(self, algorithm: Optional[str] = None) -> Dict[str, str]:
+        """
+        Return URL -> content fingerprint for every URL with a stored fingerprint.
+
+        Args:
+            algorithm: Only return fingerprints computed with this algorithm (default: all)
+        """
+        if algorithm is None:
+            return self._column('content_fingerprint')
+        rows = self._connection().execute(
+            "SELECT url, content_fingerprint FROM pages "
+            "WHERE content_fingerprint IS NOT NULL AND fingerprint_algorithm = ?", (algorithm,))
+        return dict(rows)
+
+    def validators(self) -> Dict[str, Dict[str, str]]:
+        """Return URL -> {'etag': ..., 'last_modified': ...} for URLs with stored validators."""
+        rows = self._connection().execute(
+            "SELECT url, etag, last_modified FROM pages WHERE etag IS NOT NULL OR last_modified IS NOT NULL")
+        validators = {}
+        for url, etag, last_modified in rows:
+            validators[url] = {}
+            if etag:
+                validators[url]['etag'] = etag
+            if last_modified:
+                validators[url]['last_modified'] = last_modified
+        return validators
+
+    def update_hashes(self, hashes: Dict[str, str]) -> int:
+        """Upsert content hashes by URL; returns the number of rows written."""
+        return self._upsert(('url', 'content_hash'), hashes.items())
+
+    def update_fingerprints(self, fingerprints: Dict[str, str], algorithm: str) -> int:
+        """Upsert content fingerprints computed with `algorithm` by URL; returns the number of rows written."""
+        return self._upsert(('url', 'content_fingerprint', 'fingerprint_algorithm'),
+                            ((url, fingerprint, algorithm) for url, fingerprint in fingerprints.items()))
+
+    def update_validators(self, validators: Dict[str, Dict[str, str]]) -> int:
+        """Upsert HTTP validators by URL (an empty dict clears them); returns the number of rows written."""
+        return self._upsert(('url', 'etag', 'last_modified'),
+                            ((url, v.get('etag'), v.get('last_modified'))
+                             for url, v in validators.items() if isinstance(v, dict)))
+
+    def record_results(self, results: Iterable[Dict]) -> int:
+        """
+        Store the outcome of scraped pages in batched transactions.
+
+        Successful results replace the URL's hash, fingerprint and
+        validators. Failed ones only update status and fetch time, so the
+        last good state is kept.
+
+        Args:
+            results: Scrape results or result summaries (see corpus_io.summarize_result)
+
+        Returns:
+            int: Number of successful results stored
+        """
+        successes = []
+        failures = []
+        for result in results:
+            fetched = result.get('timestamp') or _utc_now()
+            if result.get('success', False) and result.get('content_hash'):
+                validators = result.get('http_validators') or {}
+                fingerprint = result.get('content_fingerprint')
+                algorithm = (result.get('fingerprint_algorithm') or LEGACY_HASH_ALGORITHM) if fingerprint else None
+                successes.append((result['url'], result['content_hash'], fingerprint, algorithm,
+                                  validators.get('etag'), validators.get('last_modified'),
+                                  result.get('status_code'), 1, fetched))
+            else:
+                failures.append((result['url'], result.get('status_code'), 0, fetched))
+
+        self._upsert(PAGE_COLUMNS, successes)
+        self._upsert(('url', 'status_code', 'success', 'last_fetched'), failures)
+        self.set_meta('last_update', _utc_now())
+        return len(successes)
+
+    def delete(self, urls: Iterable[str]) -> None:
+        """Forget URLs."""
+        conn = self._connection()
+        for batch in _batches((url,) for url in urls):
+            with conn:
+                conn.executemany("DELETE FROM pages WHERE url = ?", batch)
+
+    def save_snapshot(self, name: str, nodes: Iterable[Tuple[str, str, str]], algorithm: str) -> None:
+        """
+        Replace a named hash tree snapshot in one transaction.
+
+        Args:
+            name: Snapshot name, usually the stage that built from the tree
+            nodes: (parent, node, hash) tuples (see change_detector.MerkleTree)
+            algorithm: Hash algorithm the tree was built with
+        """
+        conn = self._connection()
+        with conn:
+            conn.execute("DELETE FROM merkle_nodes WHERE snapshot = ?", (name,))
+            conn.executemany("INSERT INTO merkle_nodes (snapshot, parent, node, hash) VALUES (?, ?, ?, ?)",
+                             ((name, parent, node, node_hash) for parent, node, node_hash in nodes))
+            conn.execute("INSERT INTO meta (key, value) VALUES (?, ?) "
+                         "ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+                         (f'snapshot_algorithm:{name}', algorithm))
+
+    def load_snapshot(self, name: str) -> List[Tuple[str, str, str]]:
+        """Return the (parent, node, hash) tuples of a snapshot (empty if it does not exist)."""
+        rows = self._connection().execute(
+            "SELECT parent, node, hash FROM merkle_nodes WHERE snapshot = ?", (name,))
+        return rows.fetchall()
+
+    def snapshot_algorithm(self, name: str) -> str:
+        """Return the hash algorithm a snapshot was built with."""
+        return self.get_meta(f'snapshot_algorithm:{name}') or LEGACY_HASH_ALGORITHM
+
+    def get_meta(self, key: str) -> Optional[str]:
+        row = self._connection().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str) -> None:
+        with self._connection() as conn:
+            conn.execute("INSERT INTO meta (key, value) VALUES (?, ?) "
+                         "ON CONFLICT (key) DO UPDATE SET value = excluded.value", (key, value))
+
+    def migrate_from_json(self, hashes_file: Path, validators_file: Path,
+                          fingerprints_file: Optional[Path] = None) -> bool:
+        """
+        Import the legacy JSON state files, once.
+
+        Args:
+            hashes_file: content_hashes.json
+            validators_file: http_validators.json
+            fingerprints_file: content_fingerprints.json
+
+        Returns:
+            bool: True if anything was imported by this call
+        """
+        if self.get_meta('json_migrated'):
+            return False
+
+        imported = False
+        for path, update in ((hashes_file, self.update_hashes),
+                             (validators_file, self.update_validators),
+                             (fingerprints_file,
+                              lambda entries: self.update_fingerprints(entries, LEGACY_HASH_ALGORITHM))):
+            if path is None or not Path(path).exists():
+                continue
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                logger.warning(f"Skipping unreadable state file {path}: {e}")
+                continue
+            if not isinstance(data, dict):
+                logger.warning(f"Skipping state file with invalid format: {path}")
+                continue
+            entries = {url: value for url, value in data.items() if url != 'last_update' and value}
+            update(entries)
+            imported = True
+            logger.info(f"Imported {len(entries)} entries from {path} into {self.path}")
+
+        self.set_meta('json_migrated', _utc_now())
+        return imported
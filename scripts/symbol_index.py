@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""
+X-Plane SDK Documentation Symbol Index
+
+Answers "where is XPLMSetDataf documented, and what is its signature"
+without a database or a text search. Every name in the processed corpus'
+api_signatures is a symbol: functions, typedefs, #defines, enums and
+their enum values. Each symbol records its page URL, category, the docs
+file of that category and the heading anchor documenting it there.
+
+Symbols are kept in one array sorted by lowercase name, so exact and
+prefix lookups are two binary searches. Typo-tolerant lookups use a
+trigram index over the distinct names: candidates sharing too few
+trigrams with the query to be within the edit distance are never
+compared, and the remaining ones are checked with an edit distance that
+counts transpositions as one edit.
+
+The symbol table is saved to raw_data/symbol_index.json with the same
+source key as the search index (see search.source_key), so it is rebuilt
+only when docs/ or the processed corpus changed.
+
+Purpose:
+- Jump from a symbol name to its docs section, URL and signature
+- Suggest the intended symbol for a misspelled name
+
+Usage:
+    python symbol_index.py lookup XPLMSetDataf    # exact, or closest names if none
+    python symbol_index.py lookup XPLMSetData --prefix
+    python symbol_index.py lookup XPLMSetDtaf --fuzzy 2
+    python symbol_index.py build                  # rebuild the saved index
+
+    index = load_symbol_index()
+    for symbol in index.lookup('XPLMSetDataf'):
+        print(symbol['file'], symbol['anchor'], symbol['signature'])
+"""
+
+import argparse
+import json
+import logging
+import os
+import tempfile
+from bisect import bisect_left
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from organize_docs import CATEGORY_FILES
+from processed_corpus import PROCESSED_CORPUS_DIR, ProcessedCorpus, processed_corpus_exists
+from search import DOCS_DIR, iter_sections, source_key
+
+logger = logging.getLogger(__name__)
+
+# File paths
+PROJECT_ROOT = Path(__file__).parent.parent
+SYMBOL_INDEX_FILE = PROJECT_ROOT / "raw_data" / "symbol_index.json"
+
+SYMBOL_INDEX_VERSION = 1
+
+# Default edit distance of fuzzy lookups
+MAX_DISTANCE = 2
+
+# Trigrams of '\x00\x00name\x00\x00', so short names and name edges have grams too
+GRAM_SIZE = 3
+GRAM_PAD = '\x00' * (GRAM_SIZE - 1)
+
+
+def symbol_kind(signature: Dict[str, Any]) -> str:
+    """Classify an API signature as function, typedef, define or enum."""
+    kind = signature.get('type') or 'function'
+    if kind == 'function' and (signature.get('signature') or '').lstrip().startswith('typedef'):
+        return 'typedef'
+    return kind
+
+
+def trigrams(key: str) -> List[str]:
+    """Distinct padded trigrams of a lowercase name."""
+    padded = GRAM_PAD + key + GRAM_PAD
+    return list({padded[i:i + GRAM_SIZE] for i in range(len(padded) - GRAM_SIZE + 1)})
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """
+    Optimal string alignment distance: insertions, deletions, substitutions
+    and transpositions of adjacent characters each cost 1.
+
+    Args:
+        a: First string
+        b: Second string
+        limit: Stop early once the distance is known to exceed this
+
+    Returns:
+        int: The distance, or limit + 1 if it exceeds limit
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    # Only cells within limit of the diagonal can stay within limit
+    over = limit + 1
+    previous2: List[int] = []
+    previous = [j if j <= limit else over for j in range(len(b) + 1)]
+    for i in range(1, len(a) + 1):
+        current = [over] * (len(b) + 1)
+        if i <= limit:
+            current[0] = i
+        low, high = max(1, i - limit), min(len(b), i + limit)
+        char = a[i - 1]
+        for j in range(low, high + 1):
+            value = previous[j - 1] + (char != b[j - 1])
+            if previous[j] < value:
+                value = previous[j] + 1
+            if current[j - 1] < value:
+                value = current[j - 1] + 1
+            if i > 1 and j > 1 and char == b[j - 2] and a[i - 2] == b[j - 1] and previous2[j - 2] + 1 < value:
+                value = previous2[j - 2] + 1
+            current[j] = value if value < over else over
+        if min(current[low - 1:high + 1]) > limit:
+            return over
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+def section_anchors(docs_dir: Path) -> Dict[str, Dict[str, str]]:
+    """
+    Map each category file to its headings.
+
+    Args:
+        docs_dir: Documentation directory
+
+    Returns:
+        {file relative to docs_dir: {heading text: anchor of its first occurrence}}
+    """
+    anchors = {}
+    for relative in set(CATEGORY_FILES.values()):
+        path = Path(docs_dir) / relative
+        if not path.exists():
+            continue
+        headings: Dict[str, str] = {}
+        for _, heading, anchor, _, _ in iter_sections(path.read_text(encoding='utf-8')):
+            headings.setdefault(heading, anchor)
+        anchors[relative] = headings
+    return anchors
+
+
+class SymbolIndex:
+    """
+    Sorted symbol table with exact, prefix and fuzzy lookup.
+
+    Each symbol is a dict with name, kind, url, category, file (relative to
+    docs/, None for uncategorized pages), anchor (None if the file has no
+    matching heading) and signature (None for enums and enum values).
+    Lookups ignore case.
+    """
+
+    def __init__(self, symbols: List[Dict[str, Any]], key: str = ''):
+        self.symbols = sorted(symbols, key=lambda symbol: (symbol['name'].lower(), symbol['name'], symbol['url']))
+        self.keys = [symbol['name'].lower() for symbol in self.symbols]
+        self.key = key
+
+        # Distinct names and their trigrams for fuzzy lookup
+        self.names = sorted(set(self.keys))
+        self.gram_counts: List[int] = []
+        self.grams: Dict[str, List[int]] = {}
+        for position, name in enumerate(self.names):
+            name_grams = trigrams(name)
+            self.gram_counts.append(len(name_grams))
+            for gram in name_grams:
+                self.grams.setdefault(gram, []).append(position)
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    @classmethod
+    def build(cls, corpus: ProcessedCorpus, docs_dir: Path = DOCS_DIR, key: str = '') -> 'SymbolIndex':
+        """
+        Collect the symbols of every page in the corpus.
+
+        Args:
+            corpus: Processed corpus whose api_signatures are indexed
+            docs_dir: Documentation directory, for the heading anchors
+            key: Source key stored with the index (see search.source_key)
+
+        Returns:
+            SymbolIndex: The new index
+        """
+        anchors = section_anchors(docs_dir)
+        symbols = []
+        for url, page in corpus.items():
+            category = (page.get('category') or {}).get('category')
+            file = CATEGORY_FILES.get(category)
+            headings = anchors.get(file, {})
+            # Symbols without a heading of their own link to their page's section, titled like /sdk/<name>/
+            page_anchor = headings.get(url.rstrip('/').rsplit('/', 1)[-1])
+            seen = set()
+            for signature in page.get('api_signatures') or []:
+                kind = symbol_kind(signature)
+                entries = [(signature.get('name'), kind, signature.get('signature'))]
+                if kind == 'enum':
+                    entries += [(value.get('name'), 'enum_value', None) for value in signature.get('values') or []]
+                for name, entry_kind, declaration in entries:
+                    if not name or (name, entry_kind) in seen:
+                        continue
+                    seen.add((name, entry_kind))
+                    symbols.append({'name': name, 'kind': entry_kind, 'url': url, 'category': category,
+                                    'file': file, 'anchor': headings.get(name, page_anchor),
+                                    'signature': declaration})
+        return cls(symbols, key)
+
+    def _range(self, low: str, high: Optional[str]) -> Tuple[int, int]:
+        """Positions of the symbols whose lowercase name is in [low, high)."""
+        start = bisect_left(self.keys, low)
+        end = len(self.keys) if high is None else bisect_left(self.keys, high, start)
+        return start, end
+
+    def exact(self, name: str) -> List[Dict[str, Any]]:
+        """Every symbol with this name, ignoring case."""
+        key = name.lower()
+        start, end = self._range(key, key + '\x00')
+        return self.symbols[start:end]
+
+    def prefix(self, prefix: str, limit: int = 50) -> List[Dict[str, Any]]:
+        """Symbols whose name starts with prefix, ignoring case, in name order."""
+        key = prefix.lower()
+        high = key[:-1] + chr(ord(key[-1]) + 1) if key else None
+        start, end = self._range(key, high)
+        return self.symbols[start:min(end, start + limit)]
+
+    def fuzzy(self, name: str, max_distance: int = MAX_DISTANCE, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Symbols whose name is within max_distance edits of name, ignoring case.
+
+        An edit changes at most GRAM_SIZE + 1 of a name's trigrams (a
+        transposition touches one more than a substitution), so a name
+        within the distance shares at least that many fewer trigrams than
+        the longer of the two has. Names below that bound are skipped
+        without computing their distance.
+
+        Args:
+            name: Possibly misspelled symbol name
+            max_distance: Largest edit distance accepted
+            limit: Number of distinct names returned
+
+        Returns:
+            Symbols of the closest names, each with its 'distance' added,
+            closest first and then by name
+        """
+        key = name.lower()
+        query_grams = trigrams(key)
+        slack = (GRAM_SIZE + 1) * max_distance
+        if len(query_grams) > slack:
+            shared: Counter = Counter()
+            for gram in query_grams:
+                shared.update(self.grams.get(gram, ()))
+            candidates = [position for position, count in shared.items()
+                          if count >= max(len(query_grams), self.gram_counts[position]) - slack]
+        else:
+            # Too short for the bound to exclude anything
+            candidates = range(len(self.names))
+
+        matches = []
+        for position in candidates:
+            candidate = self.names[position]
+            distance = edit_distance(key, candidate, max_distance)
+            if distance <= max_distance:
+                matches.append((distance, candidate))
+        results = []
+        for distance, candidate in sorted(matches)[:limit]:
+            results.extend(dict(symbol, distance=distance) for symbol in self.exact(candidate))
+        return results
+
+    def lookup(self, name: str, max_distance: int = MAX_DISTANCE) -> List[Dict[str, Any]]:
+        """Symbols named name, or the closest names if there are none."""
+        return self.exact(name) or self.fuzzy(name, max_distance)
+
+    def save(self, path: Path = SYMBOL_INDEX_FILE) -> None:
+        """Write the symbol table atomically."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = {'version': SYMBOL_INDEX_VERSION, 'key': self.key, 'symbols': self.symbols}
+        fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix='.' + path.name)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    @classmethod
+    def load(cls, path: Path = SYMBOL_INDEX_FILE) -> Optional['SymbolIndex']:
+        """Read a saved symbol table; None if it is missing, unreadable or from another index version."""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        if data.get('version') != SYMBOL_INDEX_VERSION:
+            return None
+        return cls(data['symbols'], data.get('key', ''))
+
+
+def load_symbol_index(docs_dir: Path = DOCS_DIR, corpus_root: Path = PROCESSED_CORPUS_DIR,
+                      index_file: Path = SYMBOL_INDEX_FILE, rebuild: bool = False) -> SymbolIndex:
+    """
+    Load the saved symbol index, rebuilding it if its sources changed.
+
+    Args:
+        docs_dir: Documentation directory
+        corpus_root: Processed corpus directory
+        index_file: Where the index is saved
+        rebuild: Rebuild even if the saved index is up to date
+
+    Returns:
+        SymbolIndex: An index of the current sources (empty if there is no corpus)
+    """
+    key = source_key(docs_dir, corpus_root)
+    if not rebuild:
+        index = SymbolIndex.load(index_file)
+        if index is not None and index.key == key:
+            return index
+
+    if not processed_corpus_exists(corpus_root):
+        logger.warning(f"Processed corpus not found: {corpus_root}")
+        return SymbolIndex([], key)
+    index = SymbolIndex.build(ProcessedCorpus(corpus_root), docs_dir, key)
+    index.save(index_file)
+    logger.info(f"Indexed {len(index)} symbols into {index_file}")
+    return index
+
+
+def format_symbol(symbol: Dict[str, Any]) -> str:
+    """One symbol as printed by the lookup command."""
+    name = symbol['name'] if 'distance' not in symbol else f"{symbol['name']} (distance {symbol['distance']})"
+    location = f"docs/{symbol['file']}#{symbol['anchor']}" if symbol['file'] and symbol['anchor'] else symbol['file']
+    lines = [f"{name} [{symbol['kind']}]", f"    {symbol['url']}"]
+    if location:
+        lines.append(f"    {location}")
+    if symbol['signature']:
+        lines.append(f"    {symbol['signature']}")
+    return '\n'.join(lines)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description='Look up X-Plane SDK symbols')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('build', help='Rebuild the saved symbol index')
+    lookup_parser = subparsers.add_parser('lookup', help='Find a symbol by name')
+    lookup_parser.add_argument('name')
+    mode = lookup_parser.add_mutually_exclusive_group()
+    mode.add_argument('--prefix', action='store_true', help='Every symbol starting with name')
+    mode.add_argument('--fuzzy', type=int, metavar='DISTANCE', help='Symbols within DISTANCE edits of name')
+    args = parser.parse_args()
+
+    index = load_symbol_index(rebuild=args.command == 'build')
+    if args.command == 'lookup':
+        if args.prefix:
+            symbols = index.prefix(args.name)
+        elif args.fuzzy is not None:
+            symbols = index.fuzzy(args.name, args.fuzzy)
+        else:
+            symbols = index.lookup(args.name)
+        if not symbols:
+            print(f"No symbol matches {args.name}")
+        for symbol in symbols:
+            print(format_symbol(symbol))
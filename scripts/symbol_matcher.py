@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+X-Plane SDK Documentation Symbol Matcher
+
+Finds every occurrence of a fixed set of SDK symbols (function names,
+enums, #defines, XPLM module names) in a text with a single pass, using
+an Aho-Corasick automaton built once for the whole set. Matching time is
+linear in the length of the text, however many symbols there are.
+
+The automaton runs over word tokens instead of characters: text is split
+into runs of word characters and single non-word characters, and a symbol
+is the token sequence it splits into. A match therefore always starts and
+ends on a word boundary, so XPLMGetDatai does not match inside
+XPLMGetDataiv, and multi-word names such as "Button Properties" still
+match.
+
+Purpose:
+- Generate cross-references between pages (see process_content.generate_cross_references)
+- Report where each symbol occurs, as character offsets
+
+Usage:
+    matcher = SymbolMatcher(['XPLMGetDatai', 'XPLMDataRef'])
+    for offset, symbol in matcher.find_all(text):
+        ...
+"""
+
+import re
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+# Runs of word characters, or any other single character
+TOKEN_PATTERN = re.compile(r'\w+|\W')
+
+
+class SymbolMatcher:
+    """
+    Aho-Corasick automaton over word tokens for a fixed set of symbols.
+
+    States are trie nodes over token sequences. Each state keeps its goto
+    transitions, its failure link (the longest proper suffix that is also a
+    trie prefix) and the symbols that end there or at any state on its
+    failure chain.
+    """
+
+    def __init__(self, symbols: Iterable[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Tuple[str, ...]] = [()]
+        self.symbols = sorted({symbol for symbol in symbols if symbol and symbol.strip()})
+
+        for symbol in self.symbols:
+            self._add(symbol)
+        self._link()
+
+    def _add(self, symbol: str) -> None:
+        """Add a symbol's token path to the trie."""
+        state = 0
+        for token in TOKEN_PATTERN.findall(symbol):
+            next_state = self._goto[state].get(token)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+                self._goto[state][token] = next_state
+            state = next_state
+        self._output[state] += (symbol,)
+
+    def _link(self) -> None:
+        """Compute failure links breadth first and merge outputs along them."""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and token not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(token, 0)
+                self._output[next_state] += self._output[self._fail[next_state]]
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def find_all(self, text: str) -> Iterator[Tuple[int, str]]:
+        """
+        Find every whole-word occurrence of every symbol.
+
+        Args:
+            text: Text to scan
+
+        Yields:
+            (character offset, symbol) tuples, ordered by where the match ends
+        """
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        for match in TOKEN_PATTERN.finditer(text):
+            token = match.group()
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            if output[state]:
+                end = match.end()
+                for symbol in output[state]:
+                    yield end - len(symbol), symbol
+
+    def find_positions(self, text: str) -> Dict[str, List[int]]:
+        """
+        Group the matches in a text by symbol.
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            Dict mapping each symbol found to its sorted character offsets
+        """
+        positions: Dict[str, List[int]] = {}
+        for offset, symbol in self.find_all(text):
+            positions.setdefault(symbol, []).append(offset)
+        for offsets in positions.values():
+            offsets.sort()
+        return positions
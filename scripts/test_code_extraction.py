@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Regression test for the scraper's code example extraction.
+
+extract_code_examples matches all code selectors in a single traversal.
+This checks that it still returns exactly what the original
+one-soup.select-per-selector implementation (kept below as the reference)
+returned, on the saved corpus and on hand-written edge cases.
+"""
+
+import re
+import sys
+from pathlib import Path
+
+# Add the scripts directory to the path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from bs4 import BeautifulSoup
+
+from benchmarks import load_saved_pages
+from change_detector import calculate_content_hash
+from processed_corpus import PROCESSED_CORPUS_DIR, processed_corpus_exists
+from scrape_docs import CODE_SELECTORS, extract_code_examples, extract_main_content, parse_page
+
+EDGE_CASES = '''
+<div class="content">
+    <h2>Nested and repeated blocks</h2>
+    <pre class="highlight"><code class="language-cpp">XPLMDataRef ref = XPLMFindDataRef("sim/time");</code></pre>
+    <pre><code>XPLMDataRef ref = XPLMFindDataRef("sim/time");</code></pre>
+    <div class="highlight-c"><pre>float value = 1.0f; /* short */</pre></div>
+    <p>Short inline <code>int x;</code> code is skipped.</p>
+    <div class="code c-code"><span>#include "XPLMDisplay.h"</span></div>
+    <section><div><pre class="syntax">void (*callback)(void * refcon);</pre></div></section>
+    <code class="language-c">plain text without any C hints at all</code>
+    <pre>Just some preformatted prose, nothing else.</pre>
+    <div class="codehilite"><pre><code>struct XPLMCameraPosition_t { float x; };</code></pre></div>
+</div>
+'''
+
+
+def reference_extract_code_examples(soup):
+    """The original extract_code_examples: one soup.select per selector, dedupe by hash at the end."""
+    code_examples = []
+
+    for selector in CODE_SELECTORS:
+        code_blocks = soup.select(selector)
+        for i, block in enumerate(code_blocks):
+            code_text = block.get_text()
+
+            if len(code_text.strip()) < 10:
+                continue
+
+            language = 'unknown'
+
+            classes = block.get('class', [])
+            for cls in classes:
+                if 'language-' in cls:
+                    language = cls.replace('language-', '')
+                elif cls in ['c', 'cpp', 'c++', 'c-code', 'cpp-code']:
+                    language = cls
+
+            if language == 'unknown' and block.parent:
+                parent_classes = block.parent.get('class', [])
+                for cls in parent_classes:
+                    if 'language-' in cls:
+                        language = cls.replace('language-', '')
+                    elif cls in ['c', 'cpp', 'c++', 'highlight-c', 'highlight-cpp']:
+                        language = cls
+
+            if language == 'unknown':
+                c_patterns = [
+                    r'\b(int|char|float|double|void|struct|typedef)\b',
+                    r'\b(XP[A-Z][a-zA-Z]*)\b',
+                    r'#include\s*[<"]',
+                    r'\*\s*\w+\s*\(',
+                    r'\w+\s*\*\s*\w+',
+                ]
+
+                for pattern in c_patterns:
+                    if re.search(pattern, code_text):
+                        language = 'c'
+                        break
+
+            context = ""
+            prev_element = block.parent
+            while prev_element and not context:
+                prev_sibling = prev_element.find_previous_sibling(['h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p'])
+                if prev_sibling:
+                    context = prev_sibling.get_text().strip()[:200]
+                    break
+                prev_element = prev_element.parent
+
+            code_examples.append({
+                'code': code_text.strip(),
+                'language': language,
+                'context': context,
+                'selector_used': selector,
+                'index': i
+            })
+
+    seen_codes = set()
+    unique_examples = []
+    for example in code_examples:
+        code_hash = calculate_content_hash(example['code'])
+        if code_hash not in seen_codes:
+            seen_codes.add(code_hash)
+            unique_examples.append(example)
+
+    return unique_examples
+
+
+def check_page(html, url):
+    """Compare the new and reference extractors on one page, as parsed and as parse_page sees it."""
+    expected = reference_extract_code_examples(BeautifulSoup(html, 'html.parser'))
+    assert extract_code_examples(BeautifulSoup(html, 'html.parser')) == expected, url
+
+    # parse_page extracts code after the page chrome has been stripped
+    soup = BeautifulSoup(html, 'html.parser')
+    extract_main_content(soup)
+    expected = reference_extract_code_examples(soup)
+    assert parse_page(html, url)['code_examples'] == expected, url
+
+
+def test_edge_cases():
+    """Nested, duplicated, short and class-annotated code blocks."""
+    print("Testing code extraction edge cases...")
+    html = f"<html><body>{EDGE_CASES}</body></html>"
+    check_page(html, 'https://developer.x-plane.com/sdk/edge-cases/')
+
+    examples = extract_code_examples(BeautifulSoup(html, 'html.parser'))
+    print(f"✓ {len(examples)} code examples match the reference extractor")
+
+
+def test_saved_corpus():
+    """Every page of the saved corpus yields the same code examples as before."""
+    if not processed_corpus_exists(PROCESSED_CORPUS_DIR):
+        print(f"Saved corpus not found ({PROCESSED_CORPUS_DIR}) - skipping")
+        return
+
+    print("Testing code extraction on the saved corpus...")
+    pages = load_saved_pages()
+    for url, html in pages:
+        check_page(html, url)
+    print(f"✓ {len(pages)} pages match the reference extractor")
+
+
+def main():
+    """Run all tests."""
+    print("Running code extraction regression tests...")
+    print("=" * 50)
+
+    failed = 0
+    for test in (test_edge_cases, test_saved_corpus):
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ {test.__name__} failed: output differs on {e}")
+
+    print("\n" + "=" * 50)
+    if failed:
+        print(f"\n✗ {failed} test(s) failed.")
+        return 1
+    print("\n✓ All tests passed! Code extraction output is unchanged.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Round-trip test for the columnar corpus export.
+
+Exports the saved processed corpus to a temporary columnar file and checks
+that every page row and API signature reads back exactly as stored,
+including missing values, and that negative indexes and slices work.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Add the scripts directory to the path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from columnar_corpus import ColumnarCorpus, export_columnar_corpus
+from processed_corpus import PROCESSED_CORPUS_DIR, ProcessedCorpus, processed_corpus_exists, save_processed_corpus
+
+
+def expected_page_row(url, page):
+    """The pages table row a processed page should export to."""
+    category = page.get('category') or {}
+    row = {
+        'url': url,
+        'title': page.get('title'),
+        'category': category.get('category'),
+        'module': category.get('module'),
+        'markdown': page.get('markdown'),
+    }
+    return {name: value for name, value in row.items() if value is not None}
+
+
+def test_round_trip():
+    """Every page and API signature reads back from the mapped file unchanged."""
+    if not processed_corpus_exists(PROCESSED_CORPUS_DIR):
+        print(f"Saved corpus not found ({PROCESSED_CORPUS_DIR}) - skipping")
+        return
+
+    print("Testing columnar corpus round trip...")
+    corpus = ProcessedCorpus(PROCESSED_CORPUS_DIR)
+    signature_count = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        path = export_columnar_corpus(corpus, Path(tmp) / 'corpus.xcol')
+        with ColumnarCorpus(path) as columnar:
+            assert len(columnar) == len(corpus), 'page count'
+            for index, (url, page) in enumerate(corpus.items()):
+                assert columnar.page_index(url) == index, url
+                assert columnar.pages.row(index) == expected_page_row(url, page), url
+
+                signatures = []
+                for row in columnar.signatures_for(index):
+                    signature = columnar.api_signatures.row(row)
+                    assert signature.pop('page') == index, url
+                    signatures.append(signature)
+                assert signatures == [dict(signature) for signature in page.get('api_signatures', [])], url
+                signature_count += len(signatures)
+
+            assert len(columnar.api_signatures) == signature_count, 'signature count'
+            urls = corpus.urls()
+            assert columnar.pages['url'][-1] == urls[-1], 'negative index'
+            assert columnar.pages['url'][1:6:2] == urls[1:6:2], 'slice'
+    print(f"✓ {len(corpus)} pages and {signature_count} API signatures read back unchanged")
+
+
+def test_empty_export():
+    """An empty corpus exports as an empty file, not as the default corpus."""
+    print("Testing empty corpus export...")
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / 'processed'
+        save_processed_corpus({'metadata': {}, 'processed_content': {}}, root)
+        path = export_columnar_corpus(ProcessedCorpus(root), Path(tmp) / 'corpus.xcol')
+        with ColumnarCorpus(path) as columnar:
+            assert (len(columnar), len(columnar.api_signatures)) == (0, 0), 'empty corpus'
+    print("✓ Empty corpus exported empty")
+
+
+def main():
+    """Run all tests."""
+    print("Running columnar corpus tests...")
+    print("=" * 50)
+
+    try:
+        test_round_trip()
+    except AssertionError as e:
+        print(f"✗ test_round_trip failed: output differs on {e}")
+        return 1
+    try:
+        test_empty_export()
+    except AssertionError as e:
+        print(f"✗ test_empty_export failed: {e}")
+        return 1
+
+    print("\n" + "=" * 50)
+    print("\n✓ All tests passed! The columnar export round-trips the processed corpus.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Tests for the SQLite full-text index export.
+
+Builds an index of the saved processed corpus in a temporary directory,
+checks that every signature, parameter, enum value and code example made
+it into the tables, and that an incremental refresh replaces changed
+pages, drops removed ones and leaves the FTS5 indexes consistent.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Add the scripts directory to the path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from fts_index import FtsIndex, fts_query, refresh_fts_index
+from processed_corpus import (PROCESSED_CORPUS_DIR, ProcessedCorpus, ProcessedPage, processed_corpus_exists,
+                              save_processed_corpus)
+
+
+class StubCorpus:
+    """The subset of ProcessedCorpus that FtsIndex.refresh reads."""
+
+    def __init__(self, pages):
+        self.pages = pages
+
+    def items(self):
+        return iter(self.pages.items())
+
+
+def table_counts(index):
+    return {table: index.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            for table in ('pages', 'signatures', 'parameters', 'enum_values', 'code_examples')}
+
+
+def check_integrity(index):
+    for table in ('pages', 'signatures', 'code_examples'):
+        index.conn.execute(f"INSERT INTO {table}_fts ({table}_fts) VALUES ('integrity-check')")
+
+
+def test_fts_query():
+    """Free text becomes quoted terms; FTS5 syntax in the input is not interpreted."""
+    print("Testing query escaping...")
+    assert fts_query('flight loop') == '"flight" "loop"', 'plain words'
+    assert fts_query('XPLMGetData* NEAR(x') == '"XPLMGetData"* "NEAR" "x"', 'prefix and operators'
+    assert fts_query('"-') == '', 'no words'
+    print("✓ Queries are escaped")
+
+
+def test_export_and_refresh():
+    """Full export matches the corpus; a refresh applies one change and one removal."""
+    if not processed_corpus_exists(PROCESSED_CORPUS_DIR):
+        print(f"Saved corpus not found ({PROCESSED_CORPUS_DIR}) - skipping")
+        return
+
+    print("Testing full-text export and incremental refresh...")
+    corpus = ProcessedCorpus(PROCESSED_CORPUS_DIR)
+    pages = [page for _, page in corpus.items()]
+    expected = {
+        'pages': len(pages),
+        'signatures': sum(len(page.get('api_signatures', [])) for page in pages),
+        'parameters': sum(len(sig.get('parameters') or []) for page in pages for sig in page.get('api_signatures', [])),
+        'enum_values': sum(len(sig.get('values') or []) for page in pages for sig in page.get('api_signatures', [])),
+        'code_examples': sum(len(page.get('code_examples', [])) for page in pages),
+    }
+
+    with tempfile.TemporaryDirectory() as tmp, FtsIndex(Path(tmp) / 'sdk_fts.db') as index:
+        stats = index.refresh(corpus)
+        assert stats['added'] == len(pages), 'initial export'
+        assert table_counts(index) == expected, 'table counts'
+        assert index.refresh(corpus)['unchanged'] == len(pages), 'second refresh'
+
+        urls = corpus.urls()
+        changed = dict(corpus[urls[0]])
+        changed['markdown'] += '\nQuokkaMarker'
+        changed.pop('payload_hash', None)
+        removed_url = urls[1]
+        pages_after = {url: corpus[url] for url in urls if url != removed_url}
+        pages_after[urls[0]] = ProcessedPage(changed)
+
+        stats = index.refresh(StubCorpus(pages_after))
+        assert (stats['updated'], stats['removed']) == (1, 1), f"refresh stats {stats}"
+        check_integrity(index)
+        assert [hit['url'] for hit in index.search_pages('QuokkaMarker')] == [urls[0]], 'changed page searchable'
+        assert index.conn.execute("SELECT COUNT(*) FROM pages WHERE url = ?", (removed_url,)).fetchone()[0] == 0
+        removed_signatures = len(corpus[removed_url].get('api_signatures', []))
+        assert table_counts(index)['signatures'] == expected['signatures'] - removed_signatures, 'cascade'
+
+        # An empty corpus removes every page rather than standing in for the default corpus
+        index.conn.commit()
+        empty_root = Path(tmp) / 'processed'
+        save_processed_corpus({'metadata': {}, 'processed_content': {}}, empty_root)
+        emptied = refresh_fts_index(ProcessedCorpus(empty_root), Path(tmp) / 'sdk_fts.db')
+        assert emptied['removed'] == len(pages_after), f"empty refresh stats {emptied}"
+        with FtsIndex(Path(tmp) / 'sdk_fts.db') as emptied_index:
+            assert sum(table_counts(emptied_index).values()) == 0, 'empty corpus removes every page'
+    print(f"✓ {len(pages)} pages exported; changed, removed and all pages refreshed")
+
+
+def main():
+    """Run all tests."""
+    print("Running full-text index tests...")
+    print("=" * 50)
+
+    failed = 0
+    for test in (test_fts_query, test_export_and_refresh):
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ {test.__name__} failed: {e}")
+
+    print("\n" + "=" * 50)
+    if failed:
+        print(f"\n✗ {failed} test(s) failed.")
+        return 1
+    print("\n✓ All tests passed! The full-text index tracks the processed corpus.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -40,10 +40,16 @@ import logging
 # Add parent directory to path for imports
 sys.path.append(str(Path(__file__).parent.parent))
 
+from processed_corpus import ProcessedCorpus, processed_corpus_exists
+from search import load_search_index
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Search hits inspected per sample query
+SAMPLE_QUERY_RESULTS = 20
+
 class IntegrationTestResult:
     """Represents the result of an integration test"""
     def __init__(self, test_name: str, success: bool, message: str = "", 
@@ -92,8 +98,9 @@ class XPlaneSDKIntegrationTester:
         self.docs_path = self.base_path / "docs"
         self.raw_data_path = self.base_path / "raw_data"
         self.scripts_path = self.base_path / "scripts"
-        self.processed_content_path = self.raw_data_path / "processed_content.json"
-        self.scraped_content_path = self.raw_data_path / "scraped_content.json"
+        self.processed_corpus_path = self.raw_data_path / "processed"
+        self.scraped_content_path = self.raw_data_path / "scraped_content.jsonl"
+        self.search_index_path = self.raw_data_path / "search_index.json"
         
         # Test configuration
         self.sample_queries = [
@@ -463,12 +470,8 @@ class XPlaneSDKIntegrationTester:
         self.benchmark.start()
         
         try:
-            # Load processed content if available
-            processed_content = {}
-            if self.processed_content_path.exists():
-                with open(self.processed_content_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    processed_content = data.get('processed_content', {})
+            # Search the persisted BM25 index over docs sections and API signatures
+            search_index = load_search_index(self.docs_path, self.processed_corpus_path, self.search_index_path)
             
             query_results = []
             
@@ -478,35 +481,13 @@ class XPlaneSDKIntegrationTester:
                 expected_modules = query_config['expected_modules']
                 expected_functions = query_config['expected_functions']
                 
-                # Search in documentation files
                 found_modules = []
                 found_functions = []
                 
-                # Search markdown files
-                for md_file in self.docs_path.rglob("*.md"):
-                    try:
-                        with open(md_file, 'r', encoding='utf-8') as f:
-                            content = f.read().lower()
-                            
-                        if query_term.lower() in content:
-                            found_modules.append(md_file.name)
-                            
-                        # Search for expected functions
-                        for func in expected_functions:
-                            if func.lower() in content:
-                                found_functions.append(func)
-                                
-                    except Exception:
-                        continue
-                
-                # Search in processed content
-                for url, content_data in processed_content.items():
-                    api_signatures = content_data.get('api_signatures', [])
-                    for signature in api_signatures:
-                        func_name = signature.get('name', '')
-                        if query_term.lower() in func_name.lower():
-                            if func_name not in found_functions:
-                                found_functions.append(func_name)
+                for hit in search_index.search(query_term, k=SAMPLE_QUERY_RESULTS):
+                    if hit.get('path'):
+                        found_modules.append(Path(hit['path']).name)
+                    found_functions.append(hit['heading'] if hit['kind'] == 'section' else hit['name'])
                 
                 query_result = {
                     'query': query_name,
@@ -616,13 +597,12 @@ class XPlaneSDKIntegrationTester:
             benchmarks['search_results'] = search_results
             
             # Benchmark 5: Processed content loading
-            if self.processed_content_path.exists():
+            if processed_corpus_exists(self.processed_corpus_path):
                 start_time = time.time()
-                with open(self.processed_content_path, 'r', encoding='utf-8') as f:
-                    processed_data = json.load(f)
+                processed_corpus = ProcessedCorpus(self.processed_corpus_path)
                 processed_load_time = time.time() - start_time
                 benchmarks['processed_content_load_time'] = processed_load_time
-                benchmarks['processed_content_size'] = len(json.dumps(processed_data))
+                benchmarks['processed_content_pages'] = len(processed_corpus)
             
             duration, memory = self.benchmark.stop()
             
@@ -707,10 +687,9 @@ class XPlaneSDKIntegrationTester:
             
             # Step 4: Test processed content integration
             try:
-                if self.processed_content_path.exists():
-                    with open(self.processed_content_path, 'r', encoding='utf-8') as f:
-                        processed_data = json.load(f)
-                    api_count = sum(len(content.get('api_signatures', [])) for content in processed_data.get('processed_content', {}).values())
+                if processed_corpus_exists(self.processed_corpus_path):
+                    processed_corpus = ProcessedCorpus(self.processed_corpus_path)
+                    api_count = sum(content['api_signature_count'] for _, content in processed_corpus.items())
                     workflow_steps.append(("Processed Content", True, f"Found {api_count} API signatures"))
                 else:
                     workflow_steps.append(("Processed Content", False, "Processed content file not found"))
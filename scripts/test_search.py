@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Tests for the documentation search index.
+
+Checks identifier tokenization, section splitting and heading anchors on
+small inputs, then builds the index of the generated docs and the saved
+processed corpus in a temporary directory and checks that it ranks the
+expected section first and reloads from disk without rebuilding.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Add the scripts directory to the path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from processed_corpus import PROCESSED_CORPUS_DIR
+from search import DOCS_DIR, SearchIndex, iter_sections, load_search_index, tokenize
+
+
+def test_tokenize():
+    """Identifiers are indexed whole and by their camel-case and underscore parts."""
+    print("Testing tokenizer...")
+    assert tokenize('XPLMGetDatai') == ['xplmgetdatai', 'xplm', 'get', 'datai'], 'XPLM prefix'
+    assert tokenize('xpMsg_PushButtonPressed') == ['xpmsg_pushbuttonpressed', 'xp', 'msg', 'push', 'button',
+                                                   'pressed'], 'xp prefix'
+    assert tokenize('XPLMBindTexture2d, flight loop') == ['xplmbindtexture2d', 'xplm', 'bind', 'texture', '2', 'd',
+                                                          'flight', 'loop'], 'digits and plain words'
+    print("✓ Identifiers are split into their parts")
+
+
+def test_sections():
+    """Headings split sections, fenced code does not, anchors follow GitHub."""
+    print("Testing section splitting...")
+    markdown = '\n'.join([
+        '---', 'title: "Data"', '---',
+        '# Data Access', 'Intro',
+        '### [XPLMGetDatai](/sdk/XPLMGetDatai/)', '```c', '# not a heading', '```',
+        '### XPLMGetDatai',
+    ])
+    sections = [(level, heading, anchor) for level, heading, anchor, _, _ in iter_sections(markdown)]
+    assert sections == [(1, 'Data Access', 'data-access'),
+                        (3, 'XPLMGetDatai', 'xplmgetdatai'),
+                        (3, 'XPLMGetDatai', 'xplmgetdatai-1')], f"sections {sections}"
+    print("✓ Sections and anchors are correct")
+
+
+def test_index():
+    """The built index finds a function's docs section and is reused from disk."""
+    if not DOCS_DIR.exists():
+        print(f"Documentation not found ({DOCS_DIR}) - skipping")
+        return
+
+    print("Testing search index...")
+    with tempfile.TemporaryDirectory() as tmp:
+        index_file = Path(tmp) / 'search_index.json'
+        index = load_search_index(DOCS_DIR, PROCESSED_CORPUS_DIR, index_file)
+        hits = index.search('XPLMGetDatai', k=3, kind='section')
+        assert hits and (hits[0]['path'], hits[0]['anchor']) == ('api/xplm-dataaccess.md', 'xplmgetdatai'), \
+            f"top hit {hits[:1]}"
+        assert any(hit.get('heading') == 'XPLMGetDatai' for hit in index.search('get datai', k=5)), 'identifier parts'
+
+        saved = SearchIndex.load(index_file)
+        assert saved is not None and saved.key == index.key, 'index saved with its source key'
+        reloaded = load_search_index(DOCS_DIR, PROCESSED_CORPUS_DIR, index_file)
+        assert reloaded.search('flight loop', k=5) == index.search('flight loop', k=5), 'same results after reload'
+    print(f"✓ {len(index)} sections and signatures indexed and reloaded")
+
+
+def main():
+    """Run all tests."""
+    print("Running search index tests...")
+    print("=" * 50)
+
+    failed = 0
+    for test in (test_tokenize, test_sections, test_index):
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ {test.__name__} failed: {e}")
+
+    print("\n" + "=" * 50)
+    if failed:
+        print(f"\n✗ {failed} test(s) failed.")
+        return 1
+    print("\n✓ All tests passed! The search index ranks and persists correctly.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Tests for the symbol lookup index.
+
+Checks the edit distance and the exact, prefix and fuzzy lookups on a
+small symbol table, then indexes the saved processed corpus in a
+temporary directory and checks that every API signature name is found and
+links to its docs section.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Add the scripts directory to the path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from processed_corpus import PROCESSED_CORPUS_DIR, ProcessedCorpus, processed_corpus_exists
+from search import DOCS_DIR
+from symbol_index import SymbolIndex, edit_distance, load_symbol_index
+
+
+def make_symbol(name, kind='function'):
+    return {'name': name, 'kind': kind, 'url': f"https://developer.x-plane.com/sdk/{name}/",
+            'category': None, 'file': None, 'anchor': None, 'signature': None}
+
+
+def test_edit_distance():
+    """Transpositions cost one edit; distances past the limit are capped."""
+    print("Testing edit distance...")
+    assert edit_distance('xplmsetdataf', 'xplmsetdataf', 2) == 0, 'equal'
+    assert edit_distance('xplmsetdtaaf', 'xplmsetdataf', 2) == 1, 'transposition'
+    assert edit_distance('xplmsetdtaf', 'xplmgetdataf', 2) == 2, 'insertion and substitution'
+    assert edit_distance('xplmsetdataf', 'xplmgetdatavi', 1) == 2, 'capped at limit + 1'
+    print("✓ Edit distances are correct")
+
+
+def test_lookups():
+    """Exact and prefix lookups ignore case; fuzzy lookups rank by distance."""
+    print("Testing lookups...")
+    names = ['XPLMGetDataf', 'XPLMSetDataf', 'XPLMSetDatai', 'XPLMSetDatavf', 'XPLMSpeakString']
+    index = SymbolIndex([make_symbol(name) for name in reversed(names)])
+    assert [s['name'] for s in index.exact('xplmsetdataf')] == ['XPLMSetDataf'], 'exact'
+    assert index.exact('XPLMSetData') == [], 'exact is not prefix'
+    assert [s['name'] for s in index.prefix('XPLMSetData')] == ['XPLMSetDataf', 'XPLMSetDatai', 'XPLMSetDatavf']
+    assert [s['name'] for s in index.prefix('xplms', limit=2)] == ['XPLMSetDataf', 'XPLMSetDatai'], 'limit'
+    fuzzy = [(s['name'], s['distance']) for s in index.fuzzy('XPLMSetDtaf')]
+    assert fuzzy[:2] == [('XPLMSetDataf', 1), ('XPLMGetDataf', 2)], f"fuzzy {fuzzy}"
+    assert [s['name'] for s in index.lookup('XPLMSpeakStrnig')] == ['XPLMSpeakString'], 'lookup falls back'
+    print("✓ Exact, prefix and fuzzy lookups are correct")
+
+
+def test_corpus_index():
+    """Every signature of the saved corpus is found by name and reloads from disk."""
+    if not processed_corpus_exists(PROCESSED_CORPUS_DIR):
+        print(f"Saved corpus not found ({PROCESSED_CORPUS_DIR}) - skipping")
+        return
+
+    print("Testing symbol index of the processed corpus...")
+    corpus = ProcessedCorpus(PROCESSED_CORPUS_DIR)
+    with tempfile.TemporaryDirectory() as tmp:
+        index_file = Path(tmp) / 'symbol_index.json'
+        index = load_symbol_index(DOCS_DIR, PROCESSED_CORPUS_DIR, index_file)
+        for url, page in corpus.items():
+            for signature in page.get('api_signatures', []):
+                if signature.get('name'):
+                    assert url in [s['url'] for s in index.exact(signature['name'])], signature['name']
+
+        symbols = index.exact('XPLMSetDataf')
+        if DOCS_DIR.exists() and symbols:
+            assert (symbols[0]['file'], symbols[0]['anchor']) == ('api/xplm-dataaccess.md', 'xplmsetdataf'), \
+                f"XPLMSetDataf links to {symbols[0]}"
+        reloaded = SymbolIndex.load(index_file)
+        assert reloaded is not None and reloaded.symbols == index.symbols, 'saved symbol table'
+    print(f"✓ {len(index)} symbols indexed and found")
+
+
+def main():
+    """Run all tests."""
+    print("Running symbol index tests...")
+    print("=" * 50)
+
+    failed = 0
+    for test in (test_edit_distance, test_lookups, test_corpus_index):
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ {test.__name__} failed: {e}")
+
+    print("\n" + "=" * 50)
+    if failed:
+        print(f"\n✗ {failed} test(s) failed.")
+        return 1
+    print("\n✓ All tests passed! Symbols are found by name, prefix and misspelling.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
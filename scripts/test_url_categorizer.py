@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Regression test for the URL categorizer.
+
+UrlCategorizer compiles every category pattern into one regex. This checks
+that it assigns every URL to the same category as the original
+pattern-by-pattern loop (kept below as the reference), and that exporting
+the committed URL set reproduces raw_data/categorized_urls.json byte for
+byte.
+"""
+
+import json
+import re
+import sys
+import tempfile
+from pathlib import Path
+from urllib.parse import urlparse
+
+# Add the scripts directory to the path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from process_content import (CATEGORIZED_URLS_FILE, CATEGORY_PATTERNS, DEFAULT_CATEGORY, UrlCategorizer,
+                             categorize_content, categorize_urls_by_module, export_categorized_urls)
+
+# Page names where a lower-priority pattern matches earlier in the name
+EDGE_CASE_URLS = [
+    'https://developer.x-plane.com/sdk/WidgetCameraView/',
+    'https://developer.x-plane.com/sdk/XPLMSoundCameraCallback/',
+    'https://developer.x-plane.com/sdk/buttonMAP/',
+    'https://developer.x-plane.com/sdk/TEXT_and_FIELD/',
+    'https://developer.x-plane.com/sdk/',
+    'https://developer.x-plane.com/sdk/Main Window Properties/',
+    'https://developer.x-plane.com/sdk/xplmdisplay.h',
+    'https://developer.x-plane.com/sdk/NothingMatchesHere/',
+]
+
+
+def reference_category(url):
+    """The original categorize_urls_by_module loop for a single URL."""
+    url_path = urlparse(url).path
+    page_name = url_path.split('/')[-1] if url_path.split('/')[-1] else url_path.split('/')[-2]
+
+    for category, category_patterns in CATEGORY_PATTERNS.items():
+        for pattern in category_patterns:
+            if re.search(pattern, page_name, re.IGNORECASE):
+                return category
+    return DEFAULT_CATEGORY
+
+
+def committed_urls():
+    """Return the committed categorized_urls.json and the sorted URLs it covers."""
+    with open(CATEGORIZED_URLS_FILE, 'rb') as f:
+        committed = f.read()
+    categories = json.loads(committed)['categories']
+    return committed, sorted(url for urls in categories.values() for url in urls)
+
+
+def test_matches_reference():
+    """Every committed URL and edge case gets the reference category."""
+    print("Testing categorizer against the reference loop...")
+    _, urls = committed_urls()
+    categorizer = UrlCategorizer()
+    for url in urls + EDGE_CASE_URLS:
+        assert categorizer.category_for(url) == reference_category(url), url
+        assert categorize_content(url, '')['category'] == reference_category(url), url
+    print(f"✓ {len(urls) + len(EDGE_CASE_URLS)} URLs match the reference categories")
+
+
+def test_export_byte_identical():
+    """Re-exporting the committed URL set reproduces categorized_urls.json exactly."""
+    if not CATEGORIZED_URLS_FILE.exists():
+        print(f"Categorized URLs not found ({CATEGORIZED_URLS_FILE}) - skipping")
+        return
+
+    print("Testing categorized_urls.json export...")
+    committed, urls = committed_urls()
+    timestamp = json.loads(committed)['metadata']['timestamp']
+    with tempfile.TemporaryDirectory() as tmp:
+        output_file = Path(tmp) / CATEGORIZED_URLS_FILE.name
+        export_categorized_urls(categorize_urls_by_module(urls), len(urls), output_file, timestamp)
+        exported = output_file.read_bytes()
+    assert exported == committed, CATEGORIZED_URLS_FILE.name
+    print(f"✓ {CATEGORIZED_URLS_FILE.name} is byte-identical ({len(exported)} bytes)")
+
+
+def main():
+    """Run all tests."""
+    print("Running URL categorizer regression tests...")
+    print("=" * 50)
+
+    failed = 0
+    for test in (test_matches_reference, test_export_byte_identical):
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ {test.__name__} failed: output differs on {e}")
+
+    print("\n" + "=" * 50)
+    if failed:
+        print(f"\n✗ {failed} test(s) failed.")
+        return 1
+    print("\n✓ All tests passed! URL categorization output is unchanged.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -37,6 +37,9 @@ import argparse
 # Add parent directory to path for imports
 sys.path.append(str(Path(__file__).parent.parent))
 
+from corpus_io import iter_scraped_content, scraped_content_exists
+from processed_corpus import ProcessedCorpus, processed_corpus_exists
+
 class ValidationError:
     """Represents a validation error with context"""
     def __init__(self, error_type: str, message: str, file_path: str = None, line_number: int = None, severity: str = "error"):
@@ -76,8 +79,8 @@ class DocumentationValidator:
         
         # File paths
         self.sdk_map_path = self.base_path.parent / "sdk_map_optimized.txt"
-        self.scraped_content_path = self.base_path / "raw_data" / "scraped_content.json"
-        self.processed_content_path = self.base_path / "raw_data" / "processed_content.json"
+        self.scraped_content_path = self.base_path / "raw_data" / "scraped_content.jsonl"
+        self.processed_corpus_path = self.base_path / "raw_data" / "processed"
         self.categorized_urls_path = self.base_path / "raw_data" / "categorized_urls.json"
         self.context7_path = self.base_path / "context7.json"
         self.docs_path = self.base_path / "docs"
@@ -113,14 +116,21 @@ class DocumentationValidator:
         print(f"  📊 Total URLs in SDK map: {self.stats['total_urls']}")
         
         # Load scraped content
-        if not self.scraped_content_path.exists():
+        if not scraped_content_exists(self.scraped_content_path):
             self.add_error("FILE_MISSING", f"Scraped content file not found: {self.scraped_content_path}")
             return False
-            
-        with open(self.scraped_content_path, 'r', encoding='utf-8') as f:
-            scraped_data = json.load(f)
         
-        scraped_urls = set(scraped_data.get('scraped_content', {}).keys())
+        # Stream records and validate scraped content quality as they are read
+        scraped_urls = set()
+        for url, content_data in iter_scraped_content(self.scraped_content_path):
+            scraped_urls.add(url)
+            if not content_data.get('success', False):
+                self.add_error("SCRAPING_FAILED", f"Scraping failed for URL: {url}")
+            elif not content_data.get('content'):
+                self.add_error("EMPTY_CONTENT", f"Empty content for URL: {url}")
+            elif len(content_data.get('content', '')) < 100:
+                self.add_error("MINIMAL_CONTENT", f"Very short content for URL: {url}", severity="warning")
+        
         self.stats['processed_urls'] = len(scraped_urls)
         print(f"  📊 URLs successfully scraped: {self.stats['processed_urls']}")
         
@@ -139,15 +149,6 @@ class DocumentationValidator:
         if extra_urls:
             self.add_error("EXTRA_URLS", f"Found {len(extra_urls)} URLs that were scraped but not in original list", severity="warning")
         
-        # Validate scraped content quality
-        for url, content_data in scraped_data.get('scraped_content', {}).items():
-            if not content_data.get('success', False):
-                self.add_error("SCRAPING_FAILED", f"Scraping failed for URL: {url}")
-            elif not content_data.get('content'):
-                self.add_error("EMPTY_CONTENT", f"Empty content for URL: {url}")
-            elif len(content_data.get('content', '')) < 100:
-                self.add_error("MINIMAL_CONTENT", f"Very short content for URL: {url}", severity="warning")
-        
         success_rate = (self.stats['processed_urls'] / self.stats['total_urls']) * 100 if self.stats['total_urls'] > 0 else 0
         print(f"  ✅ URL processing success rate: {success_rate:.1f}%")
         
@@ -321,16 +322,13 @@ class DocumentationValidator:
         """
         print("🔍 Checking content quality...")
         
-        # Load processed content
-        if not self.processed_content_path.exists():
-            self.add_error("FILE_MISSING", f"Processed content file not found: {self.processed_content_path}")
+        # Load processed content; page payloads are read one page at a time
+        if not processed_corpus_exists(self.processed_corpus_path):
+            self.add_error("FILE_MISSING", f"Processed content not found: {self.processed_corpus_path}")
             return False
         
-        with open(self.processed_content_path, 'r', encoding='utf-8') as f:
-            processed_data = json.load(f)
-        
-        processed_content = processed_data.get('processed_content', {})
-        cross_references = processed_data.get('cross_references', {})
+        processed_content = ProcessedCorpus(self.processed_corpus_path)
+        cross_references = processed_content.cross_references()
         
         self.stats['cross_references'] = len(cross_references)
         